@@ -0,0 +1,200 @@
+import json
+import time
+from typing import Any, Dict, List, Optional
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from Information_extraction_8D.Evaluation.main import load_raw_text_d2_d3_d4, load_selected_sentences
+from Information_extraction_8D.Evaluation.evaluation_tool import evaluate_iter1
+from Information_extraction_8D.Evaluation.coverage_compress_evaluation import evaluate_text_compression
+
+BASE_DIR = Path(__file__).resolve().parent
+
+FAILURE_DIR = Path(
+    r"C:\Users\FW\Desktop\FMEA_AI\Project_Phase\DATA\JSON\8D_test\failure_identification"
+)
+
+SENTENCE_DIR = Path(
+    r"C:\Users\FW\Desktop\FMEA_AI\Project_Phase\DATA\JSON\8D_test\sentence_selected"
+)
+
+OUTPUT_JSONL = BASE_DIR / "batch_evaluation_reports.jsonl"
+OUTPUT_SUMMARY = BASE_DIR / "batch_evaluation_summary.json"
+
+SENTENCE_SUFFIX = "_sentences.json"   # written by end_to_end.run
+
+ITER1_RATE_KEYS = [
+    "strong_faithfulness_rate",
+    "weak_faithfulness_rate",
+    "hallucination_rate",
+    "atomicity_rate",
+    "entity_rule_pass_rate",
+    "assertion_rule_pass_rate",
+    "confirmed_ratio",
+    "exact_ratio",
+    "fuzzy_ratio",
+    "partial_ratio",
+]
+
+
+# =========================================================
+# Pairing
+# =========================================================
+
+def find_report_pairs(failure_dir: Path, sentence_dir: Path) -> List[tuple]:
+    """(report name, failure json, sentences json) for every report present in both folders."""
+    pairs = []
+    for sent_path in sorted(Path(sentence_dir).glob(f"*{SENTENCE_SUFFIX}")):
+        name = sent_path.name[: -len(SENTENCE_SUFFIX)]
+        raw_path = Path(failure_dir) / f"{name}.json"
+        if raw_path.exists():
+            pairs.append((name, raw_path, sent_path))
+    return pairs
+
+
+# =========================================================
+# Per-report evaluation (runs in worker processes)
+# =========================================================
+
+def evaluate_report(
+    name: str,
+    raw_path: Path,
+    sent_path: Path,
+    *,
+    fuzzy_threshold: int = 90,
+    include_details: bool = False,
+) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+
+    d2, d3, d4 = load_raw_text_d2_d3_d4(raw_path)
+    sentences = load_selected_sentences(sent_path)
+
+    iter1 = evaluate_iter1(
+        sentences=sentences,
+        d2=d2,
+        d3=d3,
+        d4=d4,
+        fuzzy_threshold=fuzzy_threshold,
+        include_per_sentence=include_details,
+    )
+
+    compression = evaluate_text_compression(
+        source_text="\n".join([d2, d3, d4]),
+        summary_sentences=[s.text for s in sentences],
+    )
+
+    compression_summary = {
+        "mean_coverage": compression["source_coverage"]["mean_coverage"],
+        "mean_faithfulness": compression["summary_faithfulness"]["mean_faithfulness"],
+        "compression_ratio": compression["compression"]["compression_ratio"],
+        "information_density": compression["information_density"],
+    }
+    if include_details:
+        compression_summary["details"] = compression
+
+    return {
+        "report": name,
+        "status": "ok",
+        "iter1": iter1,
+        "compression": compression_summary,
+        "seconds": round(time.perf_counter() - t0, 3),
+    }
+
+
+def _safe_evaluate(name, raw_path, sent_path, fuzzy_threshold, include_details):
+    try:
+        return evaluate_report(
+            name, raw_path, sent_path,
+            fuzzy_threshold=fuzzy_threshold,
+            include_details=include_details,
+        )
+    except Exception as e:
+        return {"report": name, "status": "error", "error": f"{type(e).__name__}: {e}"}
+
+
+# =========================================================
+# Aggregation
+# =========================================================
+
+def _mean(values: List[float]) -> Optional[float]:
+    return sum(values) / len(values) if values else None
+
+
+def aggregate_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    ok = [r for r in results if r.get("status") == "ok"]
+
+    iter1_means = {k: _mean([r["iter1"][k] for r in ok]) for k in ITER1_RATE_KEYS}
+
+    count_totals: Dict[str, int] = {}
+    for r in ok:
+        for k, v in r["iter1"]["counts"].items():
+            count_totals[k] = count_totals.get(k, 0) + v
+
+    compression_keys = ["mean_coverage", "mean_faithfulness", "compression_ratio", "information_density"]
+    compression_means = {k: _mean([r["compression"][k] for r in ok]) for k in compression_keys}
+
+    return {
+        "report_count": len(results),
+        "evaluated": len(ok),
+        "failed": {r["report"]: r.get("error") for r in results if r.get("status") != "ok"},
+        "iter1_mean_rates": iter1_means,
+        "iter1_total_counts": count_totals,
+        "reports_with_symptom": sum(1 for r in ok if r["iter1"]["coverage"]["has_symptom"]),
+        "compression_means": compression_means,
+    }
+
+
+# =========================================================
+# Batch runner
+# =========================================================
+
+def run_batch_evaluation(
+    failure_dir: Path = FAILURE_DIR,
+    sentence_dir: Path = SENTENCE_DIR,
+    output_jsonl: Path = OUTPUT_JSONL,
+    output_summary: Path = OUTPUT_SUMMARY,
+    *,
+    max_workers: Optional[int] = None,
+    fuzzy_threshold: int = 90,
+    include_details: bool = False,
+) -> Dict[str, Any]:
+    """
+    Evaluate every report of the corpus in a process pool.
+
+    Per-report results are appended to `output_jsonl` as they finish;
+    the aggregated summary is written to `output_summary`.
+    """
+    pairs = find_report_pairs(failure_dir, sentence_dir)
+    print(f"Found {len(pairs)} report pairs")
+
+    results = []
+    t0 = time.perf_counter()
+
+    with Path(output_jsonl).open("w", encoding="utf-8") as out, \
+            ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(_safe_evaluate, name, raw, sent, fuzzy_threshold, include_details)
+            for name, raw, sent in pairs
+        ]
+
+        for i, fut in enumerate(as_completed(futures), start=1):
+            res = fut.result()
+            results.append(res)
+            out.write(json.dumps(res, ensure_ascii=False) + "\n")
+            out.flush()
+
+            mark = "✔" if res["status"] == "ok" else "✖"
+            print(f"[{i}/{len(pairs)}] {mark} {res['report']}")
+
+    summary = aggregate_results(results)
+    summary["wall_seconds"] = round(time.perf_counter() - t0, 2)
+
+    with Path(output_summary).open("w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    print(f"✅ Done: {Path(output_summary).resolve()}")
+    return summary
+
+
+if __name__ == "__main__":
+    run_batch_evaluation()
@@ -1,5 +1,7 @@
 from typing import List, Dict, Any
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
+import numpy as np
+from scipy import sparse
 import re
 from pathlib import Path
 import json
@@ -69,9 +71,75 @@ def sentence_similarity_metrics(
 # Coverage & Faithfulness
 # =========================================================
 
+def _token_count_matrix(token_lists: List[List[str]], vocab: Dict[str, int], binary: bool = False):
+    """Sparse (docs x vocab) token count matrix; binary=True keeps presence only."""
+    rows, cols = [], []
+    for r, toks in enumerate(token_lists):
+        ids = {vocab[t] for t in toks} if binary else [vocab[t] for t in toks]
+        rows.extend([r] * len(ids))
+        cols.extend(ids)
+    data = np.ones(len(rows), dtype=np.int64)
+    # duplicates are summed on conversion -> counts
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(token_lists), len(vocab)))
+
+
+def similarity_matrix(
+    sentences: List[str],
+    references: List[str],
+    workers: int = -1,
+) -> Dict[str, np.ndarray]:
+    """
+    sentence_similarity_metrics for every (sentence, reference) pair at once.
+
+    Each string is normalized/tokenized once; fuzzy scores come from
+    rapidfuzz.process.cdist and token coverage from a sparse token-overlap
+    product. Returns (len(sentences) x len(references)) float64 matrices.
+    """
+    sent_norm = [normalize_text(s) for s in sentences]
+    ref_norm = [normalize_text(r) for r in references]
+
+    if not sentences or not references:
+        empty = np.zeros((len(sentences), len(references)))
+        return {"fuzzy_similarity": empty, "token_coverage": empty, "max_similarity": empty}
+
+    fuzzy_scores = process.cdist(
+        sent_norm, ref_norm,
+        scorer=fuzz.token_set_ratio,
+        dtype=np.float64,
+        workers=workers,
+    ) / 100.0
+
+    # tokenize_lemmas(x) == normalize_text(x).split()
+    sent_tokens = [n.split() for n in sent_norm]
+    ref_tokens = [n.split() for n in ref_norm]
+
+    vocab: Dict[str, int] = {}
+    for toks in sent_tokens + ref_tokens:
+        for t in toks:
+            vocab.setdefault(t, len(vocab))
+
+    # coverage[i, j] = #tokens of sentence i (with repeats) present in reference j / len(sentence i)
+    counts = _token_count_matrix(sent_tokens, vocab)
+    present = _token_count_matrix(ref_tokens, vocab, binary=True)
+    overlap = (counts @ present.T).toarray()
+    lengths = np.array([len(t) for t in sent_tokens], dtype=np.float64)
+    coverage = np.divide(
+        overlap, lengths[:, None],
+        out=np.zeros(overlap.shape, dtype=np.float64),
+        where=lengths[:, None] > 0,
+    )
+
+    return {
+        "fuzzy_similarity": fuzzy_scores,
+        "token_coverage": coverage,
+        "max_similarity": np.maximum(fuzzy_scores, coverage),
+    }
+
+
 def compute_source_coverage(
     source_text: str,
     summary_sentences: List[str],
+    workers: int = -1,
 ) -> Dict[str, Any]:
     """
     Compute source-to-summary coverage by aligning each source unit
@@ -79,15 +147,13 @@ def compute_source_coverage(
     """
     source_units = split_into_sentences(source_text)
 
+    scores = similarity_matrix(source_units, summary_sentences, workers=workers)["max_similarity"]
+
     unit_scores = []
     unit_details = []
 
-    for unit in source_units:
-        per_sentence_scores = []
-
-        for sent in summary_sentences:
-            metrics = sentence_similarity_metrics(unit, sent)
-            per_sentence_scores.append(metrics["max_similarity"])
+    for unit, row in zip(source_units, scores):
+        per_sentence_scores = row.tolist()
 
         best_score = max(per_sentence_scores) if per_sentence_scores else 0.0
         unit_scores.append(best_score)
@@ -108,16 +174,19 @@ def compute_source_coverage(
 def compute_summary_faithfulness(
     summary_sentences: List[str],
     source_text: str,
+    workers: int = -1,
 ) -> Dict[str, Any]:
     per_sentence = []
     scores = []
 
-    for sent in summary_sentences:
-        metrics = sentence_similarity_metrics(sent, source_text)
-        scores.append(metrics["max_similarity"])
+    metrics = similarity_matrix(summary_sentences, [source_text], workers=workers)
+
+    for i, sent in enumerate(summary_sentences):
+        row = {k: float(v[i, 0]) for k, v in metrics.items()}
+        scores.append(row["max_similarity"])
         per_sentence.append({
             "sentence": sent,
-            **metrics,
+            **row,
         })
 
     return {
@@ -2,8 +2,8 @@ import re
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple, Union
 import re
-import spacy
 from rapidfuzz import fuzz
+from Information_extraction_8D.tools.nlp_models import get_nlp
 from Information_extraction_8D.Schemas.eightD_sentence_schema import SelectedSentence
 
 # ----------------------------
@@ -22,11 +22,9 @@ def _build_source_text(d2: str, d3: str, d4: str) -> str:
 def _safe_float(num: float, den: int) -> float:
     return float(num) / float(max(1, den))
 
-_nlp = spacy.load("en_core_web_sm")
-
 def normalize_and_lemmatize(text: str) -> str:
     text = re.sub(r"\s+", " ", text.lower().strip())
-    doc = _nlp(text)
+    doc = get_nlp()(text)
     return " ".join(tok.lemma_ for tok in doc)
 
 
@@ -40,8 +38,7 @@ def _get_annotation(s: SelectedSentence, key: str):
 # Faithfulness
 # ----------------------------
 
-def _tokenize_lemmas(text: str) -> List[str]:
-    doc = _nlp(text)
+def _lemmas_from_doc(doc) -> List[str]:
     return [
         tok.lemma_.lower()
         for tok in doc
@@ -49,12 +46,104 @@ def _tokenize_lemmas(text: str) -> List[str]:
     ]
 
 
+def _tokenize_lemmas(text: str) -> List[str]:
+    return _lemmas_from_doc(get_nlp()(text))
+
+
 def _token_coverage(sent_tokens: List[str], src_tokens: List[str]) -> float:
     if not sent_tokens:
         return 0.0
     return len(set(sent_tokens) & set(src_tokens)) / len(set(sent_tokens))
 
 
+class FaithfulnessScorer:
+    """
+    Faithfulness of many sentences against ONE source text.
+
+    The source is normalized and lemmatized once; candidate sentences are
+    lemmatized together with nlp.pipe. Scores are identical to calling
+    check_faithfulness() per sentence.
+    """
+
+    def __init__(
+        self,
+        source_text: str,
+        *,
+        fuzzy_threshold: int = 85,
+        coverage_threshold: float = 0.75,
+        batch_size: int = 64,
+    ):
+        self.source_text = source_text or ""
+        self.fuzzy_threshold = fuzzy_threshold
+        self.coverage_threshold = coverage_threshold
+        self.batch_size = batch_size
+
+        self.src_norm = normalize_text(self.source_text)
+        self._src_lemmas: Optional[set] = None
+
+    @property
+    def src_lemmas(self) -> set:
+        # Only needed when a sentence is not an exact substring -> computed lazily
+        if self._src_lemmas is None:
+            self._src_lemmas = set(_tokenize_lemmas(self.source_text))
+        return self._src_lemmas
+
+    def _classify(self, fuzzy_score: int, sent_tokens: List[str]) -> Dict[str, Any]:
+        # 3. Lemma-level token coverage (anti light-rephrase)
+        coverage = _token_coverage(sent_tokens, self.src_lemmas)
+        coverage_score = int(coverage * 100)
+
+        # Final score = strongest signal
+        final_score = max(fuzzy_score, coverage_score)
+
+        if final_score >= self.fuzzy_threshold:
+            return {
+                "faithful": True,
+                "type": "fuzzy",
+                "score": final_score,
+            }
+
+        if coverage >= self.coverage_threshold:
+            return {
+                "faithful": True,
+                "type": "partial",
+                "score": final_score,
+            }
+
+        return {
+            "faithful": False,
+            "type": "hallucinated",
+            "score": final_score,
+        }
+
+    def score_many(self, sentences: List[str]) -> List[Dict[str, Any]]:
+        results: List[Optional[Dict[str, Any]]] = [None] * len(sentences)
+        pending: List[Tuple[int, str, str]] = []
+
+        for i, sentence in enumerate(sentences):
+            sent_norm = normalize_text(sentence)
+
+            if not sent_norm:
+                results[i] = {"faithful": False, "type": "hallucinated", "score": 0}
+            # Exact containment
+            elif sent_norm in self.src_norm:
+                results[i] = {"faithful": True, "type": "exact", "score": 100}
+            else:
+                pending.append((i, sentence, sent_norm))
+
+        if pending:
+            docs = get_nlp().pipe((sentence for _, sentence, _ in pending), batch_size=self.batch_size)
+            for (i, _, sent_norm), doc in zip(pending, docs):
+                # Global fuzzy (token-set is safer than partial)
+                fuzzy_score = int(fuzz.token_set_ratio(sent_norm, self.src_norm))
+                results[i] = self._classify(fuzzy_score, _lemmas_from_doc(doc))
+
+        return results
+
+    def score(self, sentence: str) -> Dict[str, Any]:
+        return self.score_many([sentence])[0]
+
+
 def check_faithfulness(
     sentence: str,
     source_text: str,
@@ -69,48 +158,14 @@ def check_faithfulness(
         "type": "exact" | "fuzzy" | "partial" | "hallucinated",
         "score": int
       }
-    """
-    sent_norm = normalize_text(sentence)
-    src_norm = normalize_text(source_text)
-
-    if not sent_norm:
-        return {"faithful": False, "type": "hallucinated", "score": 0}
-
-    # Exact containment
-    if sent_norm in src_norm:
-        return {"faithful": True, "type": "exact", "score": 100}
-
-    # Global fuzzy (token-set is safer than partial)
-    fuzzy_score = int(fuzz.token_set_ratio(sent_norm, src_norm))
-
-    # 3. Lemma-level token coverage (anti light-rephrase)
-    sent_tokens = _tokenize_lemmas(sentence)
-    src_tokens = _tokenize_lemmas(source_text)
-    coverage = _token_coverage(sent_tokens, src_tokens)
-    coverage_score = int(coverage * 100)
-
-    # Final score = strongest signal
-    final_score = max(fuzzy_score, coverage_score)
-
-    if final_score >= fuzzy_threshold:
-        return {
-            "faithful": True,
-            "type": "fuzzy",
-            "score": final_score,
-        }
-
-    if coverage >= coverage_threshold:
-        return {
-            "faithful": True,
-            "type": "partial",
-            "score": final_score,
-        }
 
-    return {
-        "faithful": False,
-        "type": "hallucinated",
-        "score": final_score,
-    }
+    For many sentences against the same source use FaithfulnessScorer.
+    """
+    return FaithfulnessScorer(
+        source_text,
+        fuzzy_threshold=fuzzy_threshold,
+        coverage_threshold=coverage_threshold,
+    ).score(sentence)
 
 # ----------------------------
 # Atomicity
@@ -268,7 +323,10 @@ def evaluate_iter1(
 
     per_sentence: List[Dict[str, Any]] = []
 
-    for idx, s in enumerate(sentences, start=1):
+    scorer = FaithfulnessScorer(source_text, fuzzy_threshold=fuzzy_threshold)
+    faith_results = scorer.score_many([getattr(s, "text", "") or "" for s in sentences])
+
+    for idx, (s, faith) in enumerate(zip(sentences, faith_results), start=1):
         text = getattr(s, "text", "") or ""
         entity_type = _get_annotation(s, "entity_type")
         assertion_level = _get_annotation(s, "assertion_level")
@@ -277,8 +335,6 @@ def evaluate_iter1(
         source_section = getattr(s, "source_section", None)
         sid = getattr(s, "id", None) or f"S{idx}"
 
-        faith = check_faithfulness(text, source_text, fuzzy_threshold=fuzzy_threshold)
-
         faith_type = faith["type"]
 
         if faith_type in {"exact", "fuzzy"}:
@@ -1,7 +1,8 @@
 
 from langchain.agents import create_agent
 from Information_extraction_8D.tools.section_extractor import extract_d2, extract_d4,parse_8d_doc, extract_failure_d234,extract_iteration_1,extract_iteration_2
-from Information_extraction_8D.tools.doc_parser import extract_product
+from Information_extraction_8D.tools.doc_parser import parse_docx
+from Information_extraction_8D.tools.prompt_compression import compress_iteration1_inputs, summarize_compression
 # from tools.doc_parser import parse_8d_doc
 # from Agents.main.llm import llm
 from Information_extraction_8D.Schemas.eigthD_schema_json_v3 import DocumentInfo,MaintenaceTag, EightDCase, EightDSections, D2Section, D4Section,D3Section, D5Section,D6Section,FailureChain
@@ -10,10 +11,13 @@ from Information_extraction_8D.Schemas.eightD_sentence_schema_V2 import Iteratio
 import copy
 from typing import List, Dict, Any
 from langsmith import traceable, get_current_run_tree
-from Information_extraction_8D.Evaluation.evaluation_tool import check_faithfulness
+from Information_extraction_8D.Evaluation.evaluation_tool import FaithfulnessScorer
+from pipeline_common.instrumentation import timer, count
+from pipeline_common.pipeline_logging import get_logger
 from datetime import datetime
 import unicodedata
 
+log = get_logger("eight_D_agent")
 
 # Helper functions
 
@@ -96,13 +100,13 @@ def annotate_faithfulness_for_sentences(
         d4_raw or "",
     ])
 
-    for sent in selected_sentences:
-        # sent.text is the extracted atomic sentence
-        result = check_faithfulness(
-            sentence=sent.text,
-            source_text=source_text,
-        )
+    # Source text is preprocessed once and shared by all sentences
+    with timer("faithfulness.score"):
+        scorer = FaithfulnessScorer(source_text)
+        results = scorer.score_many([sent.text for sent in selected_sentences])
+    count("faithfulness.sentences", len(selected_sentences))
 
+    for sent, result in zip(selected_sentences, results):
         # --- ensure annotations exists ---
         if getattr(sent, "annotations", None) is None:
             sent.annotations = {}
@@ -145,14 +149,20 @@ def resolve_supporting_entities(id_refs, sentence_index):
 
 
 @traceable(name="8d-extraction-withoutAnnotaion-promptV2")
-def build_8d_case_from_docx(doc_path: str) -> EightDCase:
+def build_8d_case_from_docx(doc_path: str, section_token_budget: int | None = None) -> EightDCase:
+    """
+    section_token_budget: optional per-section token budget for the D2/D3/D4
+    text sent to LLM iteration 1 (highest-value sentences are kept).
+    Faithfulness is still scored against the full raw sections.
+    """
 
-    # 1) Parse document sections using the parse_8d_doc tool
-    product_name = extract_product(doc_path)
-    print("Product name:", product_name)
+    # 1) Parse the document once: sections + product name from the same Document
+    parsed = parse_docx(doc_path)
+    product_name = parsed["product_name"]
 
     # 2) Extract 8D ID from file name
     base_name = os.path.splitext(os.path.basename(doc_path))[0]
+    log.debug("%s: product name %r", base_name, product_name)
     # print("fileID:",base_name)
     document_info = DocumentInfo(
         file_name=base_name,
@@ -166,7 +176,6 @@ def build_8d_case_from_docx(doc_path: str) -> EightDCase:
             # "doc_path": doc_path,
             "product_name": product_name,
         })
-    parsed = parse_8d_doc.invoke({"doc_path": doc_path})
     sections = parsed["sections"]
 
 
@@ -175,7 +184,7 @@ def build_8d_case_from_docx(doc_path: str) -> EightDCase:
     d3_raw = None
     d4_raw = None
 
-    print("Parsed sections")
+    log.debug("%s: parsed %d sections", base_name, len(sections))
     # 3) Loop through parsed sections
     for sec in sections:
         title = normalize_text(sec["title"])
@@ -217,14 +226,27 @@ def build_8d_case_from_docx(doc_path: str) -> EightDCase:
             d6_raw = content
             d6_section = D6Section(raw_context=d6_raw)
 
-    print("LLM iteration 1")
-    output_iter1 =  extract_iteration_1.invoke({
-            "data": {
-                "d2_raw": d2_raw or "",
-                "d3_raw": d3_raw or "",
-                "d4_raw": d4_raw or "",
-        }
-    })
+    iter1_input = {
+        "d2_raw": d2_raw or "",
+        "d3_raw": d3_raw or "",
+        "d4_raw": d4_raw or "",
+    }
+
+    if section_token_budget:
+        iter1_input, compression_report = compress_iteration1_inputs(
+            d2_raw, d3_raw, d4_raw, section_token_budget, with_coverage=True
+        )
+        log.info("%s: compression %s", base_name, summarize_compression(compression_report))
+        if run:
+            run.metadata.update({
+                "compression": {
+                    sec: {k: v for k, v in r.items() if k != "dropped"}
+                    for sec, r in compression_report["sections"].items()
+                },
+            })
+
+    log.debug("%s: LLM iteration 1", base_name)
+    output_iter1 =  extract_iteration_1.invoke({"data": iter1_input})
 
 
 
@@ -247,14 +269,14 @@ def build_8d_case_from_docx(doc_path: str) -> EightDCase:
 
 
     input_iter2 = build_iteration2_input(output_iter1)
-    print("LLM iteration 2")
+    log.debug("%s: LLM iteration 2", base_name)
     output_iter2 = extract_iteration_2.invoke({"data":input_iter2})
 
     sentence_index = {s.sentence_id: s for s in output_iter1.selected_sentences}
 
     #-----Failure entity building------
     system_name = output_iter2.get("system_name") or ""
-    print("system name:",system_name)
+    log.debug("%s: system name %r", base_name, system_name)
 
 
     failure_dict = copy.deepcopy(output_iter2)
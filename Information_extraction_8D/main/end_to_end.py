@@ -1,13 +1,30 @@
 import os
 import json
+import argparse
 import copy
+import time
+import random
+import asyncio
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from Information_extraction_8D.main.eight_D_agent import build_8d_case_from_docx
+from Information_extraction_8D.main.llm import configure_rate_limit, is_transient_llm_error
+from pipeline_common.pipeline_logging import get_logger
 from typing import List
 
+log = get_logger("end_to_end")
+
 # ===== directories =====
 SENTENCE_OUTPUT_DIR = r"C:\Users\FW\Desktop\FMEA_AI\Project_Phase\DATA\JSON\8D_test\sentence_selected"
 FAILURE_OUTPUT_DIR = r"C:\Users\FW\Desktop\FMEA_AI\Project_Phase\DATA\JSON\8D_test\failure_identification"
 
+# Per-section token budget for LLM iteration 1 input (None = send full text)
+SECTION_TOKEN_BUDGET = None
+
+# ===== concurrent batch settings =====
+CHECKPOINT_NAME = "_batch_checkpoint.jsonl"   # stored in FAILURE_OUTPUT_DIR
+
 # =============================
 # Core run function (single file)
 # =============================
@@ -20,12 +37,14 @@ def run(doc_path: str) -> None:
 
     result_path = os.path.join(FAILURE_OUTPUT_DIR, f"{base_name}.json")
     if os.path.exists(result_path):
-        print(f"Skip (already processed): {base_name}")
+        log.info("Skip (already processed): %s", base_name)
         return
 
-    print(f"Star to process the file: {base_name}")
+    log.info("Start to process the file: %s", base_name)
 
-    result, output_iter1 = build_8d_case_from_docx(doc_path)
+    result, output_iter1 = build_8d_case_from_docx(
+        doc_path, section_token_budget=SECTION_TOKEN_BUDGET
+    )
 
     # ---- save Iteration 1 (sentence selection) ----
     iter1_path = os.path.join(
@@ -38,14 +57,14 @@ def run(doc_path: str) -> None:
     with open(result_path, "w", encoding="utf-8") as f:
         json.dump(result.model_dump(), f, indent=2, ensure_ascii=False)
 
-    print(f"Processed: {base_name}")
+    log.info("Processed: %s", base_name)
 
 
 # =============================
 # Batch processing
 # =============================
-def batch_run(folder_path: str) -> None:
-    docx_files: List[str] = sorted(
+def list_docx_files(folder_path: str) -> List[str]:
+    return sorted(
         [
             os.path.join(folder_path, f)
             for f in os.listdir(folder_path)
@@ -55,20 +74,177 @@ def batch_run(folder_path: str) -> None:
         ],
         key=lambda x: os.path.basename(x)
     )
+
+
+def batch_run(folder_path: str) -> None:
+    docx_files = list_docx_files(folder_path)
     if not docx_files:
-        print(" No .docx files found.")
+        log.warning("No .docx files found in %s", folder_path)
         return
 
-    print(f"Found {len(docx_files)} docx files.")
+    log.info("Found %d docx files.", len(docx_files))
 
     for i, doc_path in enumerate(docx_files[10:]):
         try:
-            print(f"Processing {i+1}/{len(docx_files)}: {os.path.basename(doc_path)}")
+            log.info("Processing %d/%d: %s", i + 1, len(docx_files), os.path.basename(doc_path))
             run(doc_path)
-            print(f"✔ Success: {os.path.basename(doc_path)}")
+            log.info("✔ Success: %s", os.path.basename(doc_path))
         except Exception as e:
-            print(f"✖ Failed: {os.path.basename(doc_path)}")
-            print(f"  Reason: {e}")
+            log.error("✖ Failed: %s (%s)", os.path.basename(doc_path), e)
+
+
+# =============================
+# Concurrent batch processing
+# =============================
+class BatchCheckpoint:
+    """
+    Append-only JSONL log of per-report outcomes.
+    The last line for a report wins, so an interrupted run resumes where it stopped.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.state = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:  # torn last line after a crash
+                        continue
+                    self.state[entry["file"]] = entry
+
+    def is_done(self, base_name: str) -> bool:
+        return self.state.get(base_name, {}).get("status") == "done"
+
+    def record(self, base_name: str, status: str, **extra) -> None:
+        entry = {
+            "file": base_name,
+            "status": status,
+            "time": datetime.now().isoformat(timespec="seconds"),
+            **extra,
+        }
+        with self._lock:
+            self.state[base_name] = entry
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+async def _run_with_retry(
+    doc_path: str,
+    *,
+    loop,
+    executor,
+    semaphore: asyncio.Semaphore,
+    checkpoint: BatchCheckpoint,
+    max_retries: int,
+    backoff_base: float,
+) -> bool:
+    base_name = os.path.splitext(os.path.basename(doc_path))[0]
+
+    for attempt in range(1, max_retries + 2):
+        # The slot is held per attempt only: a report waiting out its backoff
+        # leaves it to the next report
+        async with semaphore:
+            t0 = time.perf_counter()
+            try:
+                # build_8d_case_from_docx is blocking (sync LLM client) -> worker thread
+                await loop.run_in_executor(executor, run, doc_path)
+                exc = None
+            except Exception as e:
+                exc = e
+
+        if exc is None:
+            checkpoint.record(
+                base_name, "done",
+                attempts=attempt,
+                seconds=round(time.perf_counter() - t0, 2),
+            )
+            log.info("✔ Success: %s", base_name)
+            return True
+
+        error = f"{type(exc).__name__}: {exc}"
+
+        # Only network / timeout / rate-limit errors are retried; a broken
+        # report would fail the same way after re-running both LLM iterations
+        if attempt > max_retries or not is_transient_llm_error(exc):
+            checkpoint.record(base_name, "failed", attempts=attempt, error=error)
+            log.error("✖ Failed: %s (%s)", base_name, error)
+            return False
+
+        delay = backoff_base * 2 ** (attempt - 1) * (1 + random.random())
+        log.warning("retry %d/%d for %s in %.1fs (%s)", attempt, max_retries, base_name, delay, error)
+        await asyncio.sleep(delay)
+
+
+async def async_batch_run(
+    folder_path: str,
+    concurrency: int = 16,
+    requests_per_minute: int | None = None,
+    tokens_per_minute: int | None = None,
+    max_retries: int = 3,
+    backoff_base: float = 2.0,
+) -> dict:
+    """
+    Process all reports of a folder concurrently.
+
+    - concurrency: number of reports in flight (each makes 2 sequential LLM calls)
+    - requests_per_minute / tokens_per_minute: shared limit on every LLM call
+    - max_retries: extra attempts per report after a transient (network /
+      timeout / rate-limit) error, exponential backoff with jitter
+    - finished reports are logged to a checkpoint file and skipped on restart
+    """
+    docx_files = list_docx_files(folder_path)
+    if not docx_files:
+        log.warning("No .docx files found in %s", folder_path)
+        return {"done": 0, "failed": 0, "skipped": 0}
+
+    os.makedirs(SENTENCE_OUTPUT_DIR, exist_ok=True)
+    os.makedirs(FAILURE_OUTPUT_DIR, exist_ok=True)
+
+    configure_rate_limit(requests_per_minute, tokens_per_minute)
+    checkpoint = BatchCheckpoint(os.path.join(FAILURE_OUTPUT_DIR, CHECKPOINT_NAME))
+
+    todo = [
+        p for p in docx_files
+        if not checkpoint.is_done(os.path.splitext(os.path.basename(p))[0])
+    ]
+    skipped = len(docx_files) - len(todo)
+    log.info("Found %d docx files, %d already done, %d to process.", len(docx_files), skipped, len(todo))
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = await asyncio.gather(*[
+            _run_with_retry(
+                p,
+                loop=loop,
+                executor=executor,
+                semaphore=semaphore,
+                checkpoint=checkpoint,
+                max_retries=max_retries,
+                backoff_base=backoff_base,
+            )
+            for p in todo
+        ])
+
+    summary = {
+        "done": sum(results),
+        "failed": len(results) - sum(results),
+        "skipped": skipped,
+    }
+    log.info("Batch finished: %s", summary)
+    return summary
+
+
+def concurrent_batch_run(folder_path: str, **kwargs) -> dict:
+    return asyncio.run(async_batch_run(folder_path, **kwargs))
 
 
 # =============================
@@ -78,4 +254,24 @@ if __name__ == "__main__":
     MOTOR_EXAMPLE_DIR = (
         r"C:\Users\FW\Desktop\FMEA_AI\Project_Phase\DATA\8D\Motor example"
     )
-    batch_run(MOTOR_EXAMPLE_DIR)
\ No newline at end of file
+
+    parser = argparse.ArgumentParser(description="8D DOCX -> JSON batch extraction")
+    parser.add_argument("folder", nargs="?", default=MOTOR_EXAMPLE_DIR)
+    parser.add_argument("--concurrency", type=int, default=16, help="reports in flight")
+    parser.add_argument("--requests-per-minute", type=int, default=None)
+    parser.add_argument("--tokens-per-minute", type=int, default=None)
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--sequential", action="store_true",
+                        help="one report at a time, no checkpoint / retries (batch_run)")
+    args = parser.parse_args()
+
+    if args.sequential:
+        batch_run(args.folder)
+    else:
+        concurrent_batch_run(
+            args.folder,
+            concurrency=args.concurrency,
+            requests_per_minute=args.requests_per_minute,
+            tokens_per_minute=args.tokens_per_minute,
+            max_retries=args.max_retries,
+        )
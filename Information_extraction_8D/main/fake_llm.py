@@ -0,0 +1,214 @@
+"""
+Offline LLM backends for running / timing the 8D pipeline without a live model.
+
+- "fake":   synthetic but schema-valid JSON built from the prompt's own input text
+- "replay": responses recorded in the SQLite response cache (llm_cache.py),
+            falling back to "fake" when a prompt was never recorded
+
+Both simulate model latency with a configurable distribution
+(LLM_FAKE_LATENCY, e.g. "constant:0.5", "uniform:1,3", "lognormal:0.7,0.4",
+"normal:2,0.5"; values in seconds).
+"""
+
+import os
+import re
+import json
+import time
+import random
+import sqlite3
+import threading
+
+from langchain_core.messages import AIMessage
+
+from Information_extraction_8D.main.llm_cache import DEFAULT_CACHE_PATH, make_cache_key
+
+
+# =========================================================
+# Latency model
+# =========================================================
+
+class LatencyModel:
+    def __init__(self, spec: str = "constant:0", seed: int | None = None):
+        self.spec = spec
+        kind, _, args = spec.partition(":")
+        self.kind = kind.strip().lower()
+        self.args = [float(a) for a in args.split(",") if a.strip()]
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+        if self.kind not in {"constant", "uniform", "normal", "lognormal"}:
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self) -> float:
+        a = self.args
+        with self._lock:
+            if self.kind == "constant":
+                value = a[0] if a else 0.0
+            elif self.kind == "uniform":
+                value = self._rng.uniform(a[0], a[1])
+            elif self.kind == "normal":
+                value = self._rng.gauss(a[0], a[1])
+            else:  # lognormal: (mu, sigma) of the underlying normal
+                value = self._rng.lognormvariate(a[0], a[1])
+        return max(value, 0.0)
+
+
+# =========================================================
+# Prompt parsing helpers
+# =========================================================
+
+D2_MARK = "D2:Define problem and symptoms"
+D3_MARK = "D3: Provide a quick fix / Interim Containment Plan"
+D4_MARK = "D4:Analyze root cause"
+END_MARK = "===================="
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+SIGNAL_LINE = re.compile(r"^- \[id:([^\]]*)\](?: \[subject:([^\]]*)\])? (.*?) \(status=")
+
+
+def _section_blocks(text: str) -> dict:
+    """Cut the D2/D3/D4 input blocks out of a rendered iteration prompt."""
+    i2, i3, i4 = text.rfind(D2_MARK), text.rfind(D3_MARK), text.rfind(D4_MARK)
+    if min(i2, i3, i4) < 0:
+        return {}
+    end = text.find(END_MARK, i4)
+    return {
+        "D2": text[i2 + len(D2_MARK):i3].strip(),
+        "D3": text[i3 + len(D3_MARK):i4].strip(),
+        "D4": text[i4 + len(D4_MARK):end if end > 0 else len(text)].strip(),
+    }
+
+
+def _content(m) -> str:
+    return m.get("content", "") if isinstance(m, dict) else str(getattr(m, "content", m))
+
+
+# =========================================================
+# Synthetic responses
+# =========================================================
+
+def synthetic_iteration_1(blocks: dict, max_per_section: int = 8) -> dict:
+    selected = []
+    for sec in ("D2", "D3", "D4"):
+        sentences = [s.strip() for s in SENTENCE_SPLIT.split(blocks.get(sec, "")) if len(s.strip()) > 3]
+        for s in sentences[:max_per_section]:
+            ann = {"status": "support"}
+            if sec == "D4":
+                ann["subject"] = s.split()[0]
+            selected.append({"text": s, "source_section": sec, "annotations": ann})
+    return {"selected_sentences": selected}
+
+
+def synthetic_iteration_2(blocks: dict) -> dict:
+    signals = {}
+    for sec in ("D2", "D3", "D4"):
+        signals[sec] = [
+            m.groups() for m in
+            (SIGNAL_LINE.match(line.strip()) for line in blocks.get(sec, "").splitlines())
+            if m
+        ]
+
+    d2, d4 = signals["D2"], signals["D4"]
+    first_text = d2[0][2] if d2 else ""
+
+    return {
+        "system_name": "Synthetic system",
+        "failure_element": (d4[0][1] or None) if d4 else None,
+        "failure_mode": first_text[:120] or None,
+        "failure_effect": d2[1][2][:120] if len(d2) > 1 else None,
+        "failure_level": "sub_system",
+        "supporting_entities": [{"sentence_id": sid} for sid, _, _ in d2[:3]],
+        "root_causes": [
+            {
+                "cause_level": "unknown",
+                "failure_cause": text[:160],
+                "discipline_type": "Other",
+                "cause_parent": None,
+                "supporting_entities": [{"sentence_id": sid}],
+                "inferred_insight": None,
+                "confidence": "medium",
+            }
+            for sid, _, text in d4[:2]
+        ],
+    }
+
+
+def synthetic_response(messages) -> str:
+    text = "\n".join(_content(m) for m in messages)
+    blocks = _section_blocks(text)
+
+    if not blocks:
+        return "{}"  # D2/D4 single-section extractors: empty but valid JSON
+    if "[id:" in text:
+        return json.dumps(synthetic_iteration_2(blocks), ensure_ascii=False)
+    return json.dumps(synthetic_iteration_1(blocks), ensure_ascii=False)
+
+
+# =========================================================
+# Chat model stand-ins (only .invoke is used by the pipeline)
+# =========================================================
+
+class FakeChatModel:
+    """Schema-valid synthetic responses with simulated latency."""
+
+    cacheable = False  # never write synthetic output into the response cache
+
+    def __init__(self, model: str, temperature: float = 0, json_mode: bool = False, latency: LatencyModel | None = None):
+        self.model_name = model
+        self.temperature = float(temperature)
+        self.model_kwargs = {"response_format": {"type": "json_object"}} if json_mode else {}
+        self.latency = latency or LatencyModel(os.getenv("LLM_FAKE_LATENCY", "constant:0"))
+        self.calls = 0
+
+    def _respond(self, messages) -> str:
+        return synthetic_response(messages)
+
+    def invoke(self, messages):
+        delay = self.latency.sample()
+        if delay:
+            time.sleep(delay)
+        self.calls += 1
+        return AIMessage(content=self._respond(messages))
+
+
+class ReplayChatModel(FakeChatModel):
+    """
+    Serves responses recorded in the response cache for the same
+    (model, temperature, response_format, messages) key.
+    """
+
+    def __init__(self, *args, cache_path: str | None = None, strict: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_path = str(cache_path or os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH))
+        self.strict = strict
+        self.replayed = 0
+        self.synthesized = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: str) -> str | None:
+        """Recorded response for `key`; a cache file that does not exist (yet) is empty."""
+        with self._lock:
+            if self._conn is None:
+                if not os.path.exists(self.cache_path):
+                    return None
+                self._conn = sqlite3.connect(f"file:{self.cache_path}?mode=ro", uri=True, check_same_thread=False)
+            try:
+                row = self._conn.execute("SELECT content FROM responses WHERE key = ?", (key,)).fetchone()
+            except sqlite3.OperationalError:  # file exists but has no responses table
+                return None
+        return row[0] if row is not None else None
+
+    def _respond(self, messages) -> str:
+        key = make_cache_key(self, messages)
+        content = self._lookup(key)
+
+        if content is not None:
+            self.replayed += 1
+            return content
+
+        if self.strict:
+            raise KeyError(f"No recorded response for prompt key {key[:12]}")
+
+        self.synthesized += 1
+        return synthetic_response(messages)
@@ -1,7 +1,21 @@
 from langchain_openai import ChatOpenAI
 import os
+import time
+import threading
+from collections import deque
+import httpx
+import openai
 from dotenv import load_dotenv
 from langchain_ollama import ChatOllama
+from langchain_core.messages import AIMessage
+from Information_extraction_8D.main.llm_cache import (
+    LLMResponseCache,
+    DEFAULT_CACHE_PATH,
+    make_cache_key,
+    describe_llm,
+    cache_enabled_by_env,
+)
+from pipeline_common.instrumentation import timer, count
 
 load_dotenv()
 
@@ -18,21 +32,41 @@ load_dotenv()
 #     temperature=0,
 # )
 
-def get_llm_backend(
-    backend: str = "openai",
-    model: str | None = None,
-    temperature: float = 0,
-    json_mode: bool = False
-):
-    """
-    Returns an LLM instance based on selected backend.
-    Backend controlled by environment: LLM_BACKEND=openai|azure|local
-    """
-    backend = backend or os.getenv("LLM_BACKEND", "openai")
+# =========================================================
+# Client pool
+# =========================================================
+
+# One keep-alive HTTP pool shared by every OpenAI-compatible client
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+HTTP_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+
+# Offline backends (fake_llm.py), selectable without touching the tools via
+# LLM_BACKEND_OVERRIDE=fake|replay or set_backend_override()
+OFFLINE_BACKENDS = {"fake", "replay"}
+_backend_override: str | None = os.getenv("LLM_BACKEND_OVERRIDE") or None
+
+_http_client: httpx.Client | None = None
+_clients: dict = {}
+_clients_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(limits=HTTP_POOL_LIMITS, timeout=HTTP_TIMEOUT)
+    return _http_client
+
+
+def _build_llm(backend: str, model: str, temperature: float, json_mode: bool):
+    if backend in OFFLINE_BACKENDS:
+        from Information_extraction_8D.main.fake_llm import FakeChatModel, ReplayChatModel
+
+        cls = ReplayChatModel if backend == "replay" else FakeChatModel
+        return cls(model=model, temperature=temperature, json_mode=json_mode)
 
     if backend == "local":
         return ChatOllama(
-            model=model or os.getenv("LLM_MODEL", "llama3.1:8b"),
+            model=model,
             temperature=temperature,
         )
 
@@ -41,9 +75,233 @@ def get_llm_backend(
         model_kwargs["response_format"] = {"type": "json_object"}
 
     return ChatOpenAI(
-        model=model or os.getenv("LLM_MODEL", "azure/gpt-4.1"),
+        model=model,
         temperature=temperature,
         openai_api_base=os.getenv("OPENAI_API_BASE", "http://litellm.ame.local/v1"),
         openai_api_key=os.getenv("OPENAI_API_KEY"),
         model_kwargs=model_kwargs,
-    )
\ No newline at end of file
+        http_client=get_http_client(),
+    )
+
+
+def get_llm_backend(
+    backend: str = "openai",
+    model: str | None = None,
+    temperature: float = 0,
+    json_mode: bool = False
+):
+    """
+    Returns an LLM instance based on selected backend.
+    Backend controlled by environment: LLM_BACKEND=openai|azure|local|fake|replay
+    (LLM_BACKEND_OVERRIDE replaces the backend requested by the tools)
+
+    Instances are cached per (backend, model, temperature, json_mode) and
+    reused across calls and threads.
+    """
+    backend = _backend_override or backend or os.getenv("LLM_BACKEND", "openai")
+
+    if backend == "local":
+        model = model or os.getenv("LLM_MODEL", "llama3.1:8b")
+    else:
+        model = model or os.getenv("LLM_MODEL", "azure/gpt-4.1")
+
+    key = (backend, model, temperature, json_mode)
+    with _clients_lock:
+        llm = _clients.get(key)
+        if llm is None:
+            llm = _build_llm(backend, model, temperature, json_mode)
+            _clients[key] = llm
+    return llm
+
+
+def set_backend_override(backend: str | None):
+    """Route every get_llm_backend() call to `backend` (None restores normal selection)."""
+    global _backend_override
+    _backend_override = backend
+
+
+def clear_llm_cache():
+    """Drop cached clients (e.g. after changing environment variables)."""
+    with _clients_lock:
+        _clients.clear()
+
+
+# =========================================================
+# Rate limiting (shared by every LLM call in the process)
+# =========================================================
+
+class RateLimiter:
+    """
+    Thread-safe sliding-window limiter for requests/minute and tokens/minute.
+    acquire() blocks until the call fits in both budgets.
+    """
+
+    def __init__(self, requests_per_minute: int | None = None, tokens_per_minute: int | None = None):
+        self.rpm = requests_per_minute
+        self.tpm = tokens_per_minute
+        self._events = deque()   # (timestamp, tokens)
+        self._tokens = 0
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float):
+        while self._events and now - self._events[0][0] >= 60:
+            _, n = self._events.popleft()
+            self._tokens -= n
+
+    def acquire(self, tokens: int = 0):
+        if self.tpm:
+            tokens = min(tokens, self.tpm)  # a single oversized call must still pass
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._evict(now)
+
+                rpm_ok = not self.rpm or len(self._events) < self.rpm
+                tpm_ok = not self.tpm or self._tokens + tokens <= self.tpm
+                if rpm_ok and tpm_ok:
+                    self._events.append((now, tokens))
+                    self._tokens += tokens
+                    return
+
+                wait = 60 - (now - self._events[0][0]) if self._events else 0.1
+
+            time.sleep(max(wait, 0.05))
+
+
+_rate_limiter: RateLimiter | None = None
+
+
+def configure_rate_limit(requests_per_minute: int | None = None, tokens_per_minute: int | None = None):
+    """Install (or remove, with no arguments) the process-wide LLM rate limit."""
+    global _rate_limiter
+    if requests_per_minute or tokens_per_minute:
+        _rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+    else:
+        _rate_limiter = None
+
+
+def estimate_tokens(messages) -> int:
+    """Rough prompt size (~4 characters per token), used for tokens/minute budgeting."""
+    chars = 0
+    for m in messages:
+        content = m.get("content", "") if isinstance(m, dict) else getattr(m, "content", m)
+        chars += len(str(content))
+    return chars // 4 + 1
+
+
+# =========================================================
+# Error classification (batch retries)
+# =========================================================
+
+# Network, timeout, rate-limit and server-side failures: worth another attempt
+TRANSIENT_ERRORS = (
+    TimeoutError,
+    ConnectionError,
+    httpx.TransportError,          # connect / read timeouts, dropped connections
+    openai.APIConnectionError,     # includes APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+TRANSIENT_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+def is_transient_llm_error(exc: BaseException) -> bool:
+    """
+    True for errors a retry can fix. Everything else (missing sections,
+    schema validation, missing files, ...) fails the same way every time.
+    """
+    if isinstance(exc, TRANSIENT_ERRORS):
+        return True
+
+    # openai.APIStatusError / ollama.ResponseError carry status_code,
+    # httpx.HTTPStatusError the response
+    status = getattr(exc, "status_code", None)
+    if status is None and isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+    return status in TRANSIENT_STATUS_CODES
+
+
+# =========================================================
+# Response cache (deterministic calls only)
+# =========================================================
+
+_response_cache: LLMResponseCache | None = None
+_cache_enabled = cache_enabled_by_env()
+_cache_lock = threading.Lock()
+
+
+def configure_llm_cache(enabled: bool = True, path: str | None = None):
+    """Enable/disable the persistent response cache, optionally at a custom path."""
+    global _response_cache, _cache_enabled
+    with _cache_lock:
+        _cache_enabled = enabled
+        if path is not None and (_response_cache is None or str(_response_cache.path) != str(path)):
+            _response_cache = LLMResponseCache(path)
+
+
+def get_llm_cache() -> LLMResponseCache | None:
+    global _response_cache
+    if not _cache_enabled:
+        return None
+    with _cache_lock:
+        if _response_cache is None:
+            _response_cache = LLMResponseCache(os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH))
+        return _response_cache
+
+
+def llm_cache_stats() -> dict | None:
+    cache = get_llm_cache()
+    return cache.stats() if cache else None
+
+
+def invoke_llm(llm, messages, use_cache: bool = True, parse=None):
+    """
+    Single entry point for LLM calls.
+
+    Temperature-0 calls are served from the response cache when possible
+    (use_cache=False or LLM_CACHE=off bypasses it); misses go through the
+    configured rate limit and are stored after a successful call.
+
+    parse: optional callable applied to the response text; its result is
+    returned instead of the message. A response is only cached once it
+    parses, and a cached response that no longer parses is dropped and
+    requested again, so a truncated / schema-invalid answer is never replayed.
+    """
+    cacheable = use_cache and getattr(llm, "cacheable", True) and getattr(llm, "temperature", None) == 0
+    cache = get_llm_cache() if cacheable else None
+
+    model = describe_llm(llm)["model"]
+
+    key = None
+    if cache is not None:
+        key = make_cache_key(llm, messages)
+        content = cache.get(key)
+        if content is not None:
+            if parse is None:
+                count("llm.cache", model=model, result="hit")
+                return AIMessage(content=content)
+            try:
+                parsed = parse(content)
+            except Exception:
+                count("llm.cache", model=model, result="invalid")
+                cache.delete(key)
+            else:
+                count("llm.cache", model=model, result="hit")
+                return parsed
+        else:
+            count("llm.cache", model=model, result="miss")
+
+    if _rate_limiter is not None:
+        with timer("llm.rate_limit_wait"):
+            _rate_limiter.acquire(estimate_tokens(messages))
+    with timer("llm.invoke", model=model):
+        resp = llm.invoke(messages)
+
+    # Raises before anything is cached when the response does not parse
+    parsed = parse(resp.content) if parse is not None else resp
+
+    if cache is not None and isinstance(getattr(resp, "content", None), str):
+        cache.put(key, resp.content, model=model)
+
+    return parsed
@@ -0,0 +1,122 @@
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from datetime import datetime
+
+# Default location: next to the package, override with LLM_CACHE_PATH
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / "llm_cache.sqlite"
+
+
+def _message_to_dict(m) -> dict:
+    if isinstance(m, dict):
+        return {"role": m.get("role", ""), "content": m.get("content", "")}
+    # langchain BaseMessage
+    return {"role": getattr(m, "type", ""), "content": getattr(m, "content", str(m))}
+
+
+def describe_llm(llm) -> dict:
+    """Model identity that determines the response (part of the cache key)."""
+    model_kwargs = getattr(llm, "model_kwargs", None) or {}
+    temperature = getattr(llm, "temperature", None)
+    return {
+        "model": getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__,
+        # pydantic clients store 0.0, plain ones may keep the int 0: same key for both
+        "temperature": float(temperature) if temperature is not None else None,
+        "response_format": model_kwargs.get("response_format"),
+    }
+
+
+def make_cache_key(llm, messages) -> str:
+    payload = {
+        **describe_llm(llm),
+        "messages": [_message_to_dict(m) for m in messages],
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Persistent SQLite cache of LLM response texts.
+
+    Keyed by sha256 of (model, temperature, response_format, messages).
+    Safe to share between threads; hit/miss counters are per process.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                content TEXT NOT NULL,
+                created_at TEXT
+            )
+            """
+        )
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, content: str, model: str | None = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, content, created_at) VALUES (?, ?, ?, ?)",
+                (key, model, content, datetime.now().isoformat(timespec="seconds")),
+            )
+            self._conn.commit()
+            self.writes += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "entries": size,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def cache_enabled_by_env() -> bool:
+    """LLM_CACHE=0|off|false bypasses the cache for the whole process."""
+    return os.getenv("LLM_CACHE", "on").strip().lower() not in {"0", "off", "false", "no"}
@@ -4,52 +4,43 @@ from docx import Document
 import re
 from Information_extraction_8D.Schemas.eightD_schema_json import EightDCase
 import json
+import io
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
 from pydantic import ValidationError
+from pipeline_common.instrumentation import timer, count
 
-from docx import Document
+# Parsed documents keyed by SHA-256 of the file bytes (re-runs / retries of
+# the same report skip the DOCX unzip + XML parse entirely)
+_PARSE_CACHE: "OrderedDict[str, dict]" = OrderedDict()
+# end_to_end parses reports from worker threads
+_PARSE_CACHE_LOCK = threading.Lock()
+PARSE_CACHE_SIZE = 256
 
-def split_sections(doc_path):
-    # Load the .docx document from disk
-    doc = Document(doc_path)
 
-    # This will hold the final list of sections:
-    # each item is {"title": <Heading 2 text>, "content": <joined paragraph text>}
+def _split_paragraphs(doc) -> list:
+    # Each item is {"title": <Heading 2 text>, "content": <joined paragraph text>}
     sections = []
-
-    # Tracks the current section title (a Heading 2)
     current_title = None
-
-    # Accumulates paragraph text that belongs to the current section
     current_text = []
 
-    # Iterate over every paragraph in the document, in order
     for para in doc.paragraphs:
-        # Get the paragraph's style name (e.g., "Heading 1", "Heading 2", "Normal", etc.)
-        style = para.style.name
-
-        # If this paragraph is a Heading 2, it marks the start of a new section
-        if style == "Heading 2":
-
-            # If we were already collecting a previous section, finalize it and store it
+        # A Heading 2 paragraph marks the start of a new section
+        if para.style.name == "Heading 2":   # e.g., "2.2 D2", "2.4 D4"
             if current_title:
                 sections.append({
                     "title": current_title,
-                    # Join collected paragraphs with newlines, remove leading/trailing whitespace
                     "content": "\n".join(current_text).strip()
                 })
-
-            # Start a new section with this heading text as the title
             current_title = para.text.strip()
-
-            # Reset the content accumulator for the new section
             current_text = []
-
         else:
-            # For non-heading paragraphs:
-            # - only collect text if we are inside a section (current_title exists)
-            # - ignore empty/whitespace-only paragraphs
-            if current_title and para.text.strip():
-                current_text.append(para.text.strip())
+            # Only collect non-empty text once we are inside a section
+            text = para.text.strip()
+            if current_title and text:
+                current_text.append(text)
 
     # After the loop, we may have an unfinished section to save
     if current_title:
@@ -58,19 +49,74 @@ def split_sections(doc_path):
             "content": "\n".join(current_text).strip()
         })
 
-    # Return the list of extracted sections
     return sections
 
 
-def extract_product(doc_path):
-    doc = Document(doc_path)
+def _read_tables(doc):
+    """Return (table key/values, product name) from the two-column header tables."""
+    table_fields = {}
+    product_name = None
+
     for table in doc.tables:
         for row in table.rows:
-            if len(row.cells) < 2: continue
-            key = row.cells[0].text.lower()
-            if "product" in key:
-                return row.cells[1].text.strip()
-    return None
+            cells = row.cells
+            if len(cells) < 2:
+                continue
+            key = cells[0].text.strip()
+            value = cells[1].text.strip()
+            if key and key not in table_fields:
+                table_fields[key] = value
+            if product_name is None and "product" in cells[0].text.lower():
+                product_name = value
+
+    return table_fields, product_name
+
+
+def parse_docx(doc_path) -> dict:
+    """
+    Parse an 8D DOCX in a single pass over one Document object.
+
+    Returns {"sections": [...], "product_name": str | None, "table_fields": {key: value}}.
+    Results are cached by file hash; callers get their own copy.
+    """
+    with open(doc_path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+
+    with _PARSE_CACHE_LOCK:
+        cached = _PARSE_CACHE.get(digest)
+        if cached is not None:
+            _PARSE_CACHE.move_to_end(digest)
+
+    if cached is None:
+        count("docx.parse_cache", result="miss")
+        # Parsed outside the lock; two threads racing on the same file both
+        # parse it and the second insert wins
+        with timer("docx.parse"):
+            doc = Document(io.BytesIO(data))
+            table_fields, product_name = _read_tables(doc)
+            cached = {
+                "sections": _split_paragraphs(doc),
+                "product_name": product_name,
+                "table_fields": table_fields,
+            }
+        with _PARSE_CACHE_LOCK:
+            _PARSE_CACHE[digest] = cached
+            _PARSE_CACHE.move_to_end(digest)
+            while len(_PARSE_CACHE) > PARSE_CACHE_SIZE:
+                _PARSE_CACHE.popitem(last=False)
+    else:
+        count("docx.parse_cache", result="hit")
+
+    return copy.deepcopy(cached)
+
+
+def split_sections(doc_path):
+    return parse_docx(doc_path)["sections"]
+
+
+def extract_product(doc_path):
+    return parse_docx(doc_path)["product_name"]
 
 
 def find_8d_id(filename):
@@ -0,0 +1,29 @@
+"""
+Shared, lazily loaded spaCy pipeline.
+
+Only the components the extraction / evaluation tools use are kept:
+tokenizer, tagger + attribute_ruler (needed by the rule-based lemmatizer),
+lemmatizer and a rule-based sentencizer. Parser and NER are never loaded.
+"""
+
+from functools import lru_cache
+
+SPACY_MODEL = "en_core_web_sm"
+EXCLUDED_COMPONENTS = ["parser", "ner", "senter"]
+
+
+@lru_cache(maxsize=None)
+def get_nlp(model: str = SPACY_MODEL):
+    """Load the pipeline on first use; later calls (from any module) reuse it."""
+    import spacy  # deferred: importing spacy alone is a noticeable share of start-up
+
+    nlp = spacy.load(model, exclude=EXCLUDED_COMPONENTS)
+    if "sentencizer" not in nlp.pipe_names:
+        nlp.add_pipe("sentencizer")
+    return nlp
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(model: str = SPACY_MODEL):
+    """Tokenizer only (no pipeline components) for token-level heuristics."""
+    return get_nlp(model).tokenizer
@@ -0,0 +1,134 @@
+"""
+Token-budgeted compression of D2/D3/D4 text before LLM iteration 1.
+
+Each section is split into sentences, sentences are scored with the
+text_normalization value heuristic, and the highest-value sentences are
+kept (in original order, original wording) until the section's token
+budget is used. Dropped sentences are reported so the budget can be tuned.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from Information_extraction_8D.tools.text_normalization import (
+    normalize_text,
+    sentence_tokens,
+    score_tokens,
+    split_sentences,
+)
+
+DEFAULT_ENCODING = "o200k_base"   # gpt-4.1 / gpt-4o family
+
+
+@lru_cache(maxsize=None)
+def _encoding(name: str = DEFAULT_ENCODING):
+    import tiktoken
+    return tiktoken.get_encoding(name)
+
+
+def count_tokens(text: str, encoding: str = DEFAULT_ENCODING) -> int:
+    return len(_encoding(encoding).encode(text or "", disallowed_special=()))
+
+
+def compress_section(
+    text: str,
+    token_budget: int,
+    *,
+    encoding: str = DEFAULT_ENCODING,
+) -> Dict[str, Any]:
+    """
+    Keep the highest-value sentences of `text` within `token_budget` tokens.
+
+    Returns {"text", "kept", "dropped", "original_tokens", "kept_tokens"}.
+    """
+    text = text or ""
+    original_tokens = count_tokens(text, encoding)
+
+    if original_tokens <= token_budget:
+        return {
+            "text": text,
+            "kept": None,          # untouched
+            "dropped": [],
+            "original_tokens": original_tokens,
+            "kept_tokens": original_tokens,
+        }
+
+    sentences = split_sentences(text)
+    costs = [count_tokens(s, encoding) + 1 for s in sentences]   # +1 for the joining newline
+    scores = [score_tokens(sentence_tokens(normalize_text(s))) for s in sentences]
+
+    # Greedy by value (ties -> earlier sentence), skip what no longer fits
+    order = sorted(range(len(sentences)), key=lambda i: (-scores[i], i))
+    keep = set()
+    used = 0
+    for i in order:
+        if used + costs[i] <= token_budget:
+            keep.add(i)
+            used += costs[i]
+
+    kept = [sentences[i] for i in range(len(sentences)) if i in keep]
+    dropped = [
+        {"sentence": sentences[i], "score": round(scores[i], 3), "tokens": costs[i] - 1}
+        for i in range(len(sentences)) if i not in keep
+    ]
+
+    compressed = "\n".join(kept)
+    return {
+        "text": compressed,
+        "kept": kept,
+        "dropped": dropped,
+        "original_tokens": original_tokens,
+        "kept_tokens": count_tokens(compressed, encoding),
+    }
+
+
+def compress_iteration1_inputs(
+    d2_raw: Optional[str],
+    d3_raw: Optional[str],
+    d4_raw: Optional[str],
+    token_budget: int,
+    *,
+    with_coverage: bool = False,
+) -> tuple:
+    """
+    Compress the iteration-1 inputs section by section.
+
+    Returns (data, report): `data` is the {"d2_raw", "d3_raw", "d4_raw"} dict
+    for extract_iteration_1; `report` lists per-section token counts, dropped
+    sentences and (optionally) the source coverage of what was kept.
+    """
+    data = {}
+    report: Dict[str, Any] = {"token_budget": token_budget, "sections": {}}
+
+    for key, raw in (("d2_raw", d2_raw), ("d3_raw", d3_raw), ("d4_raw", d4_raw)):
+        res = compress_section(raw or "", token_budget)
+        data[key] = res["text"]
+
+        sec_report = {
+            "original_tokens": res["original_tokens"],
+            "kept_tokens": res["kept_tokens"],
+            "dropped_count": len(res["dropped"]),
+            "dropped": res["dropped"],
+        }
+
+        if with_coverage and res["dropped"]:
+            # Deferred: only needed when tuning the budget
+            from Information_extraction_8D.Evaluation.coverage_compress_evaluation import (
+                compute_source_coverage,
+            )
+            cov = compute_source_coverage(raw or "", res["kept"])
+            sec_report["source_coverage"] = cov["mean_coverage"]
+
+        report["sections"][key[:2].upper()] = sec_report
+
+    return data, report
+
+
+def summarize_compression(report: Dict[str, Any]) -> str:
+    parts = []
+    for sec, r in report["sections"].items():
+        line = f"{sec}: {r['original_tokens']}->{r['kept_tokens']} tok, dropped {r['dropped_count']}"
+        if "source_coverage" in r:
+            line += f", coverage {r['source_coverage']:.2f}"
+        parts.append(line)
+    return "; ".join(parts)
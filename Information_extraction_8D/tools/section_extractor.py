@@ -1,12 +1,11 @@
 from langchain.tools import tool
 from Information_extraction_8D.Prompts.eightD_extract_prompt import D2_prompt, D4_prompt
-from Information_extraction_8D.tools.doc_parser import safe_json
+from Information_extraction_8D.tools.doc_parser import safe_json, split_sections
 
 from Information_extraction_8D.Prompts.eightD_prompt_integrate import Prompt
 from Information_extraction_8D.Prompts.eightD_prompt_iteration import iter_prompt_1
 from Information_extraction_8D.Prompts.eightD_prompt_iteration2 import iter_prompt_2
-from Information_extraction_8D.main.llm import get_llm_backend
-from docx import Document
+from Information_extraction_8D.main.llm import get_llm_backend, invoke_llm
 from typing import Optional, List, Literal
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
@@ -15,6 +14,52 @@ from langsmith import get_current_run_tree, traceable
 import os
 
 
+# =========================================================
+# Prompt templates (built once at import)
+# =========================================================
+
+EXTRACTOR_SYSTEM = "You are an expert reliability and systems engineer. Always output STRICT JSON."
+
+EXTRACTOR_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", EXTRACTOR_SYSTEM),
+    ("user", Prompt),
+])
+
+# System prompt to control how the model should behave
+ITERATION1_SYSTEM_PROMPT = """
+    You are an expert quality and reliability engineer specializing in 8D problem solving, FMEA, and failure analysis.
+    Your task is STRICTLY LIMITED to selecting HIGH VALUE sentences from the input text D2,D3,D4
+    """
+
+ITERATION_PROMPT_1 = ChatPromptTemplate.from_messages([
+    ("system", ITERATION1_SYSTEM_PROMPT),
+    ("user", iter_prompt_1),   # User input: the actual task from the user (sentence selection)
+])
+
+ITERATION2_SYSTEM_PROMPT = """
+    You are an expert reliability and FMEA engineer.
+
+    You are given extracted text signals from an 8D report:
+    - D2: Define problem and symptoms
+    - D3: Interim containment / quick fix
+    - D4: Root cause analysis
+
+    Core constraints (MANDATORY):
+    - The entire input represents ONE failure case.
+    - Do NOT split into multiple failures.
+    - Use ONLY the provided signals.
+    - Do NOT invent or infer facts beyond the signals.
+    - Output STRICT JSON only.
+    """
+
+ITERATION_PROMPT_2 = ChatPromptTemplate.from_messages([
+    ("system", ITERATION2_SYSTEM_PROMPT),
+    ("user", iter_prompt_2),
+])
+
+JSON_PARSER = JsonOutputParser()
+
+
 @tool
 def extract_d2(section_text: str):
     """Extract structured D2 information."""
@@ -37,8 +82,7 @@ def extract_d2(section_text: str):
         }
     ]
 
-    resp = llm.invoke(messages)
-    return safe_json(resp.content)
+    return invoke_llm(llm, messages, parse=safe_json)
 
 
 @tool
@@ -71,13 +115,8 @@ def extract_d4(data: dict):
             )
         }
     ]
-    # Call LLM
-    resp = llm.invoke(messages)
-
-    # resp.content may not exist depending on client
-    text = resp.content if hasattr(resp, "content") else resp
-
-    return safe_json(text)
+    # Call LLM (parsed before the response is cached)
+    return invoke_llm(llm, messages, parse=safe_json)
 
 @tool
 def extract_failure_d234(data: dict) -> dict:
@@ -91,20 +130,12 @@ def extract_failure_d234(data: dict) -> dict:
         json_mode=True,
         temperature=0,
     )
-    extractor_system = "You are an expert reliability and systems engineer. Always output STRICT JSON."
-
-    extractor_prompt = ChatPromptTemplate.from_messages([
-        ("system", extractor_system),
-        ("user", Prompt),  
-    ])
-    prompt = extractor_prompt.invoke({
+    prompt = EXTRACTOR_PROMPT.invoke({
             "d2": d2_text,
             "d3": d3_text,
             "d4": d4_text
     })
-    resp = llm.invoke(prompt.to_messages())
-    parser = JsonOutputParser()
-    return parser.parse(resp.content)
+    return invoke_llm(llm, prompt.to_messages(), parse=JSON_PARSER.parse)
 
 @tool # Langsmith tool
 def extract_iteration_1(data: dict) -> dict:
@@ -121,30 +152,19 @@ def extract_iteration_1(data: dict) -> dict:
         temperature=0,  # Controls randomness: 0 = fully deterministic and repeatable responses
     )
 
-    # System prompt to control how the model should behave
-    iteration1_system_prompt= """
-    You are an expert quality and reliability engineer specializing in 8D problem solving, FMEA, and failure analysis.
-    Your task is STRICTLY LIMITED to selecting HIGH VALUE sentences from the input text D2,D3,D4
-    """ 
-
-    iteration_prompt_1 = ChatPromptTemplate.from_messages([
-        ("system", iteration1_system_prompt),
-        ("user", iter_prompt_1),   # User input: the actual task from the user (sentence selection)
-    ])
     # Integrate the prompt tempate and the actual text content
-    prompt = iteration_prompt_1.invoke({
+    prompt = ITERATION_PROMPT_1.invoke({
             "d2": d2_text,
             "d3": d3_text,
             "d4": d4_text
     })
-    # Call LLM with the input (prompt + specific text)
-    resp = llm.invoke(prompt.to_messages())
-    # Parse the response into a Python dictionary
-    parsed = JsonOutputParser().parse(resp.content)
+    # Call LLM with the input (prompt + specific text); the response is
+    # parsed and strictly validated before it is cached
+    return invoke_llm(llm, prompt.to_messages(), parse=parse_iteration1_output)
 
-    # strict validation
-    validated = Iteration1Output(**parsed)
-    return validated
+def parse_iteration1_output(text: str) -> Iteration1Output:
+    # Parse the response into a Python dictionary, then strict validation
+    return Iteration1Output(**JSON_PARSER.parse(text))
 
 def format_signals(signals, include_subject: bool = False) -> str:
     def _fmt_one(s: dict) -> str:
@@ -183,22 +203,6 @@ def extract_iteration_2(data: dict) -> dict:
         temperature=0,
     )
 
-    iteration_system_2 = """
-    You are an expert reliability and FMEA engineer.
-
-    You are given extracted text signals from an 8D report:
-    - D2: Define problem and symptoms
-    - D3: Interim containment / quick fix
-    - D4: Root cause analysis
-
-    Core constraints (MANDATORY):
-    - The entire input represents ONE failure case.
-    - Do NOT split into multiple failures.
-    - Use ONLY the provided signals.
-    - Do NOT invent or infer facts beyond the signals.
-    - Output STRICT JSON only.
-    """
-
     # --- split signals ---
     d2_signals, d3_signals, d4_signals = [], [], []
     for s in data.get("signals", []):
@@ -214,20 +218,13 @@ def extract_iteration_2(data: dict) -> dict:
     d3_sentence = format_signals(d3_signals, include_subject=False)
     d4_sentence = format_signals(d4_signals, include_subject=True)
 
-    iteration_prompt_2 = ChatPromptTemplate.from_messages([
-        ("system", iteration_system_2),
-        ("user", iter_prompt_2),
-    ])
-
-    prompt = iteration_prompt_2.invoke({
+    prompt = ITERATION_PROMPT_2.invoke({
         "D2": d2_sentence,
         "D3": d3_sentence,
         "D4": d4_sentence,
     })
 
-    resp = llm.invoke(prompt.to_messages())
-    parser = JsonOutputParser()
-    return parser.parse(resp.content)
+    return invoke_llm(llm, prompt.to_messages(), parse=JSON_PARSER.parse)
 
 
 
@@ -237,33 +234,7 @@ def parse_8d_doc(doc_path: str) -> dict:
     Parse a DOCX 8D document into raw sections (title + content).
     Returns {"sections": [{"title": ..., "content": ...}, ...]}.
     """
-    doc = Document(doc_path)
-    sections = []
-    current_title = None
-    current_text: List[str] = []
-
-    for para in doc.paragraphs:
-        style = para.style.name
-
-        if style == "Heading 2":   # e.g., "2.2 D2", "2.4 D4"
-            if current_title:
-                sections.append({
-                    "title": current_title,
-                    "content": "\n".join(current_text).strip()
-                })
-            current_title = para.text.strip()
-            current_text = []
-        else:
-            if current_title and para.text.strip():
-                current_text.append(para.text.strip())
-
-    if current_title:
-        sections.append({
-            "title": current_title,
-            "content": "\n".join(current_text).strip()
-        })
-
-    return {"sections": sections}
+    return {"sections": split_sections(doc_path)}
 
 def build_d2_context(d2_info: dict) -> str:
     failures = d2_info.get("failures", [])
@@ -1,9 +1,5 @@
 import re
-import spacy
-from sklearn.feature_extraction.text import TfidfVectorizer
-
-
-nlp = spacy.load("en_core_web_sm")
+from Information_extraction_8D.tools.nlp_models import get_nlp
 
 FAIL_KEYWORDS = {
     # general
@@ -82,26 +78,79 @@ PROCESS_WORD = {
     "pack", "shipment"
 }
 
+# Single token -> score lookup (2 per FAIL keyword, 1 per CAUSE word)
+TOKEN_WEIGHTS = {
+    tok: 2 * (tok in FAIL_KEYWORDS) + (tok in CAUSE_WORDS)
+    for tok in FAIL_KEYWORDS | CAUSE_WORDS
+}
+
+# Only the sentencizer is needed to split sentences; token texts come from
+# the tokenizer, so every statistical component is skipped
+SENTENCE_ONLY_DISABLE = ["tok2vec", "tagger", "attribute_ruler", "lemmatizer"]
+
+_DATE_RE = re.compile(r"\b\d{1,2}-\d{1,2}-\d{4}\b")
+_MOTOR_ID_RE = re.compile(r"motor\s*\d+")
+_WS_RE = re.compile(r"\s+")
+
+
 def normalize_text(text: str) -> str:
     text = text.lower()
-    text = re.sub(r"\b\d{1,2}-\d{1,2}-\d{4}\b", "", text)  # dates
-    text = re.sub(r"motor\s*\d+", "motor", text)        # motor IDs
-    text = re.sub(r"\s+", " ", text)
+    text = _DATE_RE.sub("", text)  # dates
+    text = _MOTOR_ID_RE.sub("motor", text)        # motor IDs
+    text = _WS_RE.sub(" ", text)
     return text.strip()
 
-def sentence_value(sentence: str) -> float:
-    tokens = {t.text for t in nlp(sentence)}
-    fail_score = len(tokens & FAIL_KEYWORDS)
-    cause_score = len(tokens & CAUSE_WORDS)
+
+def score_tokens(tokens: set) -> float:
+    keyword_score = sum(TOKEN_WEIGHTS.get(t, 0) for t in tokens)
     length_score = min(len(tokens) / 20, 1.0)
-    return fail_score * 2 + cause_score + length_score
+    return keyword_score + length_score
 
-def extract_valuable_sentences(text: str, top_k=10):
-    text = normalize_text(text)
-    doc = nlp(text)
-    sentences = [s.text.strip() for s in doc.sents if len(s.text.split()) > 6]
 
-    scored = [(s, sentence_value(s)) for s in sentences]
-    scored.sort(key=lambda x: x[1], reverse=True)
+def sentence_tokens(sentence: str) -> set:
+    return {t.text for t in get_nlp().tokenizer(sentence)}
+
+
+def sentence_value(sentence: str) -> float:
+    return score_tokens(sentence_tokens(sentence))
+
 
+def _rank_doc_sentences(doc, top_k):
+    scored = []
+    for s in doc.sents:
+        text = s.text.strip()
+        if len(text.split()) <= 6:
+            continue
+        # Reuse the tokens of the parse instead of re-tokenizing the sentence
+        tokens = {t.text for t in s if not t.is_space}
+        scored.append((text, score_tokens(tokens)))
+
+    scored.sort(key=lambda x: x[1], reverse=True)
     return [s for s, _ in scored[:top_k]]
+
+
+def _sentence_docs(texts, batch_size):
+    nlp = get_nlp()
+    disable = [p for p in SENTENCE_ONLY_DISABLE if p in nlp.pipe_names]
+    return nlp.pipe(texts, batch_size=batch_size, disable=disable)
+
+
+def split_sentences(text: str) -> list:
+    """Sentences of the ORIGINAL text (line breaks are treated as boundaries)."""
+    lines = [line.strip() for line in (text or "").splitlines() if line.strip()]
+    return [
+        s.text.strip()
+        for doc in _sentence_docs(lines, batch_size=256)
+        for s in doc.sents
+        if s.text.strip()
+    ]
+
+
+def extract_valuable_sentences(text: str, top_k=10):
+    return extract_valuable_sentences_many([text], top_k=top_k)[0]
+
+
+def extract_valuable_sentences_many(texts, top_k=10, batch_size=64):
+    """Top-k valuable sentences for each of many documents (one nlp.pipe pass)."""
+    normalized = (normalize_text(t) for t in texts)
+    return [_rank_doc_sentences(doc, top_k) for doc in _sentence_docs(normalized, batch_size)]
@@ -0,0 +1,286 @@
+"""
+Speed benchmark for the 8D KB on a synthetic corpus.
+
+Stages: ingest_8d_json and query.failure_to_cause_pipeline. Reports
+throughput and p50/p95/p99 latency per stage plus the process peak RSS
+as JSON, so two runs can be compared (see compare_reports).
+
+Run from JSON8D_KB:
+    python -m Evaluation.benchmark --records 1000 --output bench_8d.json
+"""
+
+from __future__ import annotations
+
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Shared helpers live in the repository root package
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+import kb_structure
+from pipeline_common import instrumentation
+from pipeline_common.benchmark_common import (
+    HashEmbeddingFunction,
+    compare_reports,
+    peak_rss_mb,
+    summarize_latencies,
+    time_calls,
+)
+from kb_structure import FailureKB, CauseKB, SentenceKB
+from ingest_8d import ingest_8d_json
+from query import failure_to_cause_pipeline
+
+
+# =========================================================
+# Config
+# =========================================================
+
+DEFAULT_RECORDS = 200   # 8D cases
+CAUSES_PER_CASE = 2
+QUERY_COUNT = 100
+SEED = 42
+
+# "hash": deterministic feature-hashing embeddings (measures KB / Chroma
+# overhead without the model); "model": the KB's SentenceTransformer
+EMBEDDER = "hash"
+
+
+# =========================================================
+# Synthetic corpus
+# =========================================================
+
+ELEMENTS = [
+    "power supply", "controller board", "CAN transceiver", "DC link capacitor",
+    "gate driver", "temperature sensor", "cooling fan", "input filter",
+    "buck converter", "firmware bootloader", "encoder interface", "relay",
+]
+MODES = [
+    "no output voltage", "intermittent communication loss", "overheating",
+    "short circuit", "open circuit", "drift out of tolerance", "unexpected reset",
+    "mechanical crack", "signal noise", "wrong calibration value",
+]
+EFFECTS = [
+    "motor does not start", "loss of torque", "drive trips on fault",
+    "reduced lifetime", "customer complaint", "safety shutdown", "no effect on function",
+]
+CAUSES = [
+    "solder joint fatigue", "undersized component rating", "ESD damage during assembly",
+    "firmware timing race", "connector not fully seated", "supplier lot defect",
+    "thermal paste missing", "wrong resistor value in BOM", "moisture ingress",
+    "vibration exceeds specification",
+]
+
+
+def _entity(sid: str, text: str, section: str, entity_type: str) -> Dict[str, Any]:
+    return {
+        "sentence_id": sid,
+        "text": text,
+        "source_section": section,
+        "annotations": {
+            "entity_type": entity_type,
+            "assertion_level": "confirmed",
+            "faithful_score": 100,
+        },
+    }
+
+
+def synthetic_8d_case(
+    n: int,
+    causes_per_case: int = CAUSES_PER_CASE,
+    rng: Optional[random.Random] = None,
+) -> Dict[str, Any]:
+    """One iteration-2 style 8D case JSON (as consumed by ingest_8d_json)."""
+    rng = rng or random.Random(SEED)
+    case_id = f"8DSYNTH{n:07d}"
+    fid = f"{case_id}__F1"
+    mode, element, effect = rng.choice(MODES), rng.choice(ELEMENTS), rng.choice(EFFECTS)
+
+    root_causes = []
+    for c in range(1, causes_per_case + 1):
+        cause = f"{rng.choice(CAUSES)} on {element}"
+        root_causes.append({
+            "cause_ID": f"{fid}_C{c}",
+            "failure_cause": cause,
+            "cause_level": rng.choice(["component", "sub_system"]),
+            "discipline_type": rng.choice(["HW", "ESW", "MCH"]),
+            "confidence": rng.choice(["high", "medium"]),
+            "supporting_entities": [_entity(f"{case_id}_D4_{c}", f"Analysis showed {cause}.", "D4", "cause")],
+        })
+
+    return {
+        "documents": [{"file_name": case_id, "product_name": "Drive unit"}],
+        "failure": {
+            "failure_ID": fid,
+            "failure_mode": f"{mode} #{n}",
+            "failure_element": element,
+            "failure_effect": effect,
+            "supporting_entities": [
+                _entity(f"{case_id}_D2_1", f"Customer reported {mode} on the {element}.", "D2", "symptom"),
+                _entity(f"{case_id}_D2_2", f"As a result the {effect}.", "D2", "effect"),
+            ],
+            "root_causes": root_causes,
+        },
+        "selected_sentences": [
+            _entity(f"{case_id}_D3_1", "Affected units were replaced at the customer.", "D3", "action"),
+        ],
+    }
+
+
+def write_corpus(out_dir: Path, records: int, seed: int = SEED) -> List[Path]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for n in range(records):
+        path = out_dir / f"8DSYNTH{n:07d}.json"
+        path.write_text(json.dumps(synthetic_8d_case(n, rng=rng), ensure_ascii=False), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+# =========================================================
+# Embedding stand-in
+# =========================================================
+
+def use_embedder(kind: str) -> None:
+    if kind == "hash":
+        kb_structure.embedding_functions.SentenceTransformerEmbeddingFunction = HashEmbeddingFunction
+    elif kind != "model":
+        raise ValueError(f"Unknown embedder: {kind}")
+
+
+# =========================================================
+# Benchmark
+# =========================================================
+
+def run_8d_benchmark(
+    records: int = DEFAULT_RECORDS,
+    work_dir: Optional[Path] = None,
+    queries: int = QUERY_COUNT,
+    embedder: str = EMBEDDER,
+    seed: int = SEED,
+    keep: bool = False,
+) -> Dict[str, Any]:
+    use_embedder(embedder)
+
+    work_dir = Path(work_dir or tempfile.mkdtemp(prefix="8d_bench_"))
+    json_dir = work_dir / "json"
+    kb_data = work_dir / "kb_data"
+    rng = random.Random(seed)
+
+    started_at = datetime.now().isoformat(timespec="seconds")
+    stages: Dict[str, Any] = {}
+
+    try:
+        # ---- corpus ----
+        t0 = time.perf_counter()
+        paths = write_corpus(json_dir, records, seed)
+        stages["generate"] = summarize_latencies([time.perf_counter() - t0], items=records)
+
+        # ---- ingest ----
+        sentence_kb = SentenceKB(kb_data / "sentence_kb")
+        failure_kb = FailureKB(kb_data / "failure_kb")
+        cause_kb = CauseKB(kb_data / "cause_kb")
+        stages["ingest_8d_json"] = summarize_latencies(time_calls(
+            ingest_8d_json, [(p, failure_kb, cause_kb, sentence_kb) for p in paths]
+        ))
+
+        failures = list(failure_kb.store.values())
+        causes = list(cause_kb.store.values())
+        if not failures:
+            raise RuntimeError("Nothing ingested")
+
+        # ---- retrieval pipeline ----
+        def pipeline(failure: Dict[str, Any], cause: Dict[str, Any]):
+            return failure_to_cause_pipeline(
+                failure_mode=failure["failure_mode"],
+                failure_element=failure["failure_element"],
+                failure_effect=failure["failure_effect"],
+                cause_query=cause["root_cause"],
+                failure_kb=failure_kb,
+                cause_kb=cause_kb,
+                sentence_kb=sentence_kb,
+            )
+
+        stages["failure_to_cause_pipeline"] = summarize_latencies(time_calls(
+            pipeline, [(rng.choice(failures), rng.choice(causes)) for _ in range(queries)]
+        ))
+
+        corpus = {
+            "cases": records,
+            "failures": len(failure_kb.store),
+            "causes": len(cause_kb.store),
+            "sentences": sentence_kb.collection.count(),
+        }
+    finally:
+        if not keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "suite": "8d",
+        "started_at": started_at,
+        "config": {
+            "records": records,
+            "queries": queries,
+            "embedder": embedder,
+            "seed": seed,
+        },
+        "corpus": corpus,
+        "stages": stages,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+# =========================================================
+# CLI entry
+# =========================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="8D KB speed benchmark")
+    parser.add_argument("--records", type=int, default=DEFAULT_RECORDS, help="number of 8D cases")
+    parser.add_argument("--queries", type=int, default=QUERY_COUNT)
+    parser.add_argument("--embedder", choices=["hash", "model"], default=EMBEDDER)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--work-dir", type=Path, default=None)
+    parser.add_argument("--keep", action="store_true", help="keep the generated corpus and KBs")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None, help="earlier report to compare with")
+    parser.add_argument("--metrics", type=Path, default=None,
+                        help="enable instrumentation and write its snapshot (.json or .prom)")
+    args = parser.parse_args()
+
+    if args.metrics:
+        instrumentation.enable()
+
+    report = run_8d_benchmark(
+        records=args.records,
+        work_dir=args.work_dir,
+        queries=args.queries,
+        embedder=args.embedder,
+        seed=args.seed,
+        keep=args.keep,
+    )
+
+    if args.metrics:
+        instrumentation.write_snapshot(args.metrics)
+        print(f"[OK] Metrics written to: {args.metrics}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        report["vs_baseline"] = compare_reports(baseline, report)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+        print(f"[OK] Benchmark report written to: {args.output}")
+    else:
+        print(text)
@@ -1,3 +1,4 @@
+import sys
 import json
 from pathlib import Path
 from typing import List
@@ -9,6 +10,15 @@ from kb_structure import (
     MaintenanceTag,
     evaluate_failure
 )
+# Shared modules live in the repository root package
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from pipeline_common.instrumentation import timed
+from pipeline_common.pipeline_logging import get_logger, FileSummary
+
+log = get_logger("ingest_8d")
 
 
 def parse_maintenance_tag(raw: dict | None) -> MaintenanceTag:
@@ -24,6 +34,7 @@ def parse_maintenance_tag(raw: dict | None) -> MaintenanceTag:
 
 
 
+@timed("ingest.8d_json")
 def ingest_8d_json(
     json_path: Path,
     failure_kb: FailureKB,
@@ -41,6 +52,8 @@ def ingest_8d_json(
     case_id = doc0.get("file_name")
     product = doc0.get("product_name")
 
+    summary = FileSummary(log, Path(json_path).name)
+
     failure = data["failure"]
 
     # =====================================================
@@ -62,6 +75,7 @@ def ingest_8d_json(
             sentence_role="failure_sentence",
         )
         failure_sentence_ids.append(s.id)
+        summary.add("failure_sentences")
 
     used_sentence_ids = set()
 
@@ -92,6 +106,7 @@ def ingest_8d_json(
             sentence_role="other",
             cause_id=None,
         )
+        summary.add("other_sentences")
 
     # =====================================================
     #  Failure KB（入口）
@@ -140,6 +155,7 @@ def ingest_8d_json(
                 cause_id=cause_id,
             )
             cause_sentence_ids.append(s.id)
+            summary.add("cause_sentences")
 
         cause_maintenance = parse_maintenance_tag(
             cause.get("maintenance_tag")
@@ -161,6 +177,10 @@ def ingest_8d_json(
 
         cause_kb.add(cause_obj)
         cause_ids.append(cause_id)
+        summary.add("causes")
 
     # cause_ids
-    failure_kb.store[failure["failure_ID"]]["cause_ids"] = cause_ids
\ No newline at end of file
+    failure_kb.store[failure["failure_ID"]]["cause_ids"] = cause_ids
+
+    summary.add(f"failure_{status}")
+    summary.log()
\ No newline at end of file
@@ -5,10 +5,18 @@ import chromadb
 from chromadb.utils import embedding_functions
 from pathlib import Path
 import json
+import sys
 from typing import Optional
 from dataclasses import asdict
 from collections import defaultdict
 
+# Shared modules live in the repository root package
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from pipeline_common.instrumentation import timer, timed_embedder
+
 
 #======= Helper =========
 def is_valid_embed_text(text: Optional[str]) -> bool:
@@ -117,9 +125,9 @@ class SentenceKB:
 
         self.client = chromadb.PersistentClient(path=str(self.persist_dir))
 
-        self.embedder = embedding_functions.SentenceTransformerEmbeddingFunction(
+        self.embedder = timed_embedder(embedding_functions.SentenceTransformerEmbeddingFunction(
             model_name="all-MiniLM-L6-v2"
-        )
+        ))
 
         self.collection = self.client.get_or_create_collection(
             name="sentences",
@@ -133,29 +141,31 @@ class SentenceKB:
         sentence_role: str,
         cause_id: Optional[str] = None,
     ):
-        self.collection.add(
-            ids=[sentence.id],
-            documents=[sentence.text],
-            metadatas=[{
-                "case_id": sentence.case_id,
-                "failure_id": failure_id,
-                "cause_id": cause_id or "",
-                "sentence_role": sentence_role,
-                "source_section": sentence.source_section,
-                "entity_type": sentence.annotations.get("entity_type"),
-                "assertion_level": sentence.annotations.get("assertion_level"),
-                "faithful_score": int(sentence.annotations.get("faithful_score", 0)),
-            }],
-        )
+        with timer("chroma.add", collection=self.collection.name):
+            self.collection.add(
+                ids=[sentence.id],
+                documents=[sentence.text],
+                metadatas=[{
+                    "case_id": sentence.case_id,
+                    "failure_id": failure_id,
+                    "cause_id": cause_id or "",
+                    "sentence_role": sentence_role,
+                    "source_section": sentence.source_section,
+                    "entity_type": sentence.annotations.get("entity_type"),
+                    "assertion_level": sentence.annotations.get("assertion_level"),
+                    "faithful_score": int(sentence.annotations.get("faithful_score", 0)),
+                }],
+            )
 
     def get_by_ids(self, ids: List[str]) -> List[Sentence]:
         if not ids:
             return []
 
-        res = self.collection.get(
-            ids=ids,
-            include=["documents", "metadatas"],
-        )
+        with timer("chroma.get", collection=self.collection.name):
+            res = self.collection.get(
+                ids=ids,
+                include=["documents", "metadatas"],
+            )
 
         sentences = []
         for sid, text, meta in zip(
@@ -204,12 +214,13 @@ class SentenceKB:
         else:
             where = {"$and": filters}
 
-        return self.collection.query(
-            query_texts=[query],
-            n_results=k,
-            where=where,
-            include=["documents", "metadatas", "distances"],
-        )
+        with timer("chroma.query", collection=self.collection.name):
+            return self.collection.query(
+                query_texts=[query],
+                n_results=k,
+                where=where,
+                include=["documents", "metadatas", "distances"],
+            )
 
 # =========================================================
 # Failure KB (entry gate)
@@ -224,14 +235,15 @@ class FailureKB:
         self.store_path = self.persist_dir / "failure_store.json"
         self.store: Dict[str, Dict[str, Any]] = {}
         if self.store_path.exists():
-            with open(self.store_path, "r", encoding="utf-8") as f:
+            with timer("store.load", store=self.store_path.name), \
+                    open(self.store_path, "r", encoding="utf-8") as f:
                 self.store = json.load(f)
 
         # -------- vector store --------
         self.client = chromadb.PersistentClient(path=str(self.persist_dir))
-        self.embedder = embedding_functions.SentenceTransformerEmbeddingFunction(
+        self.embedder = timed_embedder(embedding_functions.SentenceTransformerEmbeddingFunction(
             model_name="all-MiniLM-L6-v2"
-        )
+        ))
 
         self.collection = self.client.get_or_create_collection(
             name="failure_kb",
@@ -244,7 +256,8 @@ class FailureKB:
     def add(self, failure):
         # ---- structured store ----
         self.store[failure.failure_id] = asdict(failure)
-        with open(self.store_path, "w", encoding="utf-8") as f:
+        with timer("store.persist", store=self.store_path.name), \
+                open(self.store_path, "w", encoding="utf-8") as f:
             json.dump(self.store, f, indent=2, ensure_ascii=False)
 
         ids = []
@@ -275,11 +288,12 @@ class FailureKB:
         add_field(failure.failure_effect, "failure_effect")
 
         if ids:
-            self.collection.upsert(
-                ids=ids,
-                documents=documents,
-                metadatas=metadatas,
-            )
+            with timer("chroma.upsert", collection=self.collection.name):
+                self.collection.upsert(
+                    ids=ids,
+                    documents=documents,
+                    metadatas=metadatas,
+                )
 
     # =========================================================
     # Low-level role-based search
@@ -290,11 +304,12 @@ class FailureKB:
         role: str,
         k: int = 5,
     ):
-        return self.collection.query(
-            query_texts=[query],
-            n_results=k,
-            where={"role": role},
-        )
+        with timer("chroma.query", collection=self.collection.name):
+            return self.collection.query(
+                query_texts=[query],
+                n_results=k,
+                where={"role": role},
+            )
 
     # =========================================================
     # High-level merged search (FMEA style)
@@ -373,14 +388,15 @@ class CauseKB:
         self.store_path = self.persist_dir / "cause_store.json"
         self.store: Dict[str, Dict[str, Any]] = {}
         if self.store_path.exists():
-            with open(self.store_path, "r", encoding="utf-8") as f:
+            with timer("store.load", store=self.store_path.name), \
+                    open(self.store_path, "r", encoding="utf-8") as f:
                 self.store = json.load(f)
 
         # -------- vector store --------
         self.client = chromadb.PersistentClient(path=str(self.persist_dir))
-        self.embedder = embedding_functions.SentenceTransformerEmbeddingFunction(
+        self.embedder = timed_embedder(embedding_functions.SentenceTransformerEmbeddingFunction(
             model_name="all-MiniLM-L6-v2"
-        )
+        ))
         self.collection = self.client.get_or_create_collection(
             name="cause_kb",
             embedding_function=self.embedder,
@@ -389,25 +405,27 @@ class CauseKB:
     # Embedding function
     def add(self, cause: Cause):
         self.store[cause.cause_id] = asdict(cause)
-        with open(self.store_path, "w", encoding="utf-8") as f:
+        with timer("store.persist", store=self.store_path.name), \
+                open(self.store_path, "w", encoding="utf-8") as f:
             json.dump(self.store, f, indent=2, ensure_ascii=False)
 
         embed_text = "\n".join([
             f"Root cause: {cause.root_cause}"
         ])
 
-        self.collection.upsert(
-            ids=[cause.cause_id],
-            documents=[embed_text],
-            metadatas=[{
-                "failure_id": cause.failure_id,
-                "discipline": cause.discipline,
-                "cause_level": cause.cause_level,
-                "confidence": cause.confidence,
-                "review_status": cause.maintenance.review_status,
-                "version": cause.maintenance.version,
-            }],
-        )
+        with timer("chroma.upsert", collection=self.collection.name):
+            self.collection.upsert(
+                ids=[cause.cause_id],
+                documents=[embed_text],
+                metadatas=[{
+                    "failure_id": cause.failure_id,
+                    "discipline": cause.discipline,
+                    "cause_level": cause.cause_level,
+                    "confidence": cause.confidence,
+                    "review_status": cause.maintenance.review_status,
+                    "version": cause.maintenance.version,
+                }],
+            )
     # Search function
     def search_under_failure(
         self,
@@ -415,11 +433,12 @@ class CauseKB:
         failure_id: str,
         k: int = 5,
     ) -> List[str]:
-        res = self.collection.query(
-            query_texts=[query],
-            n_results=k,
-            where={"failure_id": failure_id},
-        )
+        with timer("chroma.query", collection=self.collection.name):
+            res = self.collection.query(
+                query_texts=[query],
+                n_results=k,
+                where={"failure_id": failure_id},
+            )
         return res["ids"][0] if res["ids"] else []
 
 
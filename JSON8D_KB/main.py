@@ -1,7 +1,16 @@
+import sys
 from pathlib import Path
 
+# Shared modules live in the repository root package
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
 from kb_structure import FailureKB, CauseKB, SentenceKB
 from ingest_8d import ingest_8d_json
+from pipeline_common.pipeline_logging import get_logger
+
+log = get_logger("main")
 
 
 
@@ -40,11 +49,11 @@ cause_kb = CauseKB(persist_dir=CAUSE_KB_DIR)
 # 3) Ingest all 8D JSON files
 # =========================================================
 json_files = sorted(JSON_ROOT.glob("*.json"))
-print(f"[INFO] JSON_ROOT = {JSON_ROOT}")
-print(f"[INFO] Found {len(json_files)} 8D JSON files")
+log.info("JSON_ROOT = %s", JSON_ROOT)
+log.info("Found %d 8D JSON files", len(json_files))
 
 for jp in json_files:
-    print(f"[INGEST] {jp.name}")
+    log.info("[INGEST] %s", jp.name)
     ingest_8d_json(
         json_path=jp,
         failure_kb=failure_kb,
@@ -52,8 +61,8 @@ for jp in json_files:
         sentence_kb=sentence_kb,
     )
 
-print("[INFO] Ingest finished")
-print(f"Sentence KB count : {sentence_kb.collection.count()}")
-print(f"Failure KB count  : {failure_kb.collection.count()}")
-print(f"Cause KB count    : {cause_kb.collection.count()}")
+log.info("Ingest finished")
+log.info("Sentence KB count : %d", sentence_kb.collection.count())
+log.info("Failure KB count  : %d", failure_kb.collection.count())
+log.info("Cause KB count    : %d", cause_kb.collection.count())
 
@@ -1,6 +1,16 @@
+import sys
 from pathlib import Path
+
+# Shared modules live in the repository root package
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
 from KG.simple_graph_store import SimpleGraphStore
 from .ingest import ingest_cause_store_json
+from pipeline_common.pipeline_logging import get_logger
+
+log = get_logger("kg.build_single")
 
 
 def resolve_paths():
@@ -22,16 +32,14 @@ def main():
 
     graph = SimpleGraphStore(kb_data)
 
-    print(f"[INFO] Ingest single FMEA JSON into KG: {cause_path.name}")
+    log.info("Ingest single FMEA JSON into KG: %s", cause_path.name)
 
     ingest_cause_store_json(
         json_path=cause_path,
         graph=graph,
     )
 
-    print("[INFO] Done.")
-    print(f"[INFO] Nodes : {len(graph.nodes)}")
-    print(f"[INFO] Edges : {len(graph.edges)}")
+    log.info("Done. Nodes : %d, Edges : %d", len(graph.nodes), len(graph.edges))
 
 
 if __name__ == "__main__":
@@ -1,10 +1,21 @@
 
+import sys
 import json
 from pathlib import Path
 from KG.schema import *
 from KG.simple_graph_store import SimpleGraphStore
+# Shared modules live in the repository root package
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
 
+from pipeline_common.instrumentation import timed
+from pipeline_common.pipeline_logging import get_logger, FileSummary
 
+log = get_logger("kg.ingest")
+
+
+@timed("kg.ingest_cause_store_json")
 def ingest_cause_store_json(json_path: Path, graph: SimpleGraphStore):
     """
     Ingest fmea_cause_store.json
@@ -18,7 +29,11 @@ def ingest_cause_store_json(json_path: Path, graph: SimpleGraphStore):
     if not isinstance(data, dict):
         raise ValueError("Expected top-level JSON dict for cause store")
 
+    summary = FileSummary(log, json_path.name)
+    before = graph.stats()
+
     for cause_id, c in data.items():
+        summary.add("causes")
 
         # ---------- Failure ----------
         f_node = NodeKey(
@@ -83,4 +98,9 @@ def ingest_cause_store_json(json_path: Path, graph: SimpleGraphStore):
         )
         graph.upsert_edge(c_node, E_CAUSE_OF, m_node)
 
-    graph.save()
\ No newline at end of file
+    graph.save()
+
+    after = graph.stats()
+    summary.add("nodes_added", after["nodes"] - before["nodes"])
+    summary.add("edges_added", after["edges"] - before["edges"])
+    summary.log()
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import sys
 from typing import Dict, Any, List
 from pathlib import Path
 from .graph_store import GraphStore
@@ -10,6 +11,13 @@ from .schema import (
 
 from .simple_graph_store import SimpleGraphStore
 
+# Shared modules live in the repository root package
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from pipeline_common.instrumentation import timed
+
 # --------------------------------------------------
 # Helper: get readable text from node
 # --------------------------------------------------
@@ -25,6 +33,7 @@ def _node_text(g: GraphStore, node_id: str) -> str:
 # --------------------------------------------------
 # 1️⃣ Full FMEA chain by failure_id
 # --------------------------------------------------
+@timed("kg.get_chain_by_failure_id")
 def get_chain_by_failure_id(g: GraphStore, failure_id: str) -> Dict[str, Any]:
     failure_nodes = g.find_nodes(NODE_FAILURE, K_FAILURE_ID, failure_id)
     if not failure_nodes:
@@ -56,6 +65,7 @@ def get_chain_by_failure_id(g: GraphStore, failure_id: str) -> Dict[str, Any]:
 # --------------------------------------------------
 # 2️⃣ Expand all modes under an element (knowledge-level)
 # --------------------------------------------------
+@timed("kg.expand_modes_under_element")
 def expand_modes_under_element(g: GraphStore, element_name: str) -> Dict[str, Any]:
     elements = g.find_nodes(NODE_ELEMENT, K_NAME, element_name)
     if not elements:
@@ -74,6 +84,7 @@ def expand_modes_under_element(g: GraphStore, element_name: str) -> Dict[str, An
 # --------------------------------------------------
 # 3️⃣ Get all causes for a given failure mode
 # --------------------------------------------------
+@timed("kg.get_causes_for_mode")
 def get_causes_for_mode(g: GraphStore, mode_text: str) -> Dict[str, Any]:
     modes = g.find_nodes(NODE_MODE, K_TEXT, mode_text)
     if not modes:
@@ -92,6 +103,7 @@ def get_causes_for_mode(g: GraphStore, mode_text: str) -> Dict[str, Any]:
 # --------------------------------------------------
 # 4️⃣ Validate Cause → Mode link (consistency check)
 # --------------------------------------------------
+@timed("kg.validate_cause_mode_link")
 def validate_cause_mode_link(g: GraphStore, cause_id: str, mode_text: str) -> bool:
     causes = g.find_nodes(NODE_CAUSE, K_CAUSE_ID, cause_id)
     modes = g.find_nodes(NODE_MODE, K_TEXT, mode_text)
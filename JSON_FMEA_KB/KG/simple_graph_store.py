@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import sys
 import json
 from dataclasses import asdict
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple, Set
 
+# Shared modules live in the repository root package
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from pipeline_common.instrumentation import timer, timed
+
 from .graph_store import GraphStore
 
 
@@ -26,7 +34,8 @@ class SimpleGraphStore(GraphStore):
         self._edges: Dict[str, Dict[str, Any]] = {}
 
         if self.path.exists():
-            data = json.loads(self.path.read_text(encoding="utf-8"))
+            with timer("kg.load"):
+                data = json.loads(self.path.read_text(encoding="utf-8"))
             self._nodes = data.get("nodes", {})
             self._edges = data.get("edges", {})
 
@@ -114,6 +123,7 @@ class SimpleGraphStore(GraphStore):
                 hits.append(nid)
         return hits
 
+    @timed("kg.save")
     def save(self) -> None:
         data = {"nodes": self._nodes, "edges": self._edges}
         self.path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
@@ -0,0 +1,313 @@
+"""
+Speed benchmark for the FMEA KB on a synthetic corpus.
+
+Stages: ingest_fmea_json, FMEAFailureKB.search, KG ingest_cause_store_json
+and the KG/query.py helpers. Reports throughput, p50/p95/p99 latency and
+process peak RSS as JSON, so two runs can be compared (see compare_reports).
+
+Run from JSON_FMEA_KB:
+    python -m evaluation.benchmark --records 10000 --output bench_fmea.json
+"""
+
+from __future__ import annotations
+
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Shared helpers live in the repository root package
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+import kb_structure
+from pipeline_common import instrumentation
+from pipeline_common.benchmark_common import (
+    HashEmbeddingFunction,
+    compare_reports,
+    peak_rss_mb,
+    summarize_latencies,
+    time_calls,
+)
+from kb_structure import FMEAFailureKB, FMEACauseKB
+from ingest_fmea import ingest_fmea_json
+from KG.simple_graph_store import SimpleGraphStore
+from KG.ingest import ingest_cause_store_json
+from KG.query import (
+    get_chain_by_failure_id,
+    expand_modes_under_element,
+    get_causes_for_mode,
+    validate_cause_mode_link,
+)
+
+
+# =========================================================
+# Config
+# =========================================================
+
+DEFAULT_RECORDS = 1000
+RECORDS_PER_FILE = 1000
+CAUSES_PER_FAILURE = 3
+QUERY_COUNT = 200
+SEED = 42
+
+# "hash": deterministic feature-hashing embeddings (measures KB / Chroma
+# overhead without the model); "model": the KB's SentenceTransformer
+EMBEDDER = "hash"
+
+
+# =========================================================
+# Synthetic corpus
+# =========================================================
+
+ELEMENTS = [
+    "power supply", "controller board", "CAN transceiver", "DC link capacitor",
+    "gate driver", "temperature sensor", "cooling fan", "input filter",
+    "buck converter", "firmware bootloader", "encoder interface", "relay",
+]
+MODES = [
+    "no output voltage", "intermittent communication loss", "overheating",
+    "short circuit", "open circuit", "drift out of tolerance", "unexpected reset",
+    "mechanical crack", "signal noise", "wrong calibration value",
+]
+EFFECTS = [
+    "motor does not start", "loss of torque", "drive trips on fault",
+    "reduced lifetime", "customer complaint", "safety shutdown", "no effect on function",
+]
+CAUSES = [
+    "solder joint fatigue", "undersized component rating", "ESD damage during assembly",
+    "firmware timing race", "connector not fully seated", "supplier lot defect",
+    "thermal paste missing", "wrong resistor value in BOM", "moisture ingress",
+    "vibration exceeds specification",
+]
+FAILURE_TYPES = [
+    "Electronics / General", "Mechanics / Specification", "Software / Approval",
+    "HW / Input filter", "Process / Soldering", "Design / Power stage",
+]
+
+
+def synthetic_fmea_rows(
+    n_rows: int,
+    file_name: str,
+    causes_per_failure: int = CAUSES_PER_FAILURE,
+    rng: Optional[random.Random] = None,
+):
+    """Old/new FMEA rows, causes of a failure on adjacent rows."""
+    rng = rng or random.Random(SEED)
+    i = 0
+    while i < n_rows:
+        new_fmea = rng.random() < 0.5
+        tag = rng.randrange(10 ** 6)
+        base = {
+            "file_name": file_name,
+            "source_type": "new_fmea" if new_fmea else "old_fmea",
+            "failure_mode": f"{rng.choice(MODES)} #{tag}",
+            "failure_effect": rng.choice(EFFECTS),
+            "severity": rng.randint(1, 10),
+            "rpn": rng.randint(1, 1000),
+        }
+        if new_fmea:
+            base.update({
+                "system_name": "Drive unit",
+                "system_element": rng.choice(ELEMENTS),
+                "function": "convert and control motor power",
+            })
+        else:
+            base["failure_type"] = rng.choice(FAILURE_TYPES)
+
+        for _ in range(min(causes_per_failure, n_rows - i)):
+            row = dict(base)
+            row.update({
+                "failure_cause": f"{rng.choice(CAUSES)} ({rng.randrange(10 ** 4)})",
+                "cause_discipline": rng.choice(["HW", "ESW", "MCH"]),
+                "controls_prevention": "design review",
+                "current_detection": "end of line test",
+                "detection": rng.randint(1, 10),
+                "occurrence": rng.randint(1, 10),
+                "recommended_action": "add derating check",
+            })
+            yield row
+            i += 1
+
+
+def write_corpus(
+    out_dir: Path,
+    records: int,
+    records_per_file: int = RECORDS_PER_FILE,
+    seed: int = SEED,
+) -> List[Path]:
+    """Write the synthetic corpus as JSONL files (streamed ingest format)."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for n, start in enumerate(range(0, records, records_per_file)):
+        path = out_dir / f"SYNTH{n:05d}.jsonl"
+        with path.open("w", encoding="utf-8") as f:
+            for row in synthetic_fmea_rows(min(records_per_file, records - start), path.stem, rng=rng):
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        paths.append(path)
+    return paths
+
+
+# =========================================================
+# Embedding stand-in
+# =========================================================
+
+def use_embedder(kind: str) -> None:
+    if kind == "hash":
+        kb_structure.embedding_functions.SentenceTransformerEmbeddingFunction = HashEmbeddingFunction
+    elif kind != "model":
+        raise ValueError(f"Unknown embedder: {kind}")
+
+
+# =========================================================
+# Benchmark
+# =========================================================
+
+def run_fmea_benchmark(
+    records: int = DEFAULT_RECORDS,
+    work_dir: Optional[Path] = None,
+    records_per_file: int = RECORDS_PER_FILE,
+    queries: int = QUERY_COUNT,
+    embedder: str = EMBEDDER,
+    seed: int = SEED,
+    keep: bool = False,
+) -> Dict[str, Any]:
+    use_embedder(embedder)
+
+    work_dir = Path(work_dir or tempfile.mkdtemp(prefix="fmea_bench_"))
+    json_dir = work_dir / "json"
+    failure_dir = work_dir / "kb_data" / "failure_kb"
+    cause_dir = work_dir / "kb_data" / "cause_kb"
+    rng = random.Random(seed)
+
+    started_at = datetime.now().isoformat(timespec="seconds")
+    stages: Dict[str, Any] = {}
+
+    try:
+        # ---- corpus ----
+        t0 = time.perf_counter()
+        paths = write_corpus(json_dir, records, records_per_file, seed)
+        stages["generate"] = summarize_latencies([time.perf_counter() - t0], items=records)
+
+        # ---- ingest ----
+        failure_kb = FMEAFailureKB(persist_dir=failure_dir)
+        cause_kb = FMEACauseKB(persist_dir=cause_dir)
+        ingest_times = time_calls(ingest_fmea_json, [(p, failure_kb, cause_kb) for p in paths])
+        stages["ingest_fmea_json"] = summarize_latencies(ingest_times, items=records)
+
+        failures = list(failure_kb.store.values())
+        if not failures:
+            raise RuntimeError("Nothing ingested")
+
+        # ---- vector search ----
+        sample = [rng.choice(failures) for _ in range(queries)]
+        stages["failure_kb_search"] = summarize_latencies(time_calls(
+            failure_kb.search,
+            [(f["failure_mode"], f["failure_element"], f["failure_effect"], 5) for f in sample],
+        ))
+
+        # ---- KG ingest ----
+        graph = SimpleGraphStore(work_dir / "kb_data")
+        t0 = time.perf_counter()
+        ingest_cause_store_json(cause_kb.store_path, graph)
+        stages["kg_ingest_cause_store_json"] = summarize_latencies(
+            [time.perf_counter() - t0], items=len(cause_kb.store)
+        )
+
+        # ---- KG queries ----
+        causes = list(cause_kb.store.values())
+        stages["kg_get_chain_by_failure_id"] = summarize_latencies(time_calls(
+            get_chain_by_failure_id, [(graph, f["failure_id"]) for f in sample]
+        ))
+        stages["kg_expand_modes_under_element"] = summarize_latencies(time_calls(
+            expand_modes_under_element, [(graph, f["failure_element"]) for f in sample]
+        ))
+        stages["kg_get_causes_for_mode"] = summarize_latencies(time_calls(
+            get_causes_for_mode, [(graph, f["failure_mode"]) for f in sample]
+        ))
+        cause_sample = [rng.choice(causes) for _ in range(queries)]
+        stages["kg_validate_cause_mode_link"] = summarize_latencies(time_calls(
+            validate_cause_mode_link, [(graph, c["cause_id"], c["failure_mode"]) for c in cause_sample]
+        ))
+
+        corpus = {
+            "rows": records,
+            "files": len(paths),
+            "failures": len(failure_kb.store),
+            "causes": len(cause_kb.store),
+            "graph": graph.stats(),
+        }
+    finally:
+        if not keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "suite": "fmea",
+        "started_at": started_at,
+        "config": {
+            "records": records,
+            "records_per_file": records_per_file,
+            "queries": queries,
+            "embedder": embedder,
+            "seed": seed,
+        },
+        "corpus": corpus,
+        "stages": stages,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+# =========================================================
+# CLI entry
+# =========================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FMEA KB speed benchmark")
+    parser.add_argument("--records", type=int, default=DEFAULT_RECORDS)
+    parser.add_argument("--records-per-file", type=int, default=RECORDS_PER_FILE)
+    parser.add_argument("--queries", type=int, default=QUERY_COUNT)
+    parser.add_argument("--embedder", choices=["hash", "model"], default=EMBEDDER)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--work-dir", type=Path, default=None)
+    parser.add_argument("--keep", action="store_true", help="keep the generated corpus and KBs")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None, help="earlier report to compare with")
+    parser.add_argument("--metrics", type=Path, default=None,
+                        help="enable instrumentation and write its snapshot (.json or .prom)")
+    args = parser.parse_args()
+
+    if args.metrics:
+        instrumentation.enable()
+
+    report = run_fmea_benchmark(
+        records=args.records,
+        work_dir=args.work_dir,
+        records_per_file=args.records_per_file,
+        queries=args.queries,
+        embedder=args.embedder,
+        seed=args.seed,
+        keep=args.keep,
+    )
+
+    if args.metrics:
+        instrumentation.write_snapshot(args.metrics)
+        print(f"[OK] Metrics written to: {args.metrics}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        report["vs_baseline"] = compare_reports(baseline, report)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+        print(f"[OK] Benchmark report written to: {args.output}")
+    else:
+        print(text)
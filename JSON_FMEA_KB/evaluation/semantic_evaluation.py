@@ -19,6 +19,13 @@ ROLES = ["failure_element", "failure_mode", "failure_effect"]
 
 DEFAULT_K = 5
 
+# Near-duplicate failure score, weight must match retrieval logic
+FAILURE_ROLE_WEIGHTS = {
+    "failure_mode": 0.5,
+    "failure_element": 0.4,
+    "failure_effect": 0.3,
+}
+
 # Outlier rule: mean + sigma * factor
 SIGMA_FACTOR = 2.0
 
@@ -43,6 +50,324 @@ def cosine_sim(a: np.ndarray, b: np.ndarray) -> float:
     return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
 
 
+# =========================================================
+# Matrix kNN helpers (exact, on stored embeddings)
+# =========================================================
+
+# Max entries of one distance block (float64: 2**24 -> 128 MB);
+# rows per block = BLOCK_ELEMENTS // number of columns
+BLOCK_ELEMENTS = 2 ** 24
+
+# Distances <= this are treated as "self / exact duplicate" (as with the
+# former per-item collection.query)
+SELF_EPS = 1e-6
+
+
+def collection_space(collection) -> str:
+    """Distance function of a Chroma collection (Chroma default: squared L2)."""
+    meta = getattr(collection, "metadata", None) or {}
+    return meta.get("hnsw:space", "l2")
+
+
+class DistanceIndex:
+    """
+    Dense embedding matrix + Chroma-compatible distance computation.
+
+    space: "l2" (squared euclidean), "cosine" (1 - cos) or "ip" (1 - dot).
+    """
+
+    def __init__(self, embeddings, space: str = "l2"):
+        X = np.asarray(embeddings if embeddings is not None else [], dtype=np.float64)
+        if X.ndim != 2:
+            X = X.reshape(len(X), -1) if X.size else np.empty((0, 0))
+        self.space = space
+
+        if space == "cosine":
+            norms = np.linalg.norm(X, axis=1, keepdims=True)
+            X = X / np.where(norms == 0, 1.0, norms)
+
+        self.X = X
+        self.sq_norms = np.einsum("ij,ij->i", X, X)
+
+    def __len__(self) -> int:
+        return self.X.shape[0]
+
+    def distances(self, rows: np.ndarray, other: "DistanceIndex" = None, cols: np.ndarray = None) -> np.ndarray:
+        """Distances between self.X[rows] and other.X[cols] (default: all of self)."""
+        other = other or self
+        A = self.X[rows]
+        B = other.X if cols is None else other.X[cols]
+        dots = A @ B.T
+
+        if self.space in ("cosine", "ip"):
+            return 1.0 - dots
+
+        b_sq = other.sq_norms if cols is None else other.sq_norms[cols]
+        D = self.sq_norms[rows][:, None] + b_sq[None, :] - 2.0 * dots
+        np.maximum(D, 0.0, out=D)
+        return D
+
+
+def smallest_k(D: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Per row: indices and values of the k smallest entries, sorted ascending."""
+    k = min(k, D.shape[1])
+    if k <= 0:
+        empty = np.empty((D.shape[0], 0))
+        return empty.astype(int), empty
+    idx = np.argpartition(D, k - 1, axis=1)[:, :k]
+    vals = np.take_along_axis(D, idx, axis=1)
+    order = np.argsort(vals, axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1), np.take_along_axis(vals, order, axis=1)
+
+
+def block_rows(n_cols: int) -> int:
+    return max(1, BLOCK_ELEMENTS // max(n_cols, 1))
+
+
+def knn_avg_distances(
+    index: DistanceIndex,
+    k: int,
+    block_size: Optional[int] = None,
+) -> List[Optional[float]]:
+    """
+    For every row: mean distance to its k+1 nearest rows (itself included),
+    ignoring distances <= SELF_EPS (self and exact duplicates).
+    """
+    n = len(index)
+    block_size = block_size or block_rows(n)
+    out: List[Optional[float]] = []
+
+    for start in range(0, n, block_size):
+        rows = np.arange(start, min(start + block_size, n))
+        D = index.distances(rows)
+        D[np.arange(len(rows)), rows] = 0.0   # self (avoids round-off)
+
+        _, vals = smallest_k(D, k + 1)
+        for row_vals in vals:
+            kept = row_vals[row_vals > SELF_EPS]
+            out.append(float(kept.mean()) if kept.size else None)
+
+    return out
+
+
+def knn_block_scores(
+    index: DistanceIndex,
+    rows: np.ndarray,
+    target: DistanceIndex,
+    k: int,
+    exclude_self: bool = False,
+    reduce: str = "mean",
+) -> np.ndarray:
+    """
+    Per query row: mean (or min) of its k smallest distances to `target`.
+
+    exclude_self masks each row's own column (index and target identical).
+    NaN where no neighbour is left.
+    """
+    if len(target) == 0 or len(rows) == 0:
+        return np.full(len(rows), np.nan)
+
+    D = index.distances(rows, target)
+    if exclude_self:
+        D[np.arange(len(rows)), rows] = np.inf
+
+    _, vals = smallest_k(D, k)
+    finite = np.isfinite(vals)
+    count = finite.sum(axis=1)
+
+    if reduce == "min":
+        scores = vals[:, 0]   # sorted ascending
+    else:
+        scores = np.where(finite, vals, 0.0).sum(axis=1) / np.maximum(count, 1)
+
+    return np.where(count > 0, scores, np.nan)
+
+
+# =========================================================
+# Blocked similarity helpers (near-duplicate scans)
+# =========================================================
+
+def normalize_rows(X: np.ndarray) -> np.ndarray:
+    """Unit-norm float32 rows (zero rows stay zero)."""
+    X = np.asarray(X, dtype=np.float32)
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    return X / np.where(norms == 0, 1.0, norms)
+
+
+def group_rows(keys: List[Any]) -> tuple[np.ndarray, Dict[Any, tuple[int, int]]]:
+    """
+    Stable order that makes equal keys contiguous + key -> (start, end)
+    row range in that order.
+    """
+    codes: Dict[Any, int] = {}
+    key_codes = np.array([codes.setdefault(k, len(codes)) for k in keys], dtype=np.int64)
+    order = np.argsort(key_codes, kind="stable")
+
+    counts = np.bincount(key_codes, minlength=len(codes))
+    ends = np.cumsum(counts)
+    ranges = {k: (int(ends[c] - counts[c]), int(ends[c])) for k, c in codes.items()}
+    return order, ranges
+
+
+def weighted_pair_blocks(
+    mats: Dict[str, np.ndarray],
+    weights: Dict[str, float],
+    threshold: float,
+    top_k: Optional[int] = None,
+):
+    """
+    Yield (rows_a, rows_b, scores) per row block for all pairs a < b with
+    sum_r weights[r] * <mats[r][a], mats[r][b]> >= threshold.
+
+    Every matrix has one (unit or zero) row per entity, so a role can add
+    at most weights[r]. A pair can only reach the threshold when its
+    similarity in the pivot role (highest lower bound) is at least
+    (threshold - other weights) / weight; the remaining roles are only
+    evaluated for those candidates.
+
+    top_k: also restrict candidates to each row's top_k pivot neighbours
+    (approximate neighbour graph, for very large KBs).
+    """
+    roles = [r for r in mats if weights.get(r, 0.0) > 0]
+    if not roles:
+        return
+
+    n = mats[roles[0]].shape[0]
+    total_w = sum(weights[r] for r in roles)
+    bounds = {r: (threshold - (total_w - weights[r])) / weights[r] for r in roles}
+
+    pivot = max(roles, key=lambda r: bounds[r])
+    lower = bounds[pivot] - 1e-6   # float32 slack
+    others = [r for r in roles if r != pivot]
+
+    step = block_rows(n)
+    cols = np.arange(n)
+
+    for start in range(0, n, step):
+        rows = np.arange(start, min(start + step, n))
+        P = mats[pivot][rows] @ mats[pivot].T
+
+        cand = cols[None, :] > rows[:, None]   # upper triangle
+        if top_k is not None and top_k < n:
+            masked = np.where(cand, P, -np.inf)
+            kth = -np.partition(-masked, top_k - 1, axis=1)[:, top_k - 1]
+            cand &= P >= kth[:, None]
+        if lower > -1.0:
+            cand &= P >= lower
+
+        ii, jj = np.nonzero(cand)
+        if not ii.size:
+            continue
+
+        a = rows[ii]
+        scores = weights[pivot] * P[ii, jj]
+
+        d = mats[pivot].shape[1]
+        dense = ii.size * d > P.size   # gathering would cost more than a block
+
+        for r in others:
+            if dense:
+                scores += weights[r] * (mats[r][rows] @ mats[r].T)[ii, jj]
+            else:
+                scores += weights[r] * np.einsum("ij,ij->i", mats[r][a], mats[r][jj])
+
+        keep = scores >= threshold
+        if keep.any():
+            yield a[keep], jj[keep], scores[keep]
+
+
+# =========================================================
+# Embedding snapshot (shared by all SD metrics of a report)
+# =========================================================
+
+def store_version(kb_dir: Path, collection) -> str:
+    """Stamp that changes whenever the persisted store is written."""
+    stamp = f"{collection.name}:{collection.count()}"
+    db = Path(kb_dir) / "chroma.sqlite3"
+    if db.exists():
+        st = db.stat()
+        stamp += f":{st.st_size}:{st.st_mtime_ns}"
+    return stamp
+
+
+class EmbeddingSnapshot:
+    """
+    In-memory copy of a collection (ids, documents, metadatas, embeddings).
+
+    get() answers the collection.get calls of the evaluators (equality
+    `where` filters only), so every metric reads the store once.
+    Optionally cached as .npz, reused while the store version matches.
+    """
+
+    def __init__(self, ids, documents, metadatas, embeddings, version: Optional[str] = None):
+        self.ids = list(ids)
+        self.documents = list(documents)
+        self.metadatas = [m or {} for m in metadatas]
+        self.embeddings = np.asarray(embeddings, dtype=np.float32).reshape(len(self.ids), -1)
+        self.version = version
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_collection(
+        cls,
+        collection,
+        kb_dir: Path,
+        cache_path: Optional[Path] = None,
+    ) -> "EmbeddingSnapshot":
+        version = store_version(kb_dir, collection)
+
+        if cache_path is not None and Path(cache_path).exists():
+            cached = cls.load(cache_path)
+            if cached.version == version:
+                return cached
+
+        res = collection.get(include=["documents", "metadatas", "embeddings"])
+        embeddings = res["embeddings"] if res["embeddings"] is not None else []
+        snap = cls(res["ids"], res["documents"], res["metadatas"], embeddings, version)
+
+        if cache_path is not None:
+            snap.save(cache_path)
+        return snap
+
+    def get(self, where: Optional[Dict[str, Any]] = None, include=("documents", "metadatas")) -> Dict[str, Any]:
+        rows = [
+            i for i, m in enumerate(self.metadatas)
+            if not where or all(m.get(key) == value for key, value in where.items())
+        ]
+        return {
+            "ids": [self.ids[i] for i in rows],
+            "documents": [self.documents[i] for i in rows] if "documents" in include else None,
+            "metadatas": [self.metadatas[i] for i in rows] if "metadatas" in include else None,
+            "embeddings": self.embeddings[rows] if "embeddings" in include else None,
+        }
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        records = json.dumps(
+            {"ids": self.ids, "documents": self.documents, "metadatas": self.metadatas},
+            ensure_ascii=False,
+        )
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as f:
+            np.savez(f, version=np.array(self.version or ""), records=np.array(records), embeddings=self.embeddings)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "EmbeddingSnapshot":
+        with np.load(Path(path), allow_pickle=False) as data:
+            records = json.loads(str(data["records"]))
+            return cls(
+                records["ids"],
+                records["documents"],
+                records["metadatas"],
+                data["embeddings"],
+                version=str(data["version"]) or None,
+            )
+
+
 # =========================================================
 # Core Semantic Evaluation
 # =========================================================
@@ -69,6 +394,24 @@ class SemanticEvaluator:
             embedding_function=self.embedder,
         )
 
+        self.snapshot: Optional[EmbeddingSnapshot] = None
+        self._memo: Dict[tuple, Any] = {}
+
+    # -----------------------------------------------------
+    # Data access (snapshot if loaded, else the collection)
+    # -----------------------------------------------------
+
+    def load_snapshot(self, cache_path: Optional[Path] = None) -> EmbeddingSnapshot:
+        """Read the collection once; later metrics (and kNN results) reuse it."""
+        self.snapshot = EmbeddingSnapshot.from_collection(self.collection, self.failure_kb_dir, cache_path)
+        self._memo = {}
+        return self.snapshot
+
+    def _get(self, **kwargs) -> Dict[str, Any]:
+        if self.snapshot is not None:
+            return self.snapshot.get(**kwargs)
+        return self.collection.get(**kwargs)
+
     # -----------------------------------------------------
     # SD1: Intra-role semantic cohesion
     # -----------------------------------------------------
@@ -81,32 +424,28 @@ class SemanticEvaluator:
         """
         For each item under a role, compute avg distance to k nearest
         neighbors under the SAME role (excluding itself).
+
+        Exact kNN over the stored embeddings, using the collection's
+        distance function.
         """
 
-        res = self.collection.get(
-            where={"role": role},
-            include=["documents", "metadatas"],
-        )
+        memo_key = ("cohesion", role, k)
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+
+        res, index = self._role_data(role)
 
         ids = res["ids"]
         docs = res["documents"]
 
+        # All neighbours from one embedding matrix (blocked matmul + argpartition)
+        # instead of one re-embedding + query round trip per item
+        avg_dists = knn_avg_distances(index, k) if len(ids) else []
+
         items = []
         distances_all = []
 
-        for _id, text in zip(ids, docs):
-            q = self.collection.query(
-                query_texts=[text],
-                n_results=k + 1,  # include itself
-                where={"role": role},
-            )
-
-            dists = q["distances"][0]
-
-            # drop self (distance ~ 0)
-            dists = [float(d) for d in dists if d > 1e-6]
-
-            avg_dist = safe_mean(dists)
+        for _id, text, avg_dist in zip(ids, docs, avg_dists):
             if avg_dist is not None:
                 distances_all.append(avg_dist)
 
@@ -132,7 +471,7 @@ class SemanticEvaluator:
             ):
                 outliers.append(it)
 
-        return {
+        self._memo[memo_key] = {
             "role": role,
             "count": len(items),
             "mean_distance": mean_d,
@@ -141,6 +480,18 @@ class SemanticEvaluator:
             "items": items,
             "outliers": outliers,
         }
+        return self._memo[memo_key]
+
+    def _role_data(self, role: str) -> tuple[Dict[str, Any], DistanceIndex]:
+        """Items + distance index of one role, shared by SD1/SD2/SD3."""
+        memo_key = ("role", role)
+        if memo_key not in self._memo:
+            res = self._get(
+                where={"role": role},
+                include=["documents", "metadatas", "embeddings"],
+            )
+            self._memo[memo_key] = (res, DistanceIndex(res["embeddings"], collection_space(self.collection)))
+        return self._memo[memo_key]
 
     # -----------------------------------------------------
     # SD2: Cross-role semantic confusion scan
@@ -152,94 +503,102 @@ class SemanticEvaluator:
     margin: float = 0.1, #10%
 ) -> Dict[str, Any]:
 
-        # 1) load all items
-        all_items = []
+        # 1) load all items + their stored embeddings (one get per role)
+        role_items: Dict[str, List[Dict[str, Any]]] = {}
+        indexes: Dict[str, DistanceIndex] = {}
+
         for role in ROLES:
-            res = self.collection.get(
-                where={"role": role},
-                include=["documents", "metadatas"],
-            )
-            for _id, text, meta in zip(res["ids"], res["documents"], res["metadatas"]):
-                all_items.append({
+            res, indexes[role] = self._role_data(role)
+            role_items[role] = [
+                {
                     "id": _id,
                     "text": text,
                     "current_role": role,
                     "failure_id": meta.get("failure_id"),
-                })
+                }
+                for _id, text, meta in zip(res["ids"], res["documents"], res["metadatas"])
+            ]
 
+        total = sum(len(v) for v in role_items.values())
         confusions = []
 
-        # 2) evaluate each item
-        for it in all_items:
-            text = it["text"]
-            if not isinstance(text, str) or not text.strip():
-                continue
-
-            scores = {}
-
-            for role in ROLES:
-
-                # Exclude self
-                where_clause = {
-                    "$and": [
-                        {"role": role},
-                        {"id": {"$ne": it["id"]}},
-                    ]
+        # 2) evaluate items batch by batch: one distance block per
+        # (item batch, role), self excluded by index masking
+        for cur_role in ROLES:
+            index = indexes[cur_role]
+            items = role_items[cur_role]
+            step = block_rows(max(len(indexes[r]) for r in ROLES))
+
+            for start in range(0, len(items), step):
+                rows = np.arange(start, min(start + step, len(items)))
+                block = {
+                    role: knn_block_scores(
+                        index, rows, indexes[role], k,
+                        exclude_self=(role == cur_role),
+                    )
+                    for role in ROLES
                 }
 
-                q = self.collection.query(
-                    query_texts=[text],
-                    n_results=k,
-                    where=where_clause,
-                )
+                for i, row in enumerate(rows):
+                    it = items[row]
+                    text = it["text"]
+                    if not isinstance(text, str) or not text.strip():
+                        continue
 
-                if q.get("distances") and q["distances"][0]:
-                    dists = sorted(float(d) for d in q["distances"][0])
+                    scores = {
+                        role: None if np.isnan(block[role][i]) else float(block[role][i])
+                        for role in ROLES
+                    }
+                    confusion = self._role_confusion(it, scores, margin)
+                    if confusion:
+                        confusions.append(confusion)
 
-                    # Use k or less
-                    use_k = min(k, len(dists))
-                    score = sum(dists[:use_k]) / use_k
-                    scores[role] = score
-                else:
-                    scores[role] = None
+        return {
+            "total_scanned": total,
+            "confusion_count": len(confusions),
+            "margin": margin,
+            "confusions": confusions,
+        }
 
-            # find best role and compare with current role
-            best_role = None
-            best_dist = float("inf")
+    @staticmethod
+    def _role_confusion(
+        it: Dict[str, Any],
+        scores: Dict[str, Optional[float]],
+        margin: float,
+    ) -> Optional[Dict[str, Any]]:
+        """Confusion record if another role is `margin` (relative) closer."""
+        # find best role and compare with current role
+        best_role = None
+        best_dist = float("inf")
 
-            for r, d in scores.items():
-                if d is not None and d < best_dist:
-                    best_dist = d
-                    best_role = r
+        for r, d in scores.items():
+            if d is not None and d < best_dist:
+                best_dist = d
+                best_role = r
 
-            cur_role = it["current_role"]
-            cur_dist = scores.get(cur_role)
+        cur_role = it["current_role"]
+        cur_dist = scores.get(cur_role)
 
-            if not best_role or best_role == cur_role:
-                continue
+        if not best_role or best_role == cur_role:
+            return None
 
-            if cur_dist is None or cur_dist <= 0:
-                continue
+        if cur_dist is None or cur_dist <= 0:
+            return None
 
-            # relative gain
-            relative_gain = (cur_dist - best_dist) / cur_dist
+        # relative gain
+        relative_gain = (cur_dist - best_dist) / cur_dist
 
-            if relative_gain > margin:
-                confusions.append({
-                    "id": it["id"],
-                    "failure_id": it["failure_id"],
-                    "text": text,
-                    "current_role": cur_role,
-                    "best_role": best_role,
-                    "scores": scores,
-                    "delta": round(cur_dist - best_dist, 6),
-                })
+        if relative_gain <= margin:
+            return None
 
         return {
-            "total_scanned": len(all_items),
-            "confusion_count": len(confusions),
-            "margin": margin,
-            "confusions": confusions,
+            "id": it["id"],
+            "failure_id": it["failure_id"],
+            "text": it["text"],
+            "current_role": cur_role,
+            "best_role": best_role,
+            "scores": scores,
+            "delta": round(cur_dist - best_dist, 6),
         }
 
     # -----------------------------------------------------
@@ -271,66 +630,67 @@ class SemanticEvaluator:
     def find_near_duplicate_failures(
         self,
         threshold: float = 0.92,
+        top_k: Optional[int] = None,
+        output_path: Optional[Path] = None,
     ) -> List[Dict[str, Any]]:
         """
         Find highly similar failure pairs using role-aware embeddings.
-        """
 
-        # role -> list[(failure_id, embedding)]
-        role_map = {r: [] for r in ROLES}
+        Pair score = sum over shared roles of weight * cosine similarity,
+        computed block-wise (see weighted_pair_blocks). top_k limits
+        candidates to an approximate neighbour graph; with output_path the
+        pairs are streamed to that JSONL file (block order) and not returned.
+        """
 
-        data = self.collection.get(
+        data = self._get(
             include=["embeddings", "metadatas"]
         )
 
+        # failure_id -> row; role -> (rows, embeddings)
+        # ids are "<failure_id>::<role>", so one embedding per failure and role
+        fid_rows: Dict[Any, int] = {}
+        role_rows = {r: ([], []) for r in ROLES}
+
         for emb, meta in zip(data["embeddings"], data["metadatas"]):
             role = meta.get("role")
-            fid = meta.get("failure_id")
-            if role in role_map:
-                role_map[role].append((fid, np.array(emb)))
-
-        # weight must match retrieval logic
-        role_weights = {
-            "failure_mode": 0.5,
-            "failure_element": 0.4,
-            "failure_effect": 0.3,
-        }
-
-        pair_scores: Dict[tuple, Dict[str, Any]] = {}
-
-        for role, items in role_map.items():
-            w = role_weights.get(role, 0.0)
-
-            for i in range(len(items)):
-                fid1, e1 = items[i]
-                for j in range(i + 1, len(items)):
-                    fid2, e2 = items[j]
-                    if fid1 == fid2:
-                        continue
-
-                    sim = cosine_sim(e1, e2)
-                    key = tuple(sorted([fid1, fid2]))
-
-                    if key not in pair_scores:
-                        pair_scores[key] = {
-                            "failure_1": key[0],
-                            "failure_2": key[1],
-                            "score": 0.0,
-                            "roles": set(),
-                        }
-
-                    pair_scores[key]["score"] += w * sim
-                    pair_scores[key]["roles"].add(role)
+            if role in role_rows:
+                row = fid_rows.setdefault(meta.get("failure_id"), len(fid_rows))
+                role_rows[role][0].append(row)
+                role_rows[role][1].append(emb)
+
+        fids = list(fid_rows)
+        mats: Dict[str, np.ndarray] = {}
+        has_role: Dict[str, np.ndarray] = {}
+        for role, (rows, embs) in role_rows.items():
+            if rows:
+                E = normalize_rows(np.asarray(embs))
+                mats[role] = np.zeros((len(fids), E.shape[1]), dtype=np.float32)
+                mats[role][rows] = E
+                has_role[role] = np.zeros(len(fids), dtype=bool)
+                has_role[role][rows] = True
+
+        out = None
+        if output_path is not None:
+            out = Path(output_path).open("w", encoding="utf-8")
 
         results = []
-        for v in pair_scores.values():
-            if v["score"] >= threshold:
-                results.append({
-                    "failure_1": v["failure_1"],
-                    "failure_2": v["failure_2"],
-                    "similarity": round(v["score"], 4),
-                    "roles": sorted(v["roles"]),
-                })
+        try:
+            for rows_a, rows_b, scores in weighted_pair_blocks(mats, FAILURE_ROLE_WEIGHTS, threshold, top_k):
+                for a, b, score in zip(rows_a, rows_b, scores):
+                    key = tuple(sorted([fids[a], fids[b]]))
+                    rec = {
+                        "failure_1": key[0],
+                        "failure_2": key[1],
+                        "similarity": round(float(score), 4),
+                        "roles": sorted(r for r in mats if has_role[r][a] and has_role[r][b]),
+                    }
+                    if out:
+                        out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                    else:
+                        results.append(rec)
+        finally:
+            if out:
+                out.close()
 
         return sorted(results, key=lambda x: -x["similarity"])
 
@@ -352,23 +712,38 @@ class CauseSemanticEvaluator:
             embedding_function=self.embedder,
         )
 
+        self.snapshot: Optional[EmbeddingSnapshot] = None
+        self._memo: Dict[tuple, Any] = {}
+
+    # -----------------------------------------------------
+    # Data access (snapshot if loaded, else the collection)
+    # -----------------------------------------------------
+
+    def load_snapshot(self, cache_path: Optional[Path] = None) -> EmbeddingSnapshot:
+        """Read the collection once; later metrics (and kNN results) reuse it."""
+        self.snapshot = EmbeddingSnapshot.from_collection(self.collection, self.cause_kb_dir, cache_path)
+        self._memo = {}
+        return self.snapshot
+
+    def _get(self, **kwargs) -> Dict[str, Any]:
+        if self.snapshot is not None:
+            return self.snapshot.get(**kwargs)
+        return self.collection.get(**kwargs)
+
     def evaluate_cohesion(
         self,
         k: int = DEFAULT_K,
     ) -> Dict[str, Any]:
 
-        res = self.collection.get(include=["documents"])
+        res = self._get(include=["documents", "embeddings"])
         items = []
         distances_all = []
 
-        for _id, text in zip(res["ids"], res["documents"]):
-            q = self.collection.query(
-                query_texts=[text],
-                n_results=k + 1,
-            )
-            dists = [float(d) for d in q["distances"][0] if d > 1e-6]
-            avg_dist = safe_mean(dists)
+        # batched kNN over the stored embeddings (see SemanticEvaluator)
+        index = DistanceIndex(res["embeddings"], collection_space(self.collection))
+        avg_dists = knn_avg_distances(index, k) if len(res["ids"]) else []
 
+        for _id, text, avg_dist in zip(res["ids"], res["documents"], avg_dists):
             if avg_dist is not None:
                 distances_all.append(avg_dist)
 
@@ -407,25 +782,14 @@ class CauseSemanticEvaluator:
         threshold: float = 0.90,
     ) -> List[Dict[str, Any]]:
 
-        data = self.collection.get(
+        data = self._get(
             include=["embeddings", "metadatas"]
         )
 
-        causes = []
-        for emb, meta, cid in zip(
-            data["embeddings"],
-            data["metadatas"],
-            data["ids"],
-        ):
-            causes.append({
-                "cause_id": cid,
-                "failure_id": meta.get("failure_id"),
-                "embedding": np.array(emb),
-            })
-
-        by_failure = {}
-        for c in causes:
-            by_failure.setdefault(c["failure_id"], []).append(c)
+        # one normalized matrix, rows grouped by failure_id
+        order, ranges = group_rows([meta.get("failure_id") for meta in data["metadatas"]])
+        cause_ids = [data["ids"][i] for i in order]
+        emb = normalize_rows(np.asarray(data["embeddings"])[order]) if len(order) else None
 
         results = []
 
@@ -433,17 +797,21 @@ class CauseSemanticEvaluator:
             f1 = pair["failure_1"]
             f2 = pair["failure_2"]
 
-            for c1 in by_failure.get(f1, []):
-                for c2 in by_failure.get(f2, []):
-                    sim = cosine_sim(c1["embedding"], c2["embedding"])
-                    if sim >= threshold:
-                        results.append({
-                            "failure_1": f1,
-                            "failure_2": f2,
-                            "cause_1": c1["cause_id"],
-                            "cause_2": c2["cause_id"],
-                            "similarity": round(sim, 4),
-                        })
+            if f1 not in ranges or f2 not in ranges:
+                continue
+            s1, e1 = ranges[f1]
+            s2, e2 = ranges[f2]
+
+            # all cause pairs of the two failures in one matmul
+            sims = emb[s1:e1] @ emb[s2:e2].T
+            for i, j in zip(*np.nonzero(sims >= threshold)):
+                results.append({
+                    "failure_1": f1,
+                    "failure_2": f2,
+                    "cause_1": cause_ids[s1 + i],
+                    "cause_2": cause_ids[s2 + j],
+                    "similarity": round(float(sims[i, j]), 4),
+                })
 
         return sorted(results, key=lambda x: -x["similarity"])
 
@@ -457,8 +825,18 @@ def run_semantic_evaluation(
     cause_kb_dir: Path,
     output_path: Path,
     k: int = DEFAULT_K,
+    snapshot_dir: Optional[Path] = None,
 ):
+    """
+    Full SD report. Each KB is read once into an EmbeddingSnapshot
+    (cached as .npz under snapshot_dir when given); cohesion kNN results
+    are shared between SD1 and SD3.
+    """
+    def snapshot_path(name: str) -> Optional[Path]:
+        return Path(snapshot_dir) / f"{name}_snapshot.npz" if snapshot_dir else None
+
     evaluator = SemanticEvaluator(failure_kb_dir)
+    evaluator.load_snapshot(snapshot_path("failure"))
 
     report: Dict[str, Any] = {
         "config": {
@@ -502,14 +880,10 @@ def run_semantic_evaluation(
 
     # ---- Cause semantic evaluation ----
     cause_eval = CauseSemanticEvaluator(cause_kb_dir)
+    cause_eval.load_snapshot(snapshot_path("cause"))
     report["cause"]["cohesion"] = cause_eval.evaluate_cohesion(k=k)
 
-    output_path.write_text(
-        json.dumps(report, indent=2, ensure_ascii=False),
-        encoding="utf-8",
-    )
-
-        # ---- Cause SD4: near-duplicates under similar failures ----
+    # ---- Cause SD4: near-duplicates under similar failures ----
     near_causes = cause_eval.find_near_duplicate_causes(
         failure_pairs=near_failures,
         threshold=0.90,
@@ -520,6 +894,11 @@ def run_semantic_evaluation(
         "pairs": near_causes,
     }
 
+    output_path.write_text(
+        json.dumps(report, indent=2, ensure_ascii=False),
+        encoding="utf-8",
+    )
+
     print(f"[OK] Semantic evaluation report written to: {output_path}")
     return report
 
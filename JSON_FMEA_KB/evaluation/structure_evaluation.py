@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Optional
 
 
 # ---------------------------
@@ -16,6 +18,98 @@ def load_json(path: Path) -> Dict[str, Any]:
         return json.load(f)
 
 
+# Characters a JSON number can continue with
+NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+
+def iter_store_items(path: Path, chunk_chars: int = 1 << 20) -> Iterator[Tuple[str, Any]]:
+    """
+    Stream (key, value) pairs of a top-level JSON object without loading
+    the whole file: memory is bounded by the largest single value.
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Missing file: {path}")
+
+    decoder = json.JSONDecoder()
+
+    with open(path, "r", encoding="utf-8") as f:
+        buf = ""
+        pos = 0
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buf, pos, eof
+            if eof:
+                return False
+            chunk = f.read(chunk_chars)
+            if not chunk:
+                eof = True
+                return False
+            buf = buf[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip_ws() -> str:
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos].isspace():
+                    pos += 1
+                if pos < len(buf):
+                    return buf[pos]
+                if not fill():
+                    return ""
+
+        def cut_at_edge(value: Any, end: int) -> bool:
+            # Strings, containers and literals end on an unambiguous character;
+            # a number may continue past the buffer edge ("12." + "5"), so it
+            # is only complete once a non-number character follows it
+            if eof:
+                return False
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                while end < len(buf) and buf[end] in NUMBER_CHARS:
+                    end += 1
+            return end >= len(buf)
+
+        def decode() -> Any:
+            nonlocal pos
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                    if not cut_at_edge(value, end):
+                        pos = end
+                        return value
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                if not fill():
+                    value, pos = decoder.raw_decode(buf, pos)
+                    return value
+
+        def expect(ch: str) -> None:
+            nonlocal pos
+            if skip_ws() != ch:
+                raise ValueError(f"{path}: expected {ch!r} at offset {pos}")
+            pos += 1
+
+        expect("{")
+        if skip_ws() == "}":
+            return
+
+        while True:
+            skip_ws()
+            key = decode()
+            expect(":")
+            skip_ws()
+            yield key, decode()
+
+            ch = skip_ws()
+            pos += 1
+            if ch == "}":
+                return
+            if ch != ",":
+                raise ValueError(f"{path}: expected ',' or '}}' at offset {pos - 1}")
+
+
 def is_blank_str(x: Any) -> bool:
     return isinstance(x, str) and x.strip() == ""
 
@@ -196,6 +290,118 @@ def check_referential_integrity(
     return errors
 
 
+# ---------------------------
+# Streaming runner helpers
+# ---------------------------
+
+# Items per checked chunk (unit of work for the process pool)
+CHUNK_SIZE = 5000
+
+
+class IssueCollector:
+    """Exact issue count, but only the first `limit` messages are kept."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.count = 0
+        self.samples: List[str] = []
+
+    def add(self, messages: List[str], count: Optional[int] = None) -> None:
+        self.count += len(messages) if count is None else count
+        room = self.limit - len(self.samples)
+        if room > 0:
+            self.samples.extend(messages[:room])
+
+    def merged_with(self, other: "IssueCollector") -> "IssueCollector":
+        """self's issues first (same order as the one-pass validator)."""
+        out = IssueCollector(self.limit)
+        out.add(self.samples, self.count)
+        out.add(other.samples, other.count)
+        return out
+
+
+def check_chunk(kind: str, items: List[Tuple[str, Any]], limit: int) -> Dict[str, Any]:
+    """
+    K1-K3 for one chunk of store items, plus the references K4 needs
+    (failure -> cause_ids, cause -> failure_id), resolved by the caller.
+    Top-level so it can run in worker processes.
+    """
+    k1 = IssueCollector(limit)
+    k2 = IssueCollector(limit)
+    k3 = IssueCollector(limit)
+    refs: List[Tuple[str, Any]] = []
+
+    id_field = "failure_id" if kind == "failure" else "cause_id"
+
+    for key_id, obj in items:
+        if not isinstance(obj, dict):
+            k1.add([f"{kind} {key_id} value is not dict"])
+            continue
+
+        if kind == "failure":
+            k1.add([f"failure {key_id}: {e}" for e in check_failure_schema(key_id, obj)])
+            k2.add([f"failure {key_id}: {e}" for e in check_null_semantics_failure(key_id, obj)])
+
+            refs.append((key_id, normalize_null_fields_in_memory(obj).get("cause_ids", [])))
+        else:
+            k1.add([f"cause {key_id}: {e}" for e in check_cause_schema(key_id, obj)])
+            k2.add([f"cause {key_id}: {e}" for e in check_null_semantics_cause(key_id, obj)])
+            refs.append((key_id, obj.get("failure_id")))
+
+        inner = obj.get(id_field)
+        if inner and inner != key_id:
+            k3.add([f"id mismatch: key={key_id} but {id_field}={inner}"])
+
+    def pack(c: IssueCollector) -> Tuple[int, List[str]]:
+        return c.count, c.samples
+
+    return {
+        "K1": pack(k1),
+        "K2": pack(k2),
+        "K3": pack(k3),
+        "refs": refs,
+    }
+
+
+def iter_chunks(items: Iterable[Tuple[str, Any]], size: int) -> Iterator[List[Tuple[str, Any]]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_checked_chunks(
+    kind: str,
+    path: Path,
+    limit: int,
+    workers: int,
+    chunk_size: int,
+) -> Iterator[Tuple[List[str], Dict[str, Any]]]:
+    """Yield (keys, check result) per chunk, in file order."""
+    chunks = iter_chunks(iter_store_items(path), chunk_size)
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield [k for k, _ in chunk], check_chunk(kind, chunk, limit)
+        return
+
+    # Bounded number of chunks in flight; results consumed in submission order
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        for chunk in chunks:
+            pending.append(([k for k, _ in chunk], pool.submit(check_chunk, kind, chunk, limit)))
+            if len(pending) >= 2 * workers:
+                keys, fut = pending.popleft()
+                yield keys, fut.result()
+        while pending:
+            keys, fut = pending.popleft()
+            yield keys, fut.result()
+
+
 # ---------------------------
 # Runner
 # ---------------------------
@@ -204,63 +410,100 @@ def validate_k1_k4(
     failure_kb_dir: Path,
     cause_kb_dir: Path,
     max_print: int = 30,
+    workers: int = 1,
+    chunk_size: int = CHUNK_SIZE,
 ) -> Dict[str, Any]:
+    """
+    K1-K4 over both stores, streamed: stores are parsed incrementally,
+    counts are exact and only `max_print` samples per check are kept.
+    workers > 1 checks chunks of `chunk_size` items in a process pool.
+
+    Memory is bounded by the id sets and the cause -> failure references
+    needed for K4, not by the stores themselves.
+    """
     failure_store_path = failure_kb_dir / "fmea_failure_store.json"
     cause_store_path = cause_kb_dir / "fmea_cause_store.json"
 
-    failure_store = load_json(failure_store_path)
-    cause_store = load_json(cause_store_path)
-
-    # Collect issues
-    k1_errors: List[str] = []
-    k2_issues: List[str] = []
-    k3_errors: List[str] = []
-    k4_errors: List[str] = []
-
-    # K1 + K2 for failures
-    for fid, f in failure_store.items():
-        if not isinstance(f, dict):
-            k1_errors.append(f"failure {fid} value is not dict")
-            continue
-        k1_errors.extend([f"failure {fid}: {e}" for e in check_failure_schema(fid, f)])
-        k2_issues.extend([f"failure {fid}: {e}" for e in check_null_semantics_failure(fid, f)])
-
-    # K1 + K2 for causes
-    for cid, c in cause_store.items():
-        if not isinstance(c, dict):
-            k1_errors.append(f"cause {cid} value is not dict")
-            continue
-        k1_errors.extend([f"cause {cid}: {e}" for e in check_cause_schema(cid, c)])
-        k2_issues.extend([f"cause {cid}: {e}" for e in check_null_semantics_cause(cid, c)])
-
-    # K3
-    k3_errors.extend([f"FailureKB: {e}" for e in check_unique_ids(failure_store, "failure_id")])
-    k3_errors.extend([f"CauseKB: {e}" for e in check_unique_ids(cause_store, "cause_id")])
+    def collectors() -> Dict[str, IssueCollector]:
+        return {k: IssueCollector(max_print) for k in ("K1", "K2", "K3", "K4")}
+
+    by_store = {"failure": collectors(), "cause": collectors()}
+
+    def absorb(kind: str, res: Dict[str, Any]) -> None:
+        for check in ("K1", "K2", "K3"):
+            count, samples = res[check]
+            by_store[kind][check].add(samples, count)
+
+    # Causes first: their ids are needed for the failure -> cause references
+    cause_ids_all: set = set()
+    cause_refs: List[Tuple[str, Any]] = []
+
+    for keys, res in iter_checked_chunks("cause", cause_store_path, max_print, workers, chunk_size):
+        for cid in keys:
+            if cid in cause_ids_all:
+                by_store["cause"]["K3"].add([f"duplicate key: {cid}"])
+            cause_ids_all.add(cid)
+        absorb("cause", res)
+        cause_refs.extend(res["refs"])
+
+    # Failures (K4: Failure.cause_ids must exist in CauseKB)
+    failure_ids_all: set = set()
+
+    for keys, res in iter_checked_chunks("failure", failure_store_path, max_print, workers, chunk_size):
+        for fid in keys:
+            if fid in failure_ids_all:
+                by_store["failure"]["K3"].add([f"duplicate key: {fid}"])
+            failure_ids_all.add(fid)
+        absorb("failure", res)
+
+        failure_k4 = by_store["failure"]["K4"]
+        for fid, cause_ids in res["refs"]:
+            if not isinstance(cause_ids, list):
+                failure_k4.add([f"failure {fid} cause_ids is not list"])
+                continue
+            failure_k4.add([
+                f"failure {fid} references missing cause_id: {cid}"
+                for cid in cause_ids
+                if cid not in cause_ids_all
+            ])
+
+    # K4: Cause.failure_id must exist in FailureKB
+    cause_k4 = by_store["cause"]["K4"]
+    for cid, fid in cause_refs:
+        if not fid or not isinstance(fid, str):
+            cause_k4.add([f"cause {cid} has invalid failure_id: {fid}"])
+        elif fid not in failure_ids_all:
+            cause_k4.add([f"cause {cid} references missing failure_id: {fid}"])
 
-    # K4
-    k4_errors.extend(check_referential_integrity(failure_store, cause_store))
+    # failures before causes, as in the report's sample order
+    f, c = by_store["failure"], by_store["cause"]
+    k1 = f["K1"].merged_with(c["K1"])
+    k2 = f["K2"].merged_with(c["K2"])
+    k3 = IssueCollector(max_print)
+    k3.add([f"FailureKB: {e}" for e in f["K3"].samples], f["K3"].count)
+    k3.add([f"CauseKB: {e}" for e in c["K3"].samples], c["K3"].count)
+    k4 = f["K4"].merged_with(c["K4"])
 
     report = {
         "counts": {
-            "failures": len(failure_store),
-            "causes": len(cause_store),
-            "K1_schema_errors": len(k1_errors),
-            "K2_null_semantics_issues": len(k2_issues),
-            "K3_id_errors": len(k3_errors),
-            "K4_ref_integrity_errors": len(k4_errors),
+            "failures": len(failure_ids_all),
+            "causes": len(cause_ids_all),
+            "K1_schema_errors": k1.count,
+            "K2_null_semantics_issues": k2.count,
+            "K3_id_errors": k3.count,
+            "K4_ref_integrity_errors": k4.count,
         },
         "samples": {
-            "K1_schema_errors": k1_errors[:max_print],
-            "K2_null_semantics_issues": k2_issues[:max_print],
-            "K3_id_errors": k3_errors[:max_print],
-            "K4_ref_integrity_errors": k4_errors[:max_print],
+            "K1_schema_errors": k1.samples,
+            "K2_null_semantics_issues": k2.samples,
+            "K3_id_errors": k3.samples,
+            "K4_ref_integrity_errors": k4.samples,
         },
     }
     return report
 
 
 
-
 if __name__ == "__main__":
     # Example wiring: adapt BASE_DIR in your project entrypoint
     BASE_DIR = Path(__file__).resolve().parent
@@ -1,12 +1,12 @@
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import numpy as np
 import chromadb
 from chromadb.utils import embedding_functions
 
 import matplotlib.pyplot as plt
-from sklearn.decomposition import PCA
+from sklearn.decomposition import PCA, IncrementalPCA
 
 
 # =========================================================
@@ -21,25 +21,38 @@ ROLES = {
 
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"
 
+COLLECTION_NAME = "fmea_failure_kb"
+
+# Streaming path: embeddings are read page by page, PCA is fitted
+# incrementally and at most MAX_POINTS_PER_ROLE points per role are plotted
+PAGE_SIZE = 5000
+MAX_POINTS_PER_ROLE = 20000
+RANDOM_STATE = 42
+
 
 # =========================================================
 # Data loading
 # =========================================================
 
-def load_failure_embeddings(
-    failure_kb_dir: Path,
-) -> Tuple[np.ndarray, List[str], List[str]]:
-    client = chromadb.PersistentClient(path=str(failure_kb_dir))
+def get_collection(kb_dir: Path, collection_name: str = COLLECTION_NAME):
+    client = chromadb.PersistentClient(path=str(kb_dir))
 
     embedder = embedding_functions.SentenceTransformerEmbeddingFunction(
         model_name=EMBEDDING_MODEL
     )
 
-    collection = client.get_collection(
-        name="fmea_failure_kb",
+    return client.get_collection(
+        name=collection_name,
         embedding_function=embedder,
     )
 
+
+def load_failure_embeddings(
+    failure_kb_dir: Path,
+) -> Tuple[np.ndarray, List[str], List[str]]:
+    """Whole collection in memory (small KBs; see iter_embedding_pages)."""
+    collection = get_collection(failure_kb_dir)
+
     # ✅ "ids" must NOT be in include; ids are always returned
     data = collection.get(include=["embeddings", "metadatas"])
 
@@ -61,31 +74,127 @@ def load_failure_embeddings(
     return np.array(X), roles, ids
 
 
+def iter_embedding_pages(
+    collection,
+    page_size: int = PAGE_SIZE,
+    role_key: str = "role",
+    roles: Optional[Dict[str, str]] = None,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield (embeddings float32 [n, d], roles [n]) page by page, keeping only
+    items whose `role_key` metadata is one of `roles`.
+    """
+    wanted = list(roles or ROLES)
+    offset = 0
+
+    while True:
+        page = collection.get(
+            include=["embeddings", "metadatas"],
+            limit=page_size,
+            offset=offset,
+        )
+        n = len(page["ids"])
+        if n == 0:
+            return
+        offset += n
+
+        page_roles = np.array([(m or {}).get(role_key) for m in page["metadatas"]], dtype=object)
+        mask = np.isin(page_roles, wanted)
+        if mask.any():
+            X = np.asarray(page["embeddings"], dtype=np.float32)
+            yield X[mask], page_roles[mask].astype(str)
+
+        if n < page_size:
+            return
+
+
+def fit_incremental_pca(
+    collection,
+    n_components: int = 2,
+    page_size: int = PAGE_SIZE,
+    role_key: str = "role",
+    roles: Optional[Dict[str, str]] = None,
+) -> IncrementalPCA:
+    """Fit PCA over the whole collection with one page in memory at a time."""
+    pca = IncrementalPCA(n_components=n_components)
+    carry = None
+
+    for X, _ in iter_embedding_pages(collection, page_size, role_key, roles):
+        if carry is not None:
+            X = np.vstack([carry, X])
+            carry = None
+        # partial_fit needs at least n_components rows per batch
+        if len(X) < n_components:
+            carry = X
+            continue
+        pca.partial_fit(X)
+
+    if not hasattr(pca, "components_"):
+        raise RuntimeError("No failure embeddings found for visualization.")
+    return pca
+
+
+def sample_projection(
+    collection,
+    pca: IncrementalPCA,
+    page_size: int = PAGE_SIZE,
+    max_points_per_role: int = MAX_POINTS_PER_ROLE,
+    role_key: str = "role",
+    roles: Optional[Dict[str, str]] = None,
+    seed: int = RANDOM_STATE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Project every page and keep a uniform random sample of at most
+    `max_points_per_role` points per role (smallest random keys win).
+    """
+    rng = np.random.default_rng(seed)
+    kept: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    for X, page_roles in iter_embedding_pages(collection, page_size, role_key, roles):
+        Y = pca.transform(X)
+        keys = rng.random(len(Y))
+
+        for role in np.unique(page_roles):
+            mask = page_roles == role
+            Y_r, k_r = Y[mask], keys[mask]
+            if role in kept:
+                Y_r = np.vstack([kept[role][0], Y_r])
+                k_r = np.concatenate([kept[role][1], k_r])
+            if len(k_r) > max_points_per_role:
+                top = np.argpartition(k_r, max_points_per_role - 1)[:max_points_per_role]
+                Y_r, k_r = Y_r[top], k_r[top]
+            kept[role] = (Y_r, k_r)
+
+    if not kept:
+        return np.empty((0, pca.n_components_)), np.empty(0, dtype=str)
+
+    Y = np.vstack([y for y, _ in kept.values()])
+    labels = np.concatenate([np.full(len(y), role) for role, (y, _) in kept.items()])
+    return Y, labels
+
+
 # =========================================================
 # Visualization
 # =========================================================
 
-def plot_pca_2d(
-    X: np.ndarray,
-    roles: List[str],
+def plot_projection_2d(
+    X_2d: np.ndarray,
+    roles,
     out_path: Path,
+    role_colors: Optional[Dict[str, str]] = None,
 ):
-    """
-    2D PCA scatter: same axis, color by role.
-    """
-    pca = PCA(n_components=2, random_state=42)
-    X_2d = pca.fit_transform(X)
+    roles = np.asarray(roles)
 
     plt.figure(figsize=(9, 7))
 
-    for role, color in ROLES.items():
-        idx = [i for i, r in enumerate(roles) if r == role]
-        if not idx:
+    for role, color in (role_colors or ROLES).items():
+        mask = roles == role
+        if not mask.any():
             continue
 
         plt.scatter(
-            X_2d[idx, 0],
-            X_2d[idx, 1],
+            X_2d[mask, 0],
+            X_2d[mask, 1],
             c=color,
             label=role,
             alpha=0.6,
@@ -104,22 +213,19 @@ def plot_pca_2d(
     plt.close()
 
 
-def plot_pca_1d(
-    X: np.ndarray,
-    roles: List[str],
+def plot_projection_1d(
+    x_1d: np.ndarray,
+    roles,
     out_path: Path,
+    role_colors: Optional[Dict[str, str]] = None,
 ):
-    """
-    1D PCA distribution (histogram) per role.
-    """
-    pca = PCA(n_components=1, random_state=42)
-    x_1d = pca.fit_transform(X).flatten()
+    roles = np.asarray(roles)
 
     plt.figure(figsize=(9, 5))
 
-    for role, color in ROLES.items():
-        vals = [x_1d[i] for i, r in enumerate(roles) if r == role]
-        if not vals:
+    for role in (role_colors or ROLES):
+        vals = x_1d[roles == role]
+        if not len(vals):
             continue
 
         plt.hist(
@@ -141,6 +247,30 @@ def plot_pca_1d(
     plt.close()
 
 
+def plot_pca_2d(
+    X: np.ndarray,
+    roles: List[str],
+    out_path: Path,
+):
+    """
+    2D PCA scatter: same axis, color by role.
+    """
+    pca = PCA(n_components=2, random_state=RANDOM_STATE)
+    plot_projection_2d(pca.fit_transform(X), roles, out_path)
+
+
+def plot_pca_1d(
+    X: np.ndarray,
+    roles: List[str],
+    out_path: Path,
+):
+    """
+    1D PCA distribution (histogram) per role.
+    """
+    pca = PCA(n_components=1, random_state=RANDOM_STATE)
+    plot_projection_1d(pca.fit_transform(X).flatten(), roles, out_path)
+
+
 # =========================================================
 # Runner
 # =========================================================
@@ -148,25 +278,45 @@ def plot_pca_1d(
 def run_failure_semantic_visualization(
     failure_kb_dir: Path,
     output_dir: Path,
+    collection_name: str = COLLECTION_NAME,
+    role_key: str = "role",
+    role_colors: Optional[Dict[str, str]] = None,
+    page_size: int = PAGE_SIZE,
+    max_points_per_role: int = MAX_POINTS_PER_ROLE,
 ):
     """
     Entry point for visualization.
-    """
-    X, roles, _ = load_failure_embeddings(failure_kb_dir)
 
-    if len(X) == 0:
-        raise RuntimeError("No failure embeddings found for visualization.")
+    Two streaming passes over the collection (IncrementalPCA fit, then
+    projection + per-role sampling), so memory stays bounded by
+    page_size and max_points_per_role, not by the KB size.
+    """
+    collection = get_collection(failure_kb_dir, collection_name)
+    roles = role_colors or ROLES
+
+    # PC1 of the 2-component fit is the 1D projection
+    pca = fit_incremental_pca(collection, 2, page_size, role_key, roles)
+    Y, labels = sample_projection(
+        collection,
+        pca,
+        page_size=page_size,
+        max_points_per_role=max_points_per_role,
+        role_key=role_key,
+        roles=roles,
+    )
 
-    plot_pca_2d(
-        X,
-        roles,
+    plot_projection_2d(
+        Y,
+        labels,
         output_dir / "failure_role_pca_2d.png",
+        roles,
     )
 
-    plot_pca_1d(
-        X,
-        roles,
+    plot_projection_1d(
+        Y[:, 0],
+        labels,
         output_dir / "failure_role_pca_1d.png",
+        roles,
     )
 
     print(f"[OK] Visualization written to: {output_dir}")
@@ -1,7 +1,16 @@
+import sys
 from pathlib import Path
 
+# Shared modules live in the repository root package
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
 from kb_structure import FMEAFailureKB, FMEACauseKB
 from ingest_fmea import ingest_fmea_json
+from pipeline_common.pipeline_logging import get_logger
+
+log = get_logger("fmea_batch_process")
 
 
 # =========================================================
@@ -38,14 +47,13 @@ cause_kb = FMEACauseKB(persist_dir=CAUSE_KB_DIR)
 # 3) Ingest all FMEA JSON files
 # =========================================================
 
-json_files = sorted(JSON_ROOT.glob("*.json"))
+json_files = sorted([*JSON_ROOT.glob("*.json"), *JSON_ROOT.glob("*.jsonl")])
 
-print(f"[INFO] JSON_ROOT = {JSON_ROOT}")
-print(f"[INFO] Found {len(json_files)} FMEA JSON files")
+log.info("JSON_ROOT = %s", JSON_ROOT)
+log.info("Found %d FMEA JSON files", len(json_files))
 
+failed = 0
 for jp in json_files[:]:
-    print(f"[INGEST] {jp.name}")
-
     try:
         ingest_fmea_json(
             json_path=jp,
@@ -53,8 +61,9 @@ for jp in json_files[:]:
             cause_kb=cause_kb,
         )
     except Exception as e:
-        print(f"[ERROR] Failed to ingest {jp.name}: {e}")
+        failed += 1
+        log.error("Failed to ingest %s: %s", jp.name, e)
 
-print("[INFO] Ingest finished")
-print(f"Failure KB count : {failure_kb.collection.count()}")
-print(f"Cause KB count   : {cause_kb.collection.count()}")
+log.info("Ingest finished: %d files, %d failed", len(json_files), failed)
+log.info("Failure KB count : %d", failure_kb.collection.count())
+log.info("Cause KB count   : %d", cause_kb.collection.count())
@@ -1,20 +1,32 @@
-from kb_structure import FMEAFailureKB, FMEACauseKB, FMEAFailure, FMEACause
-
+import sys
 import json
 from pathlib import Path
 from collections import defaultdict
+from functools import lru_cache
+from itertools import groupby
+from typing import Iterable, List, Optional, Tuple
 import re
 
+# Shared modules live in the repository root package
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from kb_structure import FMEAFailureKB, FMEACauseKB, FMEAFailure, FMEACause
+from pipeline_common.instrumentation import timed
+from pipeline_common.pipeline_logging import get_logger, RowSampler, FileSummary
+
+log = get_logger("ingest_fmea")
 
-GENERIC_RIGHT_TOKENS = {
+GENERIC_RIGHT_TOKENS = frozenset({
     "general",
     "specification",
     "specifications",
     "approval",
     "approbation",
-}
+})
 
-ELEMENT_RIGHT_TOKENS = {
+ELEMENT_RIGHT_TOKENS = frozenset({
     "filter",
     "switch",
     "switches",
@@ -32,18 +44,87 @@ ELEMENT_RIGHT_TOKENS = {
     "output",
     "limiter",
     "protection",
-}
+})
+
+# Substrings marking a failure type as a concrete element (is_failure_element_term)
+ELEMENT_TERM_SUBSTRINGS = (
+    "power",
+    "controller",
+    "control",
+    "board",
+    "pcb",
+    "pcba",
+    "interface",
+    "algorithm",
+    "logic",
+    "sensor",
+    "actuator",
+    "driver",
+    "converter",
+    "regulator",
+    "transceiver",
+    "communication",
+    "support electronics",
+    "startup",
+    "buck",
+    "DC",
+    "cooling",
+)
+
+# Discipline vocabulary (infer_discipline_from_failure_type), checked in order
+ELECTRONICS_TOKENS = frozenset({
+    "electronics", "electronic", "electrical",
+    "hw", "hardware",
+})
+MECHANICS_TOKENS = frozenset({
+    "mechanics", "mechanical", "mech", "mch"
+})
+SOFTWARE_TOKENS = frozenset({
+    "software", "sw", "firmware", "embedded software", "esw"
+})
+PROCESS_TOKENS = frozenset({
+    "process", "manufacturing", "assembly",
+    "soldering", "welding", "installation", "calibration", "coating"
+})
+DESIGN_TOKENS = frozenset({
+    "design", "requirement", "requirements",
+    "spec", "specification", "architecture",
+    "dimensioning", "tolerance"
+})
+GENERIC_TOKENS = frozenset({
+    "system", "subsystem", "overall", "general"
+})
+
+DISCIPLINE_TOKENS = (
+    ("HW", ELECTRONICS_TOKENS),
+    ("MCH", MECHANICS_TOKENS),
+    ("ESW", SOFTWARE_TOKENS),
+    ("process", PROCESS_TOKENS),
+    ("design", DESIGN_TOKENS),
+    ("other", GENERIC_TOKENS),
+)
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9\s]")
+_SPACES_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_ELEMENT_TERM_RE = re.compile("|".join(re.escape(t) for t in ELEMENT_TERM_SUBSTRINGS))
+
+# Old FMEAs repeat a small vocabulary of failure types; field values repeat
+# across the duplicate checks of every group
+NORMALIZE_CACHE_SIZE = 65536
+FAILURE_TYPE_CACHE_SIZE = 4096
 
 # =========================================================
 # Helpers
 # =========================================================
 
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize(s: str | None) -> str:
     if not s:
         return ""
     s = s.lower().strip()
-    s = re.sub(r"[^a-z0-9\s]", " ", s)
-    s = re.sub(r"\s+", " ", s)
+    s = _NON_ALNUM_RE.sub(" ", s)
+    s = _SPACES_RE.sub(" ", s)
     return s
 
 
@@ -71,37 +152,18 @@ def parse_number(value):
 
     return None
 
+
+def max_defined(*values):
+    """Largest value that is not None (None if all are)."""
+    defined = [v for v in values if v is not None]
+    return max(defined) if defined else None
+
 def is_failure_element_term(failure_type: str | None) -> bool:
     ft = normalize(failure_type)
     if not ft:
         return False
 
-    specific_tokens = [
-        "power",
-        "controller",
-        "control",
-        "board",
-        "pcb",
-        "pcba",
-        "interface",
-        "algorithm",
-        "logic",
-        "sensor",
-        "actuator",
-        "driver",
-        "converter",
-        "regulator",
-        "transceiver",
-        "communication",
-        "support electronics",
-        "startup",
-        "buck",
-        "DC",
-        "cooling",
-
-    ]
-
-    return any(token in ft for token in specific_tokens)
+    return _ELEMENT_TERM_RE.search(ft) is not None
 
 # ---------------------------------------------------------
 # Discipline inference (lower priority)
@@ -111,55 +173,22 @@ def infer_discipline_from_failure_type(failure_type: str | None) -> str | None:
     ft = normalize(failure_type)
     if not ft:
         return None
-    tokens = set(re.findall(r"[a-z0-9]+", ft))
-    electronics_tokens = {
-        "electronics", "electronic", "electrical",
-        "hw", "hardware",  
-    }
-    mechanics_tokens = {
-        "mechanics", "mechanical", "mech", "mch"
-    }
-    software_tokens = {
-        "software", "sw", "firmware", "embedded software","esw"
-    }
-    process_tokens = {
-        "process", "manufacturing", "assembly",
-        "soldering", "welding", "installation", "calibration", "coating"
-    }
-    design_tokens = {
-        "design", "requirement", "requirements",
-        "spec", "specification", "architecture",
-        "dimensioning", "tolerance"
-    }
-    generic_tokens = {
-        "system", "subsystem", "overall", "general"
-    }
-
-    if tokens & electronics_tokens:
-        return "HW"
-
-    if tokens & mechanics_tokens:
-        return "MCH"
-
-    if tokens & software_tokens:
-        return "ESW"
-
-    if tokens & process_tokens:
-        return "process"
-
-    if tokens & design_tokens:
-        return "design"
-
-    if tokens & generic_tokens:
-        return "other"
+    tokens = set(_TOKEN_RE.findall(ft))
+
+    for discipline, vocabulary in DISCIPLINE_TOKENS:
+        if not tokens.isdisjoint(vocabulary):
+            return discipline
 
     return None
 
+@lru_cache(maxsize=FAILURE_TYPE_CACHE_SIZE)
 def parse_failure_type_semantics(failure_type: str | None):
     """
     Returns:
         discipline: str | None
         element: str | None
+
+    Memoized per failure_type string (see classify_failure_types).
     """
 
     if not failure_type:
@@ -175,12 +204,10 @@ def parse_failure_type_semantics(failure_type: str | None):
     left = normalize(left_raw.strip())
     right = normalize(right_raw.strip())
 
-    print("DEBUG left:", repr(left), "right:", repr(right))
-
     # -----------------------------
     # Tokenize right safely (word level)
     # -----------------------------
-    right_tokens = set(re.findall(r"[a-z0-9]+", right))
+    right_tokens = set(_TOKEN_RE.findall(right))
 
     # -----------------------------
     # 1. Generic bucket → discipline
@@ -191,7 +218,7 @@ def parse_failure_type_semantics(failure_type: str | None):
     # -----------------------------
     # 2. Explicit element tokens
     # -----------------------------
-    if right_tokens & ELEMENT_RIGHT_TOKENS:
+    if not right_tokens.isdisjoint(ELEMENT_RIGHT_TOKENS):
         return None, f"{left} / {right}"
 
     # -----------------------------
@@ -213,6 +240,18 @@ def parse_failure_type_semantics(failure_type: str | None):
     return None, f"{left} / {right}"
 
 
+def classify_failure_types(
+    failure_types: Iterable[Optional[str]],
+) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    (discipline, element) for each value of a failure_type column, in order.
+    Each distinct value is parsed once.
+    """
+    column = list(failure_types)
+    semantics = {ft: parse_failure_type_semantics(ft) for ft in dict.fromkeys(column)}
+    return [semantics[ft] for ft in column]
+
+
 def build_failure_signature(row: dict) -> tuple:
     """
     Regroup rule:
@@ -286,39 +325,79 @@ def is_duplicate_cause(
 
 
 # =========================================================
-# Ingest
+# Readers
 # =========================================================
 
+def iter_fmea_rows_jsonl(json_path: Path):
+    """Yield rows of a JSON Lines FMEA file one at a time."""
+    with Path(json_path).open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def iter_failure_groups(json_path: Path):
+    """
+    Yield (signature, rows) groups of one converted FMEA file.
+
+    - *.jsonl: streamed; consecutive rows sharing a failure signature form
+      a group (FMEA sheets list the causes of a failure on adjacent rows).
+      A signature that re-appears later is merged by the KB-level
+      duplicate check in ingest_fmea_json, which keeps the maximum
+      severity / RPN, so the result matches the *.json grouping.
+    - *.json: whole array loaded and grouped across the file (legacy).
+    """
+    json_path = Path(json_path)
+
+    if json_path.suffix.lower() == ".jsonl":
+        rows = iter_fmea_rows_jsonl(json_path)
+        for sig, group in groupby(rows, key=build_failure_signature):
+            yield sig, list(group)
+        return
+
+    rows = json.loads(json_path.read_text(encoding="utf-8"))
+    if isinstance(rows, dict):
+        rows = [rows]
+
+    grouped = defaultdict(list)
+    for row in rows:
+        grouped[build_failure_signature(row)].append(row)
+
+    yield from grouped.items()
+
+
 # =========================================================
 # Ingest
 # =========================================================
 
+@timed("ingest.fmea_json")
 def ingest_fmea_json(
     json_path: Path,
     failure_kb,
     cause_kb,
 ):
-    rows = json.loads(json_path.read_text(encoding="utf-8"))
-    if isinstance(rows, dict):
-        rows = [rows]
-
-    file_name = rows[0].get("file_name", json_path.stem)
+    """Ingest one converted FMEA file (*.json array or *.jsonl stream)."""
+    json_path = Path(json_path)
 
-    print(f"[INGEST] {json_path.name}")
+    log.info("[INGEST] %s", json_path.name)
+    summary = FileSummary(log, json_path.name)
+    sampler = RowSampler(log)
 
     # -------------------------------------------------
     # Group by file-internal failure signature
     # -------------------------------------------------
-    grouped = defaultdict(list)
-    for row in rows:
-        sig = build_failure_signature(row)
-        grouped[sig].append(row)
-
+    file_name = None
     failure_counter = 1
 
-    for _, group in grouped.items():
+    for _, group in iter_failure_groups(json_path):
+        if file_name is None:
+            file_name = group[0].get("file_name", json_path.stem)
+
         first = group[0]
         source_type = first.get("source_type")
+        summary.add("groups")
+        summary.add("rows", len(group))
 
         # -------------------------------------------------
         # Build failure semantic fields FIRST (important)
@@ -330,13 +409,13 @@ def ingest_fmea_json(
         else:
             system = None
             ft = first.get("failure_type")
-            print(ft)
-
             discipline, element = parse_failure_type_semantics(ft)
 
-            print("discipline:", discipline)
-            print("element:", element)
-
+            if sampler.hit():
+                log.debug(
+                    "failure_type=%r -> discipline=%r element=%r",
+                    ft, discipline, element,
+                )
 
             function = None
 
@@ -372,6 +451,7 @@ def ingest_fmea_json(
         if existing_failure_id:
             failure_id = existing_failure_id
             failure_obj = None
+            summary.add("failures_merged")
         else:
             failure_id = f"{file_name}__F{failure_counter}"
             failure_counter += 1
@@ -389,11 +469,20 @@ def ingest_fmea_json(
                 source_type=source_type,
             )
             failure_kb.add(failure_obj)
+            summary.add("failures_new")
 
-        # If reused, load existing failure object
+        # If reused, load existing failure object and keep the highest
+        # severity / RPN over all of its rows
         if failure_obj is None:
             failure_obj = FMEAFailure(**failure_kb.store[failure_id])
 
+            merged_severity = max_defined(failure_obj.severity, severity)
+            merged_rpn = max_defined(failure_obj.rpn, rpn)
+            if (merged_severity, merged_rpn) != (failure_obj.severity, failure_obj.rpn):
+                failure_obj.severity = merged_severity
+                failure_obj.rpn = merged_rpn
+                failure_kb.add(failure_obj)   # store + vector metadata
+
         # -------------------------------------------------
         # Causes under this failure
         # -------------------------------------------------
@@ -402,6 +491,7 @@ def ingest_fmea_json(
         for row in group:
             cause_text = row.get("failure_cause")
             if not cause_text:
+                summary.add("rows_without_cause")
                 continue
 
             existing_cause_id = is_duplicate_cause(
@@ -413,6 +503,7 @@ def ingest_fmea_json(
             if existing_cause_id:
                 if existing_cause_id not in failure_obj.cause_ids:
                     failure_obj.cause_ids.append(existing_cause_id)
+                summary.add("causes_duplicate")
                 continue
 
             cause_id = f"{failure_id}_C{cause_counter}"
@@ -451,6 +542,7 @@ def ingest_fmea_json(
 
             cause_kb.add(cause_obj)
             failure_obj.cause_ids.append(cause_id)
+            summary.add("causes_new")
 
         # -------------------------------------------------
         # Back-write failure → causes
@@ -465,5 +557,5 @@ def ingest_fmea_json(
         encoding="utf-8",
     )
 
-    print(f"[OK] {json_path.name} ingested")
+    summary.log()
 
@@ -3,6 +3,7 @@ from typing import Dict, Any, List, Optional
 
 from pathlib import Path
 import json
+import sys
 
 import chromadb
 from chromadb.utils import embedding_functions
@@ -10,6 +11,13 @@ from chromadb.utils import embedding_functions
 from dataclasses import asdict
 from collections import defaultdict
 
+# Shared modules live in the repository root package
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from pipeline_common.instrumentation import timer, timed_embedder
+
 
 #======= Helper =========
 def is_valid_embed_text(text: Optional[str]) -> bool:
@@ -83,13 +91,14 @@ class FMEAFailureKB:
         self.store_path = self.persist_dir / "fmea_failure_store.json"
         self.store: Dict[str, dict] = {}
         if self.store_path.exists():
-            self.store = json.loads(self.store_path.read_text(encoding="utf-8"))
+            with timer("store.load", store=self.store_path.name):
+                self.store = json.loads(self.store_path.read_text(encoding="utf-8"))
 
         # ---------- vector store ----------
         self.client = chromadb.PersistentClient(path=str(self.persist_dir))
-        self.embedder = embedding_functions.SentenceTransformerEmbeddingFunction(
+        self.embedder = timed_embedder(embedding_functions.SentenceTransformerEmbeddingFunction(
             model_name="all-MiniLM-L6-v2"
-        )
+        ))
 
         self.collection = self.client.get_or_create_collection(
             name="fmea_failure_kb",
@@ -102,10 +111,11 @@ class FMEAFailureKB:
     def add(self, failure):
         # ---------- store structured ----------
         self.store[failure.failure_id] = asdict(failure)
-        self.store_path.write_text(
-            json.dumps(self.store, indent=2, ensure_ascii=False),
-            encoding="utf-8",
-        )
+        with timer("store.persist", store=self.store_path.name):
+            self.store_path.write_text(
+                json.dumps(self.store, indent=2, ensure_ascii=False),
+                encoding="utf-8",
+            )
 
         ids = []
         documents = []
@@ -131,11 +141,12 @@ class FMEAFailureKB:
         add_field(failure.failure_effect, "failure_effect")
 
         if ids:
-            self.collection.upsert(
-                ids=ids,
-                documents=documents,
-                metadatas=metadatas,
-            )
+            with timer("chroma.upsert", collection=self.collection.name):
+                self.collection.upsert(
+                    ids=ids,
+                    documents=documents,
+                    metadatas=metadatas,
+                )
 
     # =========================================================
     # Low-level role-based search
@@ -146,11 +157,12 @@ class FMEAFailureKB:
         role: str,
         k: int = 5,
     ):
-        return self.collection.query(
-            query_texts=[query],
-            n_results=k,
-            where={"role": role},
-        )
+        with timer("chroma.query", collection=self.collection.name):
+            return self.collection.query(
+                query_texts=[query],
+                n_results=k,
+                where={"role": role},
+            )
 
     # =========================================================
     # High-level merged search (RAG entry point)
@@ -224,12 +236,13 @@ class FMEACauseKB:
         self.store_path = self.persist_dir / "fmea_cause_store.json"
         self.store = {}
         if self.store_path.exists():
-            self.store = json.loads(self.store_path.read_text(encoding="utf-8"))
+            with timer("store.load", store=self.store_path.name):
+                self.store = json.loads(self.store_path.read_text(encoding="utf-8"))
 
         self.client = chromadb.PersistentClient(path=str(self.persist_dir))
-        self.embedder = embedding_functions.SentenceTransformerEmbeddingFunction(
+        self.embedder = timed_embedder(embedding_functions.SentenceTransformerEmbeddingFunction(
             model_name="all-MiniLM-L6-v2"
-        )
+        ))
         self.collection = self.client.get_or_create_collection(
             name="fmea_cause_kb",
             embedding_function=self.embedder,
@@ -237,10 +250,11 @@ class FMEACauseKB:
 
     def add(self, cause: FMEACause):
         self.store[cause.cause_id] = asdict(cause)
-        self.store_path.write_text(
-            json.dumps(self.store, indent=2, ensure_ascii=False),
-            encoding="utf-8",
-        )
+        with timer("store.persist", store=self.store_path.name):
+            self.store_path.write_text(
+                json.dumps(self.store, indent=2, ensure_ascii=False),
+                encoding="utf-8",
+            )
 
         embed_text = "\n".join([
             # f"Failure ID: {cause.failure_id}",
@@ -248,19 +262,21 @@ class FMEACauseKB:
             f"Failure cause: {cause.failure_cause}",
         ])
 
-        self.collection.upsert(
-            ids=[cause.cause_id],
-            documents=[embed_text],
-            metadatas=[{
-                "failure_id": cause.failure_id,
-                "discipline": cause.discipline or "",
-            }],
-        )
+        with timer("chroma.upsert", collection=self.collection.name):
+            self.collection.upsert(
+                ids=[cause.cause_id],
+                documents=[embed_text],
+                metadatas=[{
+                    "failure_id": cause.failure_id,
+                    "discipline": cause.discipline or "",
+                }],
+            )
 
     def search_under_failure(self, query: str, failure_id: str, k: int = 5):
-        res = self.collection.query(
-            query_texts=[query],
-            n_results=k,
-            where={"failure_id": failure_id},
-        )
+        with timer("chroma.query", collection=self.collection.name):
+            res = self.collection.query(
+                query_texts=[query],
+                n_results=k,
+                where={"failure_id": failure_id},
+            )
         return res["ids"][0] if res["ids"] else []
\ No newline at end of file
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import math
 import re
+import json
 from datetime import datetime, date
 
 ###############################################################################
@@ -33,6 +34,37 @@ def to_scalar(x):
     return str(x).strip()
 
 
+def column_to_text(col):
+    """
+    Column-wise to_scalar: NaN/None/NaT -> "", dates -> ISO date,
+    everything else -> stripped str. Returns an object ndarray.
+    """
+    if pd.api.types.is_datetime64_any_dtype(col):
+        return col.dt.strftime("%Y-%m-%d").fillna("").to_numpy(dtype=object)
+
+    values = col.to_numpy(dtype=object)
+    out = np.full(len(values), "", dtype=object)
+
+    present = ~pd.isna(values)
+    if not present.any():
+        return out
+
+    idx = np.flatnonzero(present)
+    vals = values[idx]
+
+    is_date = np.fromiter(
+        (isinstance(v, date) for v in vals), dtype=bool, count=len(vals)
+    )
+    if is_date.any():
+        out[idx[is_date]] = [to_scalar(v) for v in vals[is_date]]
+
+    rest = idx[~is_date]
+    if len(rest):
+        out[rest] = pd.Series(values[rest], dtype=object).astype(str).str.strip().to_numpy()
+
+    return out
+
+
 ###############################################################################
 # Text Cleaning
 ###############################################################################
@@ -142,4 +174,53 @@ def is_numeric_like(value):
         float(str(value).strip())
         return True
     except:
-        return False
\ No newline at end of file
+        return False
+
+
+def numeric_like_mask(texts):
+    """Vectorized is_numeric_like over an array of already-stringified cells."""
+    texts = np.asarray(texts, dtype=object)
+    mask = pd.to_numeric(pd.Series(texts), errors="coerce").notna().to_numpy()
+
+    # to_numeric is stricter than float() ("nan", "1_000", ...): re-check leftovers
+    leftover = np.flatnonzero(~mask & (texts != ""))
+    for i in leftover:
+        mask[i] = is_numeric_like(texts[i])
+
+    return mask
+
+
+###############################################################################
+# Output
+###############################################################################
+
+def is_jsonl_path(path) -> bool:
+    return str(path).lower().endswith(".jsonl")
+
+
+def write_records(records, output_path, jsonl=None):
+    """
+    Write FMEA records to disk.
+
+    - jsonl=True (or a *.jsonl path): one compact JSON object per line,
+      written as the records are produced, so `records` can be a generator.
+    - otherwise: a single pretty-printed JSON array (legacy format).
+
+    Returns the number of records written.
+    """
+    if jsonl is None:
+        jsonl = is_jsonl_path(output_path)
+
+    if not jsonl:
+        records = list(records)
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False, indent=2)
+        return len(records)
+
+    n = 0
+    with open(output_path, "w", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps(rec, ensure_ascii=False))
+            f.write("\n")
+            n += 1
+    return n
@@ -1,29 +1,199 @@
 import os
+import json
+import time
+import hashlib
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 from fmea_to_json.xlsm_parser import process_dfmea_xlsm
 from fmea_to_json.xlsx_parser import process_old_fmea_xlsx
 
 INPUT_DIR = r"C:\Users\FW\Desktop\FMEA_AI\Project_Phase\DATA\FMEA\Motor"
 OUTPUT_DIR = r"C:\Users\FW\Desktop\FMEA_AI\Project_Phase\Codes\database\fmea_json_raw"
 
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+# Conversion state + summary of the last run, kept next to the JSON outputs
+MANIFEST_NAME = "_conversion_manifest.json"
+MAX_WORKERS = None  # None -> os.cpu_count()
+OUTPUT_EXT = ".json"  # ".jsonl" -> stream records as JSON Lines
+
 
-for file in os.listdir(INPUT_DIR):
-    path = os.path.join(INPUT_DIR, file)
-    name, ext = os.path.splitext(file)
+###############################################################################
+# Cache helpers
+###############################################################################
 
-    if ext.lower() not in [".xlsm", ".xlsx"]:
-        continue
+def file_sha256(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
 
-    output_json = os.path.join(OUTPUT_DIR, name + ".json")
-    print(f"Processing {file}")
 
+def load_manifest(output_dir):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {"files": {}}
     try:
-        if ext.lower() == ".xlsm":
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"files": {}}
+    manifest.setdefault("files", {})
+    return manifest
+
+
+def save_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def is_up_to_date(entry, path, output_json):
+    """
+    Return (up_to_date, sha256 or None).
+
+    mtime + size is checked first; the file is only hashed when they differ,
+    so touched-but-unchanged workbooks are still skipped.
+    """
+    if not entry or entry.get("status") != "ok" or not os.path.exists(output_json):
+        return False, None
+
+    st = os.stat(path)
+    if entry.get("mtime") == st.st_mtime and entry.get("size") == st.st_size:
+        return True, entry.get("sha256")
+
+    digest = file_sha256(path)
+    return digest == entry.get("sha256"), digest
+
+
+###############################################################################
+# Worker
+###############################################################################
+
+def convert_one(path, output_json):
+    """Convert one workbook. Runs inside a worker process."""
+    ext = os.path.splitext(path)[1].lower()
+    t0 = time.perf_counter()
+
+    try:
+        if ext == ".xlsm":
             process_dfmea_xlsm(path, output_json)
         else:
             process_old_fmea_xlsx(path, output_json)
+        status, error = "ok", None
+    except Exception as e:
+        status, error = "error", f"{type(e).__name__}: {e}"
 
-        print("  ✔ Done")
+    return {
+        "status": status,
+        "error": error,
+        "seconds": round(time.perf_counter() - t0, 3),
+    }
 
-    except Exception as e:
-        print("  ✖ Error:", e)
+
+###############################################################################
+# Driver
+###############################################################################
+
+def collect_workbooks(input_dir):
+    files = []
+    for file in sorted(os.listdir(input_dir)):
+        name, ext = os.path.splitext(file)
+        if ext.lower() not in [".xlsm", ".xlsx"]:
+            continue
+        if file.startswith("~$"):  # Excel lock files
+            continue
+        files.append((file, name))
+    return files
+
+
+def run_conversion(
+    input_dir=INPUT_DIR,
+    output_dir=OUTPUT_DIR,
+    max_workers=MAX_WORKERS,
+    force=False,
+    output_ext=OUTPUT_EXT,
+):
+    os.makedirs(output_dir, exist_ok=True)
+
+    manifest = load_manifest(output_dir)
+    entries = manifest["files"]
+
+    todo = []
+    skipped = []
+
+    for file, name in collect_workbooks(input_dir):
+        path = os.path.join(input_dir, file)
+        output_json = os.path.join(output_dir, name + output_ext)
+
+        if not force:
+            up_to_date, digest = is_up_to_date(entries.get(file), path, output_json)
+            if up_to_date:
+                st = os.stat(path)
+                entries[file].update({"mtime": st.st_mtime, "size": st.st_size})
+                skipped.append(file)
+                continue
+        else:
+            digest = None
+
+        todo.append((file, path, output_json, digest))
+
+    print(f"[INFO] {len(todo)} to convert, {len(skipped)} up to date")
+
+    results = {}
+    t_start = time.perf_counter()
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(convert_one, path, output_json): (file, path, output_json, digest)
+                for file, path, output_json, digest in todo
+            }
+
+            for fut in as_completed(futures):
+                file, path, output_json, digest = futures[fut]
+                try:
+                    res = fut.result()
+                except Exception as e:  # worker crashed
+                    res = {"status": "error", "error": f"{type(e).__name__}: {e}", "seconds": None}
+
+                st = os.stat(path)
+                entries[file] = {
+                    "output_json": output_json,
+                    "sha256": digest or file_sha256(path),
+                    "mtime": st.st_mtime,
+                    "size": st.st_size,
+                    "converted_at": datetime.now().isoformat(timespec="seconds"),
+                    **res,
+                }
+                results[file] = res
+
+                if res["status"] == "ok":
+                    print(f"  ✔ {file} ({res['seconds']}s)")
+                else:
+                    print(f"  ✖ {file}: {res['error']}")
+
+    succeeded = sorted(f for f, r in results.items() if r["status"] == "ok")
+    failed = sorted(f for f, r in results.items() if r["status"] != "ok")
+
+    manifest["last_run"] = {
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        "wall_seconds": round(time.perf_counter() - t_start, 3),
+        "converted": succeeded,
+        "failed": {f: results[f]["error"] for f in failed},
+        "skipped": sorted(skipped),
+        "timings": {f: r["seconds"] for f, r in results.items()},
+    }
+    save_manifest(output_dir, manifest)
+
+    print(
+        f"[DONE] ok={len(succeeded)} failed={len(failed)} skipped={len(skipped)} "
+        f"-> {os.path.join(output_dir, MANIFEST_NAME)}"
+    )
+    return manifest["last_run"]
+
+
+if __name__ == "__main__":
+    run_conversion()
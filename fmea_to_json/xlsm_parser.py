@@ -1,10 +1,9 @@
 import pandas as pd
-import json
 import numpy as np
 import os
 import math
 import re
-from fmea_to_json.common_utils import extract_metadata_from_file
+from fmea_to_json.common_utils import extract_metadata_from_file, write_records
 
 
 ###############################################################################
@@ -162,7 +161,7 @@ def find_context_for_row(context, excel_row):
 # Step 3: Build flat FMEA blocks (NO prefix matching)
 ###############################################################################
 
-def build_flat_failures(
+def iter_flat_failures(
     system_name,
     fmea_date,
     project_description,
@@ -170,8 +169,7 @@ def build_flat_failures(
     context,
     file_name
 ):
-
-    records = []
+    """Yield one flat record per DFMEA cause row."""
 
     for _, row in dfmea.iterrows():
 
@@ -220,9 +218,20 @@ def build_flat_failures(
             "file_name": file_name
         }
 
-        records.append(record)
+        yield record
 
-    return records
+
+def build_flat_failures(
+    system_name,
+    fmea_date,
+    project_description,
+    dfmea,
+    context,
+    file_name
+):
+    return list(iter_flat_failures(
+        system_name, fmea_date, project_description, dfmea, context, file_name
+    ))
 
 
 
@@ -230,7 +239,12 @@ def build_flat_failures(
 # Step 4: Main entry
 ###############################################################################
 
-def dfmea_to_json_xlsm(path, output_json, sheet_index=1):
+def dfmea_to_json_xlsm(path, output_json, sheet_index=1, jsonl=None):
+    """
+    Convert a DFMEA workbook.
+
+    jsonl=None picks the format from the output extension (*.jsonl -> JSON Lines).
+    """
 
     file_name = os.path.splitext(os.path.basename(path))[0]
     system_name = extract_system_name(path, sheet_index)
@@ -249,7 +263,7 @@ def dfmea_to_json_xlsm(path, output_json, sheet_index=1):
     context = extract_structure_context(path, sheet_index)
     dfmea = load_dfmea_table(path, sheet_index)
 
-    flat_records = build_flat_failures(
+    flat_records = iter_flat_failures(
         system_name=system_name,
         fmea_date=fmea_date,
         project_description=project_description,
@@ -258,11 +272,10 @@ def dfmea_to_json_xlsm(path, output_json, sheet_index=1):
         file_name=file_name
     )
 
-    with open(output_json, "w", encoding="utf-8") as f:
-        json.dump(flat_records, f, ensure_ascii=False, indent=2)
+    n = write_records(flat_records, output_json, jsonl=jsonl)
 
-    print("JSON saved to:", output_json)
+    print(f"JSON saved to: {output_json} ({n} records)")
 
 
-def process_dfmea_xlsm(path, output_json, sheet_index=1):
-    dfmea_to_json_xlsm(path, output_json, sheet_index)
+def process_dfmea_xlsm(path, output_json, sheet_index=1, jsonl=None):
+    dfmea_to_json_xlsm(path, output_json, sheet_index, jsonl=jsonl)
@@ -1,12 +1,14 @@
 import os
-import json
 import math
 import pandas as pd
 import numpy as np
 from fmea_to_json.common_utils import (
     to_scalar,
     extract_metadata_from_file,
-    is_numeric_like
+    is_numeric_like,
+    column_to_text,
+    numeric_like_mask,
+    write_records,
 )
 
 ###############################################################################
@@ -47,11 +49,35 @@ def get_int_cell(row, col_map, *header_names, default_idx=None):
     return val if is_numeric_like(val) else ""
 
 
+def resolve_col(col_map, *header_names, default_idx=None):
+    """Column-level counterpart of get_cell: header map first, then fixed index."""
+    for name in header_names:
+        idx = col_map.get(norm_col(name))
+        if idx is not None:
+            return idx
+    return default_idx
+
+
+# field -> (header names, fallback index, numeric-only)
+OLD_FMEA_COLUMNS = {
+    "failure_cause": (("potential cause(s) of failure",), 5, False),
+    "failure_type": (("process step",), 1, False),
+    "failure_mode": (("potential failure mode",), 2, False),
+    "failure_effect": (("potential effect(s) of failure",), 3, False),
+    "severity": (("severity",), 4, True),
+    "occurrence": (("occurrence",), 6, True),
+    "detection": (("detection",), 9, True),
+    "rpn": (("rpn", "so"), 10, True),
+    "current_detection": (("current controls",), 8, False),
+    "recommended_action": (("recommended actions", "recommended action"), 11, False),
+}
+
+
 ###############################################################################
 # Core extraction
 ###############################################################################
-def extract_old_fmea_failures(df, metadata, file_name):
-    records = []
+def iter_old_fmea_failures(df, metadata, file_name):
+    """Yield one record per failure-cause row of an old FMEA sheet."""
 
     # ------------------------------------------------------------
     # 1. Locate header row
@@ -64,7 +90,7 @@ def extract_old_fmea_failures(df, metadata, file_name):
             break
 
     if header_idx == -1:
-        return records
+        return
 
     header_row = df.iloc[header_idx]
     col_map = build_col_map(header_row)
@@ -72,83 +98,52 @@ def extract_old_fmea_failures(df, metadata, file_name):
     df_data = df.iloc[header_idx + 1:].dropna(how="all")
 
     # ------------------------------------------------------------
-    # 2. Iterate rows
+    # 2. Extract columns once (header lookup resolved per column, not per cell)
     # ------------------------------------------------------------
-    for _, row in df_data.iterrows():
-
-        failure_cause = get_cell(
-            row, col_map,
-            "potential cause(s) of failure",
-            default_idx=5
-        )
-
-        if not failure_cause:
-            continue
-
-        failure_type = get_cell(
-            row, col_map,
-            "process step",
-            default_idx=1
-        )
-
-        failure_mode = get_cell(
-            row, col_map,
-            "potential failure mode",
-            default_idx=2
-        )
-
-        failure_effect = get_cell(
-            row, col_map,
-            "potential effect(s) of failure",
-            default_idx=3
-        )
-
-        severity = get_int_cell(
-            row, col_map,
-            "severity",
-            default_idx=4
-        )
-
-        occurrence = get_int_cell(
-            row, col_map,
-            "occurrence",
-            default_idx=6
-        )
-
-        detection = get_int_cell(
-            row, col_map,
-            "detection",
-            default_idx=9
-        )
-
-        rpn = get_int_cell(
-            row, col_map,
-            "rpn", "so",
-            default_idx=10
-        )
-
-        current_detection = get_cell(
-            row, col_map,
-            "current controls",
-            default_idx=8
-        )
-
-        recommended_action = get_cell(
-            row, col_map,
-            "recommended actions",
-            "recommended action",
-            default_idx=11
-        )
-
-        # ------------------------------------------------------------
-        # 3. Build record (JSON schema UNCHANGED)
-        # ------------------------------------------------------------
-        record = {
+    cols = {}
+    for field, (names, default_idx, numeric) in OLD_FMEA_COLUMNS.items():
+        idx = resolve_col(col_map, *names, default_idx=default_idx)
+        values = column_to_text(df_data.iloc[:, idx])
+        if numeric:
+            values = np.where(numeric_like_mask(values), values, "")
+        cols[field] = values
+
+    keep = cols["failure_cause"] != ""
+    if not keep.any():
+        return
+    cols = {field: values[keep] for field, values in cols.items()}
+
+    texts = (
+        "Failure mode " + cols["failure_mode"] + ". "
+        + "Cause " + cols["failure_cause"] + " leads to effect " + cols["failure_effect"] + ". "
+        + "Severity " + cols["severity"] + ", "
+        + "Occurrence " + cols["occurrence"] + ", "
+        + "Detection " + cols["detection"] + ", "
+        + "RPN " + cols["rpn"] + ". "
+        + "Action " + cols["recommended_action"] + "."
+    )
+
+    # ------------------------------------------------------------
+    # 3. Build records (JSON schema UNCHANGED)
+    # ------------------------------------------------------------
+    project_description = metadata["project_description"]
+    fmea_date = metadata["fmea_date"]
+
+    for (
+        failure_type, failure_mode, failure_effect,
+        severity, occurrence, detection, rpn,
+        failure_cause, current_detection, recommended_action, text,
+    ) in zip(
+        cols["failure_type"], cols["failure_mode"], cols["failure_effect"],
+        cols["severity"], cols["occurrence"], cols["detection"], cols["rpn"],
+        cols["failure_cause"], cols["current_detection"], cols["recommended_action"], texts,
+    ):
+        yield {
             "source_type": "old_fmea",
             "file_name": file_name,
 
-            "project_description": metadata["project_description"],
-            "fmea_date": metadata["fmea_date"],
+            "project_description": project_description,
+            "fmea_date": fmea_date,
 
             "failure_type": failure_type,
             "failure_mode": failure_mode,
@@ -163,26 +158,23 @@ def extract_old_fmea_failures(df, metadata, file_name):
             "current_detection": current_detection,
             "recommended_action": recommended_action,
 
-            "text": (
-                f"Failure mode {failure_mode}. "
-                f"Cause {failure_cause} leads to effect {failure_effect}. "
-                f"Severity {severity}, "
-                f"Occurrence {occurrence}, "
-                f"Detection {detection}, "
-                f"RPN {rpn}. "
-                f"Action {recommended_action}."
-            )
+            "text": text,
         }
 
-        records.append(record)
 
-    return records
+def extract_old_fmea_failures(df, metadata, file_name):
+    return list(iter_old_fmea_failures(df, metadata, file_name))
 
 
 ###############################################################################
 # Main entry
 ###############################################################################
-def process_old_fmea_xlsx(path, output_json):
+def process_old_fmea_xlsx(path, output_json, jsonl=None):
+    """
+    Convert an old FMEA workbook.
+
+    jsonl=None picks the format from the output extension (*.jsonl -> JSON Lines).
+    """
     file_name = os.path.splitext(os.path.basename(path))[0]
 
     df = pd.read_excel(
@@ -200,9 +192,7 @@ def process_old_fmea_xlsx(path, output_json):
         date_fallback_cell="J3"
     )
 
-    records = extract_old_fmea_failures(df, meta, file_name)
-
-    with open(output_json, "w", encoding="utf-8") as f:
-        json.dump(records, f, ensure_ascii=False, indent=2)
+    records = iter_old_fmea_failures(df, meta, file_name)
+    n = write_records(records, output_json, jsonl=jsonl)
 
-    print("Old FMEA JSON saved to:", output_json)
+    print(f"Old FMEA JSON saved to: {output_json} ({n} records)")
@@ -0,0 +1,109 @@
+"""
+Measurement helpers shared by the KB speed benchmarks
+(JSON_FMEA_KB/evaluation/benchmark.py, JSON8D_KB/Evaluation/benchmark.py).
+
+Imports nothing from either KB root, so both suites can load it from the
+repository root although their kb_structure modules clash. Swapping the
+KB's embedding function for HashEmbeddingFunction stays in each suite.
+"""
+
+from __future__ import annotations
+
+import sys
+import zlib
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from chromadb.api.types import EmbeddingFunction
+
+EMBEDDING_DIM = 384
+
+
+# =========================================================
+# Measurement helpers
+# =========================================================
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process (None if unavailable)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux: KiB, macOS: bytes
+        return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return round(getattr(info, "peak_wset", info.rss) / (1024 * 1024), 1)
+    except ImportError:
+        return None
+
+
+def summarize_latencies(seconds: List[float], items: Optional[int] = None) -> Dict[str, Any]:
+    """Throughput + latency percentiles of one stage (ms)."""
+    if not seconds:
+        return {"ops": 0}
+    arr = np.asarray(seconds, dtype=float)
+    total = float(arr.sum())
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99]) * 1000
+    items = items if items is not None else len(arr)
+    return {
+        "ops": len(arr),
+        "items": items,
+        "total_s": round(total, 4),
+        "throughput_per_s": round(items / total, 2) if total > 0 else None,
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(arr.max()) * 1000, 3),
+    }
+
+
+def time_calls(fn: Callable, args_list: List[tuple]) -> List[float]:
+    out = []
+    for args in args_list:
+        t0 = time.perf_counter()
+        fn(*args)
+        out.append(time.perf_counter() - t0)
+    return out
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """current / baseline ratios per stage (p50, p95, throughput)."""
+    out = {}
+    for stage, cur in current.get("stages", {}).items():
+        base = baseline.get("stages", {}).get(stage)
+        if not base:
+            continue
+        ratios = {}
+        for key in ("p50_ms", "p95_ms", "throughput_per_s"):
+            if base.get(key) and cur.get(key) is not None:
+                ratios[key] = round(cur[key] / base[key], 3)
+        out[stage] = ratios
+    return out
+
+
+# =========================================================
+# Embedding stand-in
+# =========================================================
+
+class HashEmbeddingFunction(EmbeddingFunction):
+    """Deterministic bag-of-words feature hashing (no model load / inference)."""
+
+    def __init__(self, model_name: str = "", dim: int = EMBEDDING_DIM, **kwargs):
+        self.dim = dim
+
+    def __call__(self, input):
+        out = np.zeros((len(input), self.dim), dtype=np.float32)
+        for i, text in enumerate(input):
+            for token in str(text).lower().split():
+                h = zlib.crc32(token.encode("utf-8"))
+                out[i, h % self.dim] += 1.0 if (h >> 20) & 1 else -1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return list(out / np.where(norms == 0, 1.0, norms))
+
+    @staticmethod
+    def name() -> str:
+        return "benchmark_hash"
@@ -0,0 +1,289 @@
+"""
+Opt-in timers and counters for the extraction and KB pipelines.
+
+Recording is off by default; set PIPELINE_METRICS=1 (or call enable()).
+While disabled, timer() hands back a shared no-op context manager and
+count() / observe() return immediately, so the calls can stay in
+production code paths.
+
+    with timer("chroma.upsert", collection="failure_kb"):
+        collection.upsert(...)
+    count("llm.cache", result="hit")
+
+snapshot() / write_snapshot(path) export JSON, to_prometheus() the
+Prometheus text exposition format.
+
+Stdlib only. Information_extraction_8D imports it from the repository
+root; the JSON_FMEA_KB / JSON8D_KB scripts add the repository root to
+sys.path first.
+"""
+
+import os
+import json
+import time
+import threading
+import functools
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ENV_VAR = "PIPELINE_METRICS"
+METRIC_PREFIX = "pipeline"
+
+_enabled = os.getenv(ENV_VAR, "").strip().lower() in {"1", "true", "yes", "on"}
+_lock = threading.Lock()
+
+# (name, sorted label items) -> [count, total_s, min_s, max_s]
+_timers: Dict[Tuple[str, tuple], List[float]] = {}
+# (name, sorted label items) -> value
+_counters: Dict[Tuple[str, tuple], float] = {}
+
+
+# =========================================================
+# Switch
+# =========================================================
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = bool(on)
+
+
+def disable():
+    enable(False)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+
+
+# =========================================================
+# Recording
+# =========================================================
+
+def _key(name: str, labels: Dict[str, Any]) -> Tuple[str, tuple]:
+    if not labels:
+        return name, ()
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def observe(name: str, seconds: float, **labels):
+    """Record one duration for timer `name`."""
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        s = _timers.get(key)
+        if s is None:
+            _timers[key] = [1, seconds, seconds, seconds]
+        else:
+            s[0] += 1
+            s[1] += seconds
+            if seconds < s[2]:
+                s[2] = seconds
+            if seconds > s[3]:
+                s[3] = seconds
+
+
+def count(name: str, value: float = 1, **labels):
+    """Add `value` to counter `name`."""
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "start", "seconds")
+
+    def __init__(self, name: str, labels: Dict[str, Any]):
+        self.name = name
+        self.labels = labels
+        self.seconds = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self.start
+        observe(self.name, self.seconds, **self.labels)
+        if exc_type is not None:
+            count(f"{self.name}.errors", **self.labels)
+        return False
+
+
+def timer(name: str, **labels):
+    """Context manager timing its block (failed blocks also count `<name>.errors`)."""
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name, labels)
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """Decorator form of timer(); the switch is checked on every call."""
+    def decorator(fn):
+        metric = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Timer(metric, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# =========================================================
+# Embedding functions
+# =========================================================
+
+class TimedEmbeddingFunction:
+    """
+    Wraps a Chroma embedding function so encoding time is recorded
+    separately from the Chroma call that triggered it. Everything else
+    (name, config, ...) is delegated to the wrapped function.
+    """
+
+    def __init__(self, inner, metric: str = "embedding.encode"):
+        self._inner = inner
+        self._metric = metric
+
+    def __call__(self, input):
+        with timer(self._metric):
+            out = self._inner(input)
+        count(f"{self._metric}.texts", len(input))
+        return out
+
+    def embed_query(self, input):
+        embed = getattr(self._inner, "embed_query", self._inner)
+        with timer(self._metric, kind="query"):
+            out = embed(input=input)
+        count(f"{self._metric}.texts", len(input), kind="query")
+        return out
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+
+def timed_embedder(embedder, metric: str = "embedding.encode"):
+    """Wrap `embedder` when recording is on; returned unchanged otherwise."""
+    if not _enabled:
+        return embedder
+    return TimedEmbeddingFunction(embedder, metric)
+
+
+# =========================================================
+# Export
+# =========================================================
+
+def snapshot() -> Dict[str, Any]:
+    with _lock:
+        timers = {k: list(v) for k, v in _timers.items()}
+        counters = dict(_counters)
+
+    return {
+        "enabled": _enabled,
+        "timers": [
+            {
+                "name": name,
+                "labels": dict(labels),
+                "count": int(n),
+                "total_s": round(total, 6),
+                "mean_ms": round(total / n * 1000, 3),
+                "min_ms": round(lo * 1000, 3),
+                "max_ms": round(hi * 1000, 3),
+            }
+            for (name, labels), (n, total, lo, hi) in sorted(timers.items())
+        ],
+        "counters": [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(counters.items())
+        ],
+    }
+
+
+def _metric_name(prefix: str, name: str, suffix: str) -> str:
+    base = "".join(c if c.isalnum() else "_" for c in name)
+    return f"{prefix}_{base}_{suffix}" if prefix else f"{base}_{suffix}"
+
+
+def _label_text(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    items = ",".join(
+        '{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in labels.items()
+    )
+    return "{" + items + "}"
+
+
+def to_prometheus(prefix: str = METRIC_PREFIX) -> str:
+    """Timers as summaries (_count / _sum) plus a _max gauge; counters as _total."""
+    snap = snapshot()
+
+    # Samples of one metric family must be contiguous
+    summaries: Dict[str, List[str]] = {}
+    gauges: Dict[str, List[str]] = {}
+    counters: Dict[str, List[str]] = {}
+
+    for t in snap["timers"]:
+        metric = _metric_name(prefix, t["name"], "seconds")
+        labels = _label_text(t["labels"])
+        summaries.setdefault(metric, []).extend([
+            f"{metric}_count{labels} {t['count']}",
+            f"{metric}_sum{labels} {t['total_s']}",
+        ])
+        gauges.setdefault(f"{metric}_max", []).append(
+            f"{metric}_max{labels} {round(t['max_ms'] / 1000, 6)}"
+        )
+
+    for c in snap["counters"]:
+        metric = _metric_name(prefix, c["name"], "total")
+        counters.setdefault(metric, []).append(
+            f"{metric}{_label_text(c['labels'])} {c['value']}"
+        )
+
+    lines: List[str] = []
+    for kind, families in (("summary", summaries), ("gauge", gauges), ("counter", counters)):
+        for metric, samples in families.items():
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.extend(samples)
+
+    return "\n".join(lines) + "\n"
+
+
+def write_snapshot(path: Path, fmt: Optional[str] = None) -> Path:
+    """Write the current metrics; fmt "json" | "prometheus" (default: by suffix)."""
+    path = Path(path)
+    fmt = fmt or ("prometheus" if path.suffix in {".prom", ".txt"} else "json")
+
+    if fmt == "prometheus":
+        text = to_prometheus()
+    else:
+        text = json.dumps(snapshot(), indent=2, ensure_ascii=False)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
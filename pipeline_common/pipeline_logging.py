@@ -0,0 +1,136 @@
+"""
+Leveled logging for the ingest, KG and extraction modules.
+
+All loggers live under "pipeline" (get_logger("ingest_fmea") ->
+"pipeline.ingest_fmea"). The first get_logger() call attaches one stderr
+handler at PIPELINE_LOG_LEVEL (default INFO); configure_logging() changes
+level / format / stream afterwards.
+
+Per-row diagnostics go through a RowSampler so large files log the first
+rows and then every n-th one, and are not formatted at all unless DEBUG
+is on. FileSummary counts what happened to a file and logs it once.
+
+Stdlib only. Information_extraction_8D imports it from the repository
+root; the JSON_FMEA_KB / JSON8D_KB scripts add the repository root to
+sys.path first.
+"""
+
+import os
+import sys
+import logging
+import threading
+from collections import Counter
+from typing import Optional, TextIO
+
+ROOT_LOGGER = "pipeline"
+LEVEL_ENV = "PIPELINE_LOG_LEVEL"
+DEFAULT_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+# Row sampling: log the first SAMPLE_FIRST rows, then every SAMPLE_EVERY-th
+SAMPLE_FIRST = int(os.getenv("PIPELINE_LOG_SAMPLE_FIRST", "20"))
+SAMPLE_EVERY = int(os.getenv("PIPELINE_LOG_SAMPLE_EVERY", "1000"))
+
+_configured = False
+_config_lock = threading.Lock()
+
+
+# =========================================================
+# Setup
+# =========================================================
+
+def configure_logging(
+    level: Optional[str] = None,
+    fmt: str = DEFAULT_FORMAT,
+    stream: Optional[TextIO] = None,
+) -> logging.Logger:
+    """(Re)configure the "pipeline" logger: level name or PIPELINE_LOG_LEVEL, one stream handler."""
+    global _configured
+
+    root = logging.getLogger(ROOT_LOGGER)
+    level = (level or os.getenv(LEVEL_ENV, "INFO")).upper()
+
+    with _config_lock:
+        for h in list(root.handlers):
+            root.removeHandler(h)
+
+        handler = logging.StreamHandler(stream or sys.stderr)
+        handler.setFormatter(logging.Formatter(fmt))
+        root.addHandler(handler)
+        root.setLevel(level)
+        root.propagate = False
+        _configured = True
+
+    return root
+
+
+def get_logger(name: str) -> logging.Logger:
+    if not _configured:
+        configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+# =========================================================
+# Per-row sampling
+# =========================================================
+
+class RowSampler:
+    """
+    Rate-limits per-row DEBUG lines.
+
+        sampler = RowSampler(log)
+        if sampler.hit():
+            log.debug("row %d: %r", i, row)
+
+    hit() is False without touching the counter when DEBUG is off, so the
+    message arguments are never built on normal runs.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        first: int = SAMPLE_FIRST,
+        every: int = SAMPLE_EVERY,
+        level: int = logging.DEBUG,
+    ):
+        self.logger = logger
+        self.first = first
+        self.every = max(every, 1)
+        self.level = level
+        self.seen = 0
+
+    def hit(self) -> bool:
+        if not self.logger.isEnabledFor(self.level):
+            return False
+        self.seen += 1
+        return self.seen <= self.first or self.seen % self.every == 0
+
+    def reset(self):
+        self.seen = 0
+
+
+# =========================================================
+# Per-file summary
+# =========================================================
+
+class FileSummary:
+    """Counters for one input file, logged as a single line by log()."""
+
+    def __init__(self, logger: logging.Logger, file_name: str):
+        self.logger = logger
+        self.file_name = file_name
+        self.counts: Counter = Counter()
+
+    def add(self, key: str, n: int = 1):
+        self.counts[key] += n
+
+    def __getitem__(self, key: str) -> int:
+        return self.counts[key]
+
+    def as_dict(self) -> dict:
+        return dict(self.counts)
+
+    def log(self, level: int = logging.INFO, prefix: str = "[OK]"):
+        if not self.logger.isEnabledFor(level):
+            return
+        parts = ", ".join(f"{k}={v}" for k, v in self.counts.items())
+        self.logger.log(level, "%s %s: %s", prefix, self.file_name, parts or "nothing to do")
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Packages are imported from the repository root (Information_extraction_8D.*)
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
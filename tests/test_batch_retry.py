@@ -0,0 +1,86 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from Information_extraction_8D.main.llm import is_transient_llm_error
+
+
+def _validation_error():
+    class Model(BaseModel):
+        x: int
+
+    try:
+        Model(x="not a number")
+    except ValidationError as e:
+        return e
+
+
+def _status_error(code):
+    request = httpx.Request("POST", "http://llm.local/v1/chat/completions")
+    return httpx.HTTPStatusError("status", request=request, response=httpx.Response(code, request=request))
+
+
+@pytest.mark.parametrize("exc, transient", [
+    (httpx.ConnectTimeout("connect timed out"), True),
+    (httpx.RemoteProtocolError("server disconnected"), True),
+    (TimeoutError(), True),
+    (_status_error(429), True),
+    (_status_error(503), True),
+    (_status_error(400), False),
+    (_validation_error(), False),
+    (FileNotFoundError("8D001.docx"), False),
+    (UnboundLocalError("cannot access local variable 'd2_raw'"), False),
+])
+def test_is_transient_llm_error(exc, transient):
+    assert is_transient_llm_error(exc) is transient
+
+
+@pytest.fixture
+def end_to_end():
+    pytest.importorskip("langchain")
+    from Information_extraction_8D.main import end_to_end
+    return end_to_end
+
+
+def _retry(end_to_end, monkeypatch, tmp_path, errors):
+    attempts = []
+
+    def run(doc_path):
+        attempts.append(doc_path)
+        if errors:
+            raise errors.pop(0)
+
+    monkeypatch.setattr(end_to_end, "run", run)
+    checkpoint = end_to_end.BatchCheckpoint(str(tmp_path / "checkpoint.jsonl"))
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return await end_to_end._run_with_retry(
+                str(tmp_path / "8D001.docx"),
+                loop=asyncio.get_running_loop(),
+                executor=executor,
+                semaphore=asyncio.Semaphore(1),
+                checkpoint=checkpoint,
+                max_retries=3,
+                backoff_base=0.0,
+            )
+
+    ok = asyncio.run(main())
+    return ok, len(attempts), checkpoint.state["8D001"]
+
+
+def test_transient_error_is_retried(end_to_end, monkeypatch, tmp_path):
+    ok, attempts, entry = _retry(end_to_end, monkeypatch, tmp_path, [httpx.ReadTimeout("read timed out")])
+
+    assert ok and attempts == 2
+    assert entry["status"] == "done"
+
+
+def test_permanent_error_fails_on_first_attempt(end_to_end, monkeypatch, tmp_path):
+    ok, attempts, entry = _retry(end_to_end, monkeypatch, tmp_path, [UnboundLocalError("d2_raw")] * 4)
+
+    assert not ok and attempts == 1
+    assert entry["status"] == "failed" and entry["attempts"] == 1
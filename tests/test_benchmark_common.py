@@ -0,0 +1,38 @@
+import pytest
+
+pytest.importorskip("chromadb")
+
+import numpy as np
+
+from pipeline_common import benchmark_common as bc
+
+
+def test_summarize_latencies_is_per_stage_timing_only():
+    stage = bc.summarize_latencies([0.001, 0.002, 0.003, 0.004], items=8)
+
+    assert stage["ops"] == 4
+    assert stage["throughput_per_s"] == 800.0
+    assert stage["p50_ms"] == 2.5
+    # RSS is a process-wide high-water mark, reported once per run
+    assert "peak_rss_mb" not in stage
+
+
+def test_compare_reports_ratios():
+    baseline = {"stages": {"ingest": {"p50_ms": 2.0, "p95_ms": 4.0, "throughput_per_s": 100.0}}}
+    current = {"stages": {
+        "ingest": {"p50_ms": 1.0, "p95_ms": 4.0, "throughput_per_s": 150.0},
+        "new_stage": {"p50_ms": 1.0},
+    }}
+
+    assert bc.compare_reports(baseline, current) == {
+        "ingest": {"p50_ms": 0.5, "p95_ms": 1.0, "throughput_per_s": 1.5},
+    }
+
+
+def test_hash_embedding_is_deterministic_and_normalized():
+    embed = bc.HashEmbeddingFunction(dim=64)
+    a, b, empty = embed(["motor stalls at startup", "motor stalls at startup", ""])
+
+    assert np.array_equal(a, b)
+    assert np.isclose(np.linalg.norm(a), 1.0)
+    assert not empty.any()
@@ -0,0 +1,33 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+docx = pytest.importorskip("docx")
+
+from Information_extraction_8D.tools import doc_parser
+
+
+@pytest.fixture
+def reports(tmp_path, monkeypatch):
+    monkeypatch.setattr(doc_parser, "_PARSE_CACHE", type(doc_parser._PARSE_CACHE)())
+    monkeypatch.setattr(doc_parser, "PARSE_CACHE_SIZE", 4)
+
+    paths = []
+    for i in range(12):
+        doc = docx.Document()
+        doc.add_paragraph("D2")
+        doc.add_paragraph(f"Problem description {i}")
+        path = tmp_path / f"8D{i:03d}.docx"
+        doc.save(path)
+        paths.append(str(path))
+    return paths
+
+
+def test_parse_docx_from_worker_threads(reports):
+    expected = {p: doc_parser.parse_docx(p) for p in reports}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(doc_parser.parse_docx, reports * 20))
+
+    assert results == [expected[p] for p in reports * 20]
+    assert len(doc_parser._PARSE_CACHE) == doc_parser.PARSE_CACHE_SIZE
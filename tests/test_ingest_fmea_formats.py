@@ -0,0 +1,80 @@
+import sys
+import json
+import importlib
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from conftest import ROOT
+from pipeline_common.benchmark_common import HashEmbeddingFunction
+
+
+def _row(mode, severity, rpn, cause):
+    return {
+        "file_name": "FMEA001",
+        "source_type": "old_fmea",
+        "failure_type": "Electronics / Power stage",
+        "failure_mode": mode,
+        "failure_effect": "motor does not start",
+        "severity": severity,
+        "rpn": rpn,
+        "failure_cause": cause,
+        "detection": 4,
+        "occurrence": 2,
+    }
+
+
+# "overheating" re-appears after "short circuit" with a higher severity / RPN
+ROWS = [
+    _row("overheating", 3, 60, "thermal paste missing"),
+    _row("overheating", 4, 80, "fan blocked"),
+    _row("short circuit", 7, 200, "solder bridge"),
+    _row("overheating", 8, 320, "undersized heatsink"),
+    _row("overheating", None, "n/a", "fan blocked"),
+]
+
+
+@pytest.fixture
+def fmea_modules(monkeypatch):
+    # JSON_FMEA_KB scripts use bare imports from their own root
+    monkeypatch.syspath_prepend(str(ROOT / "JSON_FMEA_KB"))
+    for name in ("kb_structure", "ingest_fmea"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+    kb_structure = importlib.import_module("kb_structure")
+    ingest_fmea = importlib.import_module("ingest_fmea")
+    monkeypatch.setattr(
+        kb_structure.embedding_functions,
+        "SentenceTransformerEmbeddingFunction",
+        HashEmbeddingFunction,
+    )
+    return kb_structure, ingest_fmea
+
+
+def _ingest(tmp_path, name, text, modules):
+    kb_structure, ingest_fmea = modules
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+
+    failure_kb = kb_structure.FMEAFailureKB(persist_dir=tmp_path / path.stem / "failure_kb")
+    cause_kb = kb_structure.FMEACauseKB(persist_dir=tmp_path / path.stem / "cause_kb")
+    ingest_fmea.ingest_fmea_json(path, failure_kb, cause_kb)
+    return failure_kb, cause_kb
+
+
+def test_json_and_jsonl_ingest_store_the_same_failures(tmp_path, fmea_modules):
+    json_failures, json_causes = _ingest(tmp_path, "as_array.json", json.dumps(ROWS), fmea_modules)
+    jsonl_failures, jsonl_causes = _ingest(
+        tmp_path, "as_lines.jsonl", "".join(json.dumps(r) + "\n" for r in ROWS), fmea_modules
+    )
+
+    assert jsonl_failures.store == json_failures.store
+    assert jsonl_causes.store == json_causes.store
+
+    overheating = next(f for f in jsonl_failures.store.values() if f["failure_mode"] == "overheating")
+    assert (overheating["severity"], overheating["rpn"]) == (8, 320)
+    assert len(overheating["cause_ids"]) == 3
+
+    meta = jsonl_failures.collection.get(ids=[f"{overheating['failure_id']}::failure_mode"])["metadatas"][0]
+    assert (meta["severity"], meta["rpn"]) == (8, 320)
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+pytest.importorskip("langchain_openai")
+pytest.importorskip("langchain_ollama")
+
+from langchain_core.messages import AIMessage
+
+from Information_extraction_8D.main import llm as llm_module
+from Information_extraction_8D.main.llm_cache import make_cache_key
+
+MESSAGES = [{"role": "user", "content": "D2: motor stalls"}]
+
+
+class ScriptedLLM:
+    """Temperature-0 client returning the given responses in order."""
+
+    model_name = "scripted"
+    temperature = 0
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        return AIMessage(content=self.responses.pop(0))
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_module, "_response_cache", None)
+    monkeypatch.setattr(llm_module, "_cache_enabled", True)
+    monkeypatch.setattr(llm_module, "_rate_limiter", None)
+    llm_module.configure_llm_cache(True, tmp_path / "llm_cache.sqlite")
+    return llm_module.get_llm_cache()
+
+
+def test_unparseable_response_is_not_cached(cache):
+    llm = ScriptedLLM('{"truncated": ', '{"ok": true}')
+
+    with pytest.raises(json.JSONDecodeError):
+        llm_module.invoke_llm(llm, MESSAGES, parse=json.loads)
+    assert cache.get(make_cache_key(llm, MESSAGES)) is None
+
+    assert llm_module.invoke_llm(llm, MESSAGES, parse=json.loads) == {"ok": True}
+    # served from the cache now
+    assert llm_module.invoke_llm(llm, MESSAGES, parse=json.loads) == {"ok": True}
+    assert llm.calls == 2
+
+
+def test_invalid_cached_response_is_dropped_and_refetched(cache):
+    llm = ScriptedLLM('{"ok": true}')
+    key = make_cache_key(llm, MESSAGES)
+    cache.put(key, '{"truncated": ')
+
+    assert llm_module.invoke_llm(llm, MESSAGES, parse=json.loads) == {"ok": True}
+    assert llm.calls == 1
+    assert cache.get(key) == '{"ok": true}'
@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from Information_extraction_8D.main.llm_cache import LLMResponseCache, make_cache_key
+from Information_extraction_8D.main.fake_llm import ReplayChatModel
+
+MODEL = "azure/gpt-4.1"
+MESSAGES = [SystemMessage(content="Extract the failure."), HumanMessage(content="D2: motor stalls")]
+
+
+def test_key_recorded_from_chat_openai_hits_in_replay(tmp_path):
+    langchain_openai = pytest.importorskip("langchain_openai")
+
+    recorder = langchain_openai.ChatOpenAI(
+        model=MODEL,
+        temperature=0,
+        openai_api_key="unused",
+        model_kwargs={"response_format": {"type": "json_object"}},
+    )
+    cache_path = tmp_path / "llm_cache.sqlite"
+    cache = LLMResponseCache(cache_path)
+    cache.put(make_cache_key(recorder, MESSAGES), '{"recorded": true}', model=MODEL)
+    cache.close()
+
+    replay = ReplayChatModel(model=MODEL, temperature=0, json_mode=True, cache_path=cache_path, strict=True)
+
+    assert replay.invoke(MESSAGES).content == '{"recorded": true}'
+    assert replay.replayed == 1
+
+
+def test_int_and_float_temperature_share_a_key(tmp_path):
+    a = ReplayChatModel(model=MODEL, temperature=0, cache_path=tmp_path / "x.sqlite")
+    b = ReplayChatModel(model=MODEL, temperature=0.0, cache_path=tmp_path / "x.sqlite")
+    assert make_cache_key(a, MESSAGES) == make_cache_key(b, MESSAGES)
+
+
+def test_missing_cache_file_falls_back_to_synthetic(tmp_path):
+    replay = ReplayChatModel(model=MODEL, temperature=0, cache_path=tmp_path / "missing.sqlite")
+
+    assert replay.invoke(MESSAGES).content == "{}"
+    assert replay.synthesized == 1
+
+    strict = ReplayChatModel(model=MODEL, temperature=0, cache_path=tmp_path / "missing.sqlite", strict=True)
+    with pytest.raises(KeyError):
+        strict.invoke(MESSAGES)
@@ -0,0 +1,57 @@
+import json
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Both KB folders ship their own structure_evaluation (stdlib only), loaded by path
+MODULES = {
+    "fmea": ROOT / "JSON_FMEA_KB" / "evaluation" / "structure_evaluation.py",
+    "8d": ROOT / "JSON8D_KB" / "Evaluation" / "structure_evaluation.py",
+}
+
+STORE = {
+    "a": 12.5,
+    "b": 2,
+    "c": -0.125e-3,
+    "F1": {
+        "failure_mode": "short \"circuit\" \\ on\nboard é中",
+        "cause_ids": ["F1_C1", "F1_C2"],
+        "severity": 10,
+        "rpn": 1.5E+2,
+        "nested": {"x": [1, [2.25, {"y": None}], True, False], "z": ""},
+    },
+    "ésc\\aped \"key\"": [3e5, 0, -7],
+    "last": 100,
+}
+
+
+def load(name):
+    spec = importlib.util.spec_from_file_location(f"structure_evaluation_{name}", MODULES[name])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("name", sorted(MODULES))
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_store_items_matches_json_load(tmp_path, name, indent):
+    module = load(name)
+    path = tmp_path / "store.json"
+    path.write_text(json.dumps(STORE, indent=indent, ensure_ascii=False), encoding="utf-8")
+
+    for chunk_chars in range(1, 41):
+        items = list(module.iter_store_items(path, chunk_chars=chunk_chars))
+        assert items == list(STORE.items()), chunk_chars
+
+
+@pytest.mark.parametrize("name", sorted(MODULES))
+def test_iter_store_items_split_float(tmp_path, name):
+    module = load(name)
+    path = tmp_path / "store.json"
+    path.write_text('{"a": 12.5, "b": 2}', encoding="utf-8")
+
+    for chunk_chars in (1, 3, 9):
+        assert dict(module.iter_store_items(path, chunk_chars=chunk_chars)) == {"a": 12.5, "b": 2}